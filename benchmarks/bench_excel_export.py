@@ -0,0 +1,115 @@
+"""
+Benchmark da exportação para Excel: planilha em memória formatada célula a
+célula (modo anterior) versus planilha somente escrita com estilos nomeados.
+
+Cada caso roda em um processo próprio, para que o pico de memória (RSS)
+medido seja só dele. Com --max-rows, a exportação somente escrita continua
+em novas abas a cada max-rows linhas (o padrão é o limite do Excel).
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_excel_export --rows 100000
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import random
+import resource
+import tempfile
+import time
+
+from openpyxl import load_workbook
+
+from modules.exporters.excel_exporter import ExcelExporter
+from modules.processors.data_processor import OUTPUT_FIELDS
+
+
+def synthetic_records(count: int, seed: int = 42) -> list:
+    """Gera registros unificados com campos vazios e textos de tamanhos variados."""
+    rng = random.Random(seed)
+    records = []
+
+    for index in range(count):
+        record = {
+            'Company Name (Revised)': f"Empresa Sintética {index} Ltda",
+            'Location': rng.choice(['', f"Rua das Flores, {index}, Centro, São Paulo - SP, CEP 01000-000"]),
+            'CNPJ': f"{index:08d}000199",
+            'Fantasy name': rng.choice(['', f"Sintética {index}"]),
+            'Domain': f"https://www.empresa{index}.com.br",
+            'Size': rng.choice(['', '11-50', '51-200']),
+            'First name': rng.choice(['', 'Ana', 'João']),
+            'Second Name': rng.choice(['', 'Silva', 'Souza']),
+            'Office': rng.choice(['', 'CEO', 'Diretora Comercial']),
+            'E-mail': rng.choice(['', f"contato@empresa{index}.com.br"]),
+            'Telephone': f"11 9{index % 10000:04d}-{index % 9999:04d}",
+            'Telephone 2': rng.choice(['', '11 3333-4444']),
+            'City': rng.choice(['São Paulo', 'Campinas', '']),
+            'State': 'SP',
+            'Linkedin': rng.choice(['', f"https://linkedin.com/company/{index}"]),
+            'LOTE': 1
+        }
+        records.append({field: record[field] for field in OUTPUT_FIELDS + ['LOTE']})
+
+    return records
+
+
+def run_case(streaming: bool, rows: int, max_rows: int, output_dir: str, results) -> None:
+    """Exporta os registros sintéticos e devolve tempo, pico de memória e tamanho do arquivo."""
+    logging.basicConfig(level=logging.ERROR)
+    records = synthetic_records(rows)
+
+    exporter = ExcelExporter(streaming=streaming, max_rows=max_rows)
+    exporter.output_dir = output_dir
+    filename = f"bench_{'streaming' if streaming else 'memoria'}.xlsx"
+
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    filepath = exporter.export(records, filename)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    results.put({
+        'name': 'somente escrita' if streaming else 'em memória (anterior)',
+        'seconds': elapsed,
+        'peak_mb': peak / 1024,
+        'growth_mb': (peak - baseline) / 1024,
+        'size_mb': os.path.getsize(filepath) / 1024 / 1024,
+        'path': filepath
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark da exportação Excel: em memória vs. somente escrita')
+    parser.add_argument('--rows', type=int, default=100000, help='Registros exportados')
+    parser.add_argument('--max-rows', type=int, default=None, help='Linhas por aba no modo somente escrita')
+    args = parser.parse_args()
+
+    output_dir = tempfile.mkdtemp(prefix='bench_excel_')
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+
+    cases = []
+    for streaming in (False, True):
+        process = context.Process(target=run_case, args=(streaming, args.rows, args.max_rows, output_dir, results))
+        process.start()
+        cases.append(results.get())
+        process.join()
+
+    # Conferir que a planilha somente escrita tem todas as linhas
+    workbook = load_workbook(cases[1]['path'], read_only=True)
+    data_rows = sum(sum(1 for _ in sheet.iter_rows(min_row=2, values_only=True)) for sheet in workbook.worksheets)
+    workbook.close()
+
+    print(f"Registros: {args.rows} | abas no modo somente escrita: {len(workbook.sheetnames)} | linhas conferidas: {data_rows}")
+    print(f"{'caso':<24}{'tempo (s)':>12}{'pico RSS (MB)':>16}{'acréscimo (MB)':>17}{'arquivo (MB)':>15}")
+    for case in cases:
+        print(f"{case['name']:<24}{case['seconds']:>12.2f}{case['peak_mb']:>16.0f}{case['growth_mb']:>17.0f}{case['size_mb']:>15.1f}")
+
+    for case in cases:
+        os.remove(case['path'])
+    os.rmdir(output_dir)
+
+
+if __name__ == '__main__':
+    main()
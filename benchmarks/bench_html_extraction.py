@@ -0,0 +1,439 @@
+"""
+Benchmark da extração de páginas: snapshot lxml único versus consultas
+por elemento no WebDriver (abordagem anterior).
+
+A abordagem anterior é o código dos scrapers antes do snapshot, executado
+com um driver de fixture que responde às mesmas chamadas (find_element(s),
+.text, get_attribute...) a partir do HTML salvo. Antes de medir, o
+benchmark verifica que as duas abordagens extraem os mesmos campos e
+valores das fixtures. Cada chamada conta como uma ida e volta ao
+WebDriver e pode receber uma latência simulada (--rtt-ms), já que no
+navegador real cada chamada atravessa o protocolo WebDriver.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_html_extraction --iterations 50 --rtt-ms 2
+"""
+
+import argparse
+import logging
+import os
+import re
+import time
+
+import lxml.html
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+from selenium.webdriver.common.by import By
+
+from modules.scrapers.cnpj_scraper import CNPJScraper
+from modules.scrapers.company_site_scraper import CompanySiteScraper
+from utils.html_extractor import PageSnapshot
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+class FixtureDriver:
+    """
+    Driver que responde às chamadas do WebDriver a partir de um HTML salvo,
+    contando cada chamada como uma ida e volta ao navegador.
+    """
+
+    def __init__(self, html: str, url: str, rtt: float = 0.0):
+        self._html = html
+        self._tree = lxml.html.document_fromstring(html)
+        self.current_url = url
+        self.rtt = rtt
+        self.round_trips = 0
+
+    def _round_trip(self):
+        self.round_trips += 1
+        if self.rtt:
+            time.sleep(self.rtt)
+
+    @property
+    def page_source(self):
+        self._round_trip()
+        return self._html
+
+    def find_elements(self, by, value, context=None):
+        self._round_trip()
+        node = context if context is not None else self._tree
+        if by == By.CSS_SELECTOR:
+            # Seletores usados pelo código anterior
+            value = {
+                "h1": "//h1",
+                "h1, h2, img[alt*='logo']": "//h1 | //h2 | //img[contains(@alt, 'logo')]"
+            }[value]
+        return [FixtureElement(self, element) for element in node.xpath(value)]
+
+    def find_element(self, by, value, context=None):
+        elements = self.find_elements(by, value, context)
+        if not elements:
+            raise NoSuchElementException(value)
+        return elements[0]
+
+
+class FixtureElement:
+    """Elemento do FixtureDriver; cada acesso é uma ida e volta ao navegador."""
+
+    def __init__(self, driver: FixtureDriver, element):
+        self._driver = driver
+        self._element = element
+
+    @property
+    def text(self):
+        self._driver._round_trip()
+        return '\n'.join(part.strip() for part in self._element.itertext() if part.strip())
+
+    @property
+    def tag_name(self):
+        self._driver._round_trip()
+        return self._element.tag
+
+    def get_attribute(self, name):
+        self._driver._round_trip()
+        return self._element.get(name)
+
+    def find_element(self, by, value):
+        return self._driver.find_element(by, value, context=self._element)
+
+
+# As funções legacy_* reproduzem o código dos scrapers anterior ao snapshot
+# (mesmas consultas, na mesma ordem), recebendo o driver em vez da página.
+
+def legacy_extract_contact_info(scraper: CompanySiteScraper, driver, company_data: dict) -> None:
+    """CompanySiteScraper._extract_contact_info anterior (uma chamada por elemento)."""
+    try:
+        # Extrair todo o texto da página
+        page_text = driver.page_source
+
+        # Extrair emails
+        if 'email' not in company_data:
+            emails = scraper.email_pattern.findall(page_text)
+            if emails:
+                # Filtrar emails genéricos
+                valid_emails = [email for email in emails if not scraper._is_generic_email(email)]
+                if valid_emails:
+                    company_data['email'] = valid_emails[0]
+
+        # Extrair telefones
+        if 'phone' not in company_data or 'phone2' not in company_data:
+            phones = scraper.phone_pattern.findall(page_text)
+            if phones:
+                # Formatar telefones encontrados
+                formatted_phones = []
+                for phone_parts in phones:
+                    formatted_phone = ''
+
+                    if phone_parts[0]:  # DDD
+                        formatted_phone += phone_parts[0].replace('(', '').replace(')', '').strip()
+
+                    if phone_parts[1] and phone_parts[2]:  # Número
+                        if formatted_phone:
+                            formatted_phone += ' '
+                        formatted_phone += f"{phone_parts[1].strip()}-{phone_parts[2].strip()}"
+
+                    if formatted_phone and formatted_phone not in formatted_phones:
+                        formatted_phones.append(formatted_phone)
+
+                # Atribuir telefones
+                if formatted_phones and 'phone' not in company_data:
+                    company_data['phone'] = formatted_phones[0]
+
+                if len(formatted_phones) > 1 and 'phone2' not in company_data:
+                    company_data['phone2'] = formatted_phones[1]
+
+        # Extrair CNPJ
+        if 'cnpj' not in company_data:
+            cnpjs = scraper.cnpj_pattern.findall(page_text)
+            if cnpjs:
+                company_data['cnpj'] = cnpjs[0]
+
+        # Extrair endereço
+        if 'address' not in company_data:
+            # Procurar por elementos que possam conter endereços
+            address_candidates = driver.find_elements(By.XPATH, "//*[contains(text(), 'Endereço') or contains(text(), 'endereço') or contains(text(), 'Localização') or contains(text(), 'localização') or contains(text(), 'Address')]")
+
+            for candidate in address_candidates:
+                try:
+                    # Verificar o texto do elemento pai ou próximo irmão
+                    parent = candidate.find_element(By.XPATH, "./..")
+                    address_text = parent.text
+
+                    # Se o texto parece um endereço (contém número, CEP, etc.)
+                    if re.search(r'\d+.*(?:CEP|cep).*\d+', address_text) or re.search(r'\d+.*(?:Bairro|bairro)', address_text):
+                        company_data['address'] = address_text
+
+                        # Tentar extrair cidade e estado
+                        city_state_match = re.search(r'([A-Za-zÀ-ÿ\s]+)\s*[-,]\s*([A-Z]{2})', address_text)
+                        if city_state_match:
+                            company_data['city'] = city_state_match.group(1).strip()
+                            company_data['state'] = city_state_match.group(2).strip()
+
+                        break
+                except (NoSuchElementException, StaleElementReferenceException):
+                    continue
+
+    except Exception as e:
+        logging.error(f"Erro ao extrair informações de contato: {e}")
+
+
+def legacy_extract_company_info(scraper: CompanySiteScraper, driver, company_data: dict, company_name: str) -> None:
+    """CompanySiteScraper._extract_company_info anterior (uma chamada por elemento)."""
+    try:
+        # Extrair nome fantasia
+        if 'fantasy_name' not in company_data:
+            # Procurar por elementos que possam conter o nome fantasia
+            for term in scraper.terms['fantasy_name']:
+                try:
+                    elements = driver.find_elements(By.XPATH, f"//*[contains(text(), '{term}')]")
+                    for element in elements:
+                        try:
+                            parent = element.find_element(By.XPATH, "./..")
+                            text = parent.text
+
+                            # Procurar por padrões como "Nome Fantasia: XYZ"
+                            match = re.search(f"{term}[:\\s]+([^\\n]+)", text, re.IGNORECASE)
+                            if match:
+                                company_data['fantasy_name'] = match.group(1).strip()
+                                break
+                        except (NoSuchElementException, StaleElementReferenceException):
+                            continue
+
+                    if 'fantasy_name' in company_data:
+                        break
+                except Exception:
+                    continue
+
+            # Se não encontrou, usar o nome da empresa como fallback
+            if 'fantasy_name' not in company_data:
+                # Tentar encontrar o nome da empresa em destaque na página
+                try:
+                    # Procurar em h1, h2, logo alt text, etc.
+                    headers = driver.find_elements(By.CSS_SELECTOR, "h1, h2, img[alt*='logo']")
+                    for header in headers:
+                        text = header.text if header.tag_name in ['h1', 'h2'] else header.get_attribute('alt')
+                        if text and company_name.lower() in text.lower():
+                            company_data['fantasy_name'] = text.strip()
+                            break
+                except Exception:
+                    pass
+
+        # Extrair tamanho da empresa (número de funcionários)
+        if 'size' not in company_data:
+            for term in scraper.terms['employees']:
+                try:
+                    elements = driver.find_elements(By.XPATH, f"//*[contains(text(), '{term}')]")
+                    for element in elements:
+                        try:
+                            text = element.text
+                            # Procurar por padrões como "X funcionários" ou "equipe de X pessoas"
+                            size_match = re.search(r'(\d+[\d.]*)\s*(?:' + term + ')', text, re.IGNORECASE)
+                            if size_match:
+                                company_data['size'] = f"{size_match.group(1)} {term}"
+                                break
+                        except (StaleElementReferenceException):
+                            continue
+
+                    if 'size' in company_data:
+                        break
+                except Exception:
+                    continue
+
+        # Extrair CNPJ se ainda não tiver
+        if 'cnpj' not in company_data:
+            for term in scraper.terms['cnpj']:
+                try:
+                    elements = driver.find_elements(By.XPATH, f"//*[contains(text(), '{term}')]")
+                    for element in elements:
+                        try:
+                            parent = element.find_element(By.XPATH, "./..")
+                            text = parent.text
+
+                            # Procurar por CNPJ no formato XX.XXX.XXX/XXXX-XX
+                            cnpj_match = re.search(r'\d{2}\.\d{3}\.\d{3}/\d{4}-\d{2}', text)
+                            if cnpj_match:
+                                company_data['cnpj'] = cnpj_match.group(0)
+                                break
+                        except (NoSuchElementException, StaleElementReferenceException):
+                            continue
+
+                    if 'cnpj' in company_data:
+                        break
+                except Exception:
+                    continue
+
+    except Exception as e:
+        logging.error(f"Erro ao extrair informações da empresa: {e}")
+
+
+def legacy_company_site(driver, company_name: str) -> dict:
+    """Extração do site corporativo como era feita antes (uma chamada por elemento)."""
+    scraper = CompanySiteScraper()
+    company_data = {}
+    legacy_extract_contact_info(scraper, driver, company_data)
+    legacy_extract_company_info(scraper, driver, company_data, company_name)
+    return company_data
+
+
+def legacy_cnpjbiz(driver) -> dict:
+    """Extração do CNPJ.biz como era feita antes em _collect_from_cnpjbiz (um find_element por campo)."""
+    result = {}
+
+    # Nome e fantasia
+    try:
+        name_element = driver.find_element(By.CSS_SELECTOR, "h1")
+        if name_element:
+            result['name'] = name_element.text.strip()
+    except NoSuchElementException:
+        pass
+
+    # Campos simples da tabela de dados cadastrais, na ordem do código anterior
+    labels = [
+        ('Nome Fantasia', 'fantasy_name'), ('CNPJ', 'cnpj_formatted'), ('Endereço', 'address')
+    ]
+    for label, field in labels:
+        try:
+            element = driver.find_element(By.XPATH, f"//th[contains(text(), '{label}')]/following-sibling::td")
+            if element:
+                result[field] = element.text.strip()
+        except NoSuchElementException:
+            pass
+
+    try:
+        city_state_element = driver.find_element(By.XPATH, "//th[contains(text(), 'Município')]/following-sibling::td")
+        if city_state_element:
+            city_state = city_state_element.text.strip()
+            if " / " in city_state:
+                city, state = city_state.split(" / ", 1)
+                result['city'] = city.strip()
+                result['state'] = state.strip()
+    except NoSuchElementException:
+        pass
+
+    labels = [
+        ('CEP', 'zip_code'), ('Telefone', 'phone'), ('Email', 'email'), ('Data de Abertura', 'opening_date'),
+        ('Situação', 'status'), ('Capital Social', 'capital')
+    ]
+    for label, field in labels:
+        try:
+            element = driver.find_element(By.XPATH, f"//th[contains(text(), '{label}')]/following-sibling::td")
+            if element:
+                result[field] = element.text.strip()
+        except NoSuchElementException:
+            pass
+
+    # Atividade principal
+    try:
+        activity_element = driver.find_element(By.XPATH, "//th[contains(text(), 'Atividade Principal')]/following-sibling::td")
+        if activity_element:
+            activity_text = activity_element.text.strip()
+
+            # Tentar extrair código e descrição
+            activity_match = re.match(r'(\d+\.\d+-\d+-\d+) - (.+)', activity_text)
+            if activity_match:
+                result['main_activity_code'] = activity_match.group(1)
+                result['main_activity'] = activity_match.group(2)
+            else:
+                result['main_activity'] = activity_text
+    except NoSuchElementException:
+        pass
+
+    # Montar localização completa
+    if 'address' in result and 'city' in result and 'state' in result:
+        result['location'] = f"{result['address']}, {result['city']} - {result['state']}"
+        if 'zip_code' in result:
+            result['location'] += f", {result['zip_code']}"
+
+    return result
+
+
+def snapshot_company_site(driver, company_name: str) -> dict:
+    """Extração do site corporativo com o snapshot lxml."""
+    scraper = CompanySiteScraper()
+    snapshot = PageSnapshot.from_driver(driver)
+    page = {'url': snapshot.url, 'html': snapshot.html, 'snapshot': snapshot, 'via': 'browser'}
+    company_data = {}
+    scraper._extract_contact_info(page, company_data)
+    scraper._extract_company_info(page, company_data, company_name)
+    return company_data
+
+
+def snapshot_cnpjbiz(driver) -> dict:
+    """Extração do CNPJ.biz com o snapshot lxml."""
+    return CNPJScraper()._extract_cnpjbiz_data(PageSnapshot.from_driver(driver))
+
+
+def check_equivalence(name: str, html: str, url: str, legacy, snapshot) -> dict:
+    """
+    Verifica que as duas abordagens extraem os mesmos campos e valores da fixture.
+
+    Raises:
+        AssertionError: Se os resultados forem diferentes
+    """
+    expected = legacy(FixtureDriver(html, url))
+    result = snapshot(FixtureDriver(html, url))
+    differences = {
+        field: (expected.get(field), result.get(field))
+        for field in sorted(set(expected) | set(result)) if expected.get(field) != result.get(field)
+    }
+    assert not differences, f"{name}: extrações diferentes (anterior, snapshot): {differences}"
+    return result
+
+
+def run_case(name: str, html: str, url: str, extractor, iterations: int, rtt: float) -> dict:
+    """Executa um caso do benchmark e retorna tempo médio e idas e voltas."""
+    total = 0.0
+    round_trips = 0
+    result = None
+
+    for _ in range(iterations):
+        driver = FixtureDriver(html, url, rtt)
+        start = time.perf_counter()
+        result = extractor(driver)
+        total += time.perf_counter() - start
+        round_trips = driver.round_trips
+
+    return {'name': name, 'avg_ms': total / iterations * 1000, 'round_trips': round_trips, 'fields': len(result)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de extração: snapshot lxml vs. consultas por elemento')
+    parser.add_argument('--iterations', type=int, default=50, help='Repetições por caso')
+    parser.add_argument('--rtt-ms', type=float, default=2.0, help='Latência simulada por chamada ao WebDriver (ms)')
+    args = parser.parse_args()
+
+    # Silenciar avisos de campos ausentes durante as repetições
+    logging.basicConfig(level=logging.ERROR)
+
+    rtt = args.rtt_ms / 1000
+    with open(os.path.join(FIXTURES_DIR, 'company_contact.html'), encoding='utf-8') as f:
+        company_html = f.read()
+    with open(os.path.join(FIXTURES_DIR, 'cnpjbiz_company.html'), encoding='utf-8') as f:
+        cnpjbiz_html = f.read()
+
+    company_url = 'https://www.exemplosistemas.com.br/contato'
+    cnpjbiz_url = 'https://cnpj.biz/12345678000190'
+
+    company_site = (lambda d: legacy_company_site(d, 'Exemplo Sistemas'),
+                    lambda d: snapshot_company_site(d, 'Exemplo Sistemas'))
+    cnpjbiz = (legacy_cnpjbiz, snapshot_cnpjbiz)
+
+    # Comparar tempos apenas de extrações equivalentes
+    check_equivalence('company_site', company_html, company_url, *company_site)
+    check_equivalence('cnpjbiz', cnpjbiz_html, cnpjbiz_url, *cnpjbiz)
+
+    cases = [
+        run_case('company_site / por elemento', company_html, company_url, company_site[0], args.iterations, rtt),
+        run_case('company_site / snapshot', company_html, company_url, company_site[1], args.iterations, rtt),
+        run_case('cnpjbiz / por elemento', cnpjbiz_html, cnpjbiz_url, cnpjbiz[0], args.iterations, rtt),
+        run_case('cnpjbiz / snapshot', cnpjbiz_html, cnpjbiz_url, cnpjbiz[1], args.iterations, rtt),
+    ]
+
+    print(f"Iterações: {args.iterations} | latência simulada por chamada: {args.rtt_ms} ms")
+    print(f"{'caso':<32}{'tempo médio (ms)':>18}{'idas e voltas':>16}{'campos':>9}")
+    for case in cases:
+        print(f"{case['name']:<32}{case['avg_ms']:>18.2f}{case['round_trips']:>16}{case['fields']:>9}")
+
+
+if __name__ == '__main__':
+    main()
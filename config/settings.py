@@ -31,9 +31,110 @@ REQUEST_TIMEOUT = 45  # Aumentado de 30 para 45 segundos
 SELENIUM_PAGE_LOAD_TIMEOUT = 45  # Aumentado de 30 para 45 segundos
 SELENIUM_IMPLICIT_WAIT = 15  # Aumentado de 10 para 15 segundos
 
+# Configurações de obtenção de páginas via HTTP
+HTTP_FETCH_TIMEOUT = 15  # Tempo limite das requisições HTTP de páginas (segundos)
+HTTP_POOL_SIZE = 20  # Conexões mantidas por host na sessão HTTP compartilhada
+MIN_STATIC_TEXT_LENGTH = 200  # Texto visível mínimo para dispensar o navegador
+
+# Configurações de limite de requisições por domínio (limites em config/sources.json, seção "rate_limits")
+RATE_LIMIT_ENABLED = True  # Aplicar os limites por domínio
+RATE_LIMIT_PENALTY = 30  # Pausa aplicada a um domínio que responde 429/503 (segundos)
+RATE_LIMIT_PROCESSES = 1  # Processos que dividem os limites (cada um usa 1/N do ritmo e da rajada)
+
+# Configurações do cliente HTTP assíncrono (buscas SearXNG e IA)
+ASYNC_HTTP_POOL_SIZE = 100  # Conexões abertas no total
+ASYNC_HTTP_PER_HOST_LIMIT = 16  # Requisições simultâneas por host
+
+# Configurações do pool de drivers Selenium
+DRIVER_POOL_MAX_SIZE = 4  # Número máximo de navegadores abertos simultaneamente
+DRIVER_MAX_PAGES = 100  # Páginas carregadas antes de reciclar o navegador
+DRIVER_CHECKOUT_TIMEOUT = 300  # Segundos de espera por um navegador livre
+
+# Configurações do cache de buscas SearXNG
+SEARCH_CACHE_ENABLED = True  # Reaproveitar resultados de buscas idênticas entre execuções
+SEARCH_CACHE_PATH = "data/cache/search_cache.sqlite"  # Banco SQLite do cache
+SEARCH_CACHE_TTL = 7 * 24 * 3600  # Validade das entradas (segundos)
+SEARCH_CACHE_MAX_ENTRIES = 50000  # Entradas mantidas antes do descarte LRU
+
+# Configurações da verificação de domínios adivinhados (sites corporativos sem resultado de busca)
+DOMAIN_RESOLVER_ENABLED = True  # Verificar via DNS os domínios candidatos antes de abrir qualquer página
+DOMAIN_RESOLVER_CACHE_PATH = "data/cache/domain_cache.sqlite"  # Banco SQLite com as respostas
+DOMAIN_RESOLVER_POSITIVE_TTL = 7 * 24 * 3600  # Validade de um domínio existente no cache (segundos)
+DOMAIN_RESOLVER_NEGATIVE_TTL = 24 * 3600  # Validade de um domínio inexistente no cache (segundos)
+DOMAIN_RESOLVER_TIMEOUT = 3  # Tempo limite de cada consulta DNS (segundos)
+DOMAIN_RESOLVER_CONCURRENCY = 32  # Consultas DNS simultâneas por lote
+
+# Configurações do armazenamento de registros de CNPJ
+CNPJ_STORE_ENABLED = True  # Reaproveitar registros de CNPJ já coletados
+CNPJ_STORE_PATH = "data/cache/cnpj_records.sqlite"  # Banco SQLite dos registros
+CNPJ_STORE_MAX_AGE = 30 * 24 * 3600  # Idade máxima dos dados da fonte (ultima_atualizacao, em segundos)
+CNPJ_STORE_MIN_REFETCH_INTERVAL = 24 * 3600  # Intervalo mínimo entre coletas do mesmo CNPJ (segundos)
+
+# Configurações do índice local de dados abertos da Receita Federal
+RECEITA_INDEX_ENABLED = True  # Consultar o índice local antes das fontes online (quando construído)
+RECEITA_INDEX_PATH = "data/receita/cnpj_index.sqlite"  # Banco gerado por "python -m utils.receita_index build"
+
+# Configurações do diário de execução (retomada com --resume)
+RUN_JOURNAL_ENABLED = True  # Registrar buscas e coletas de cada execução
+RUN_JOURNAL_DIR = "data/runs"  # Diretório dos diários (um arquivo JSON Lines por execução)
+
+# Configurações do modo de atualização (--refresh)
+REFRESH_DEFAULT_MAX_AGE = 30 * 24 * 3600  # Idade máxima de um campo antes de ser coletado novamente (segundos)
+REFRESH_FIELD_MAX_AGE = {  # Idade máxima por campo (campos cadastrais mudam pouco)
+    'Company Name (Revised)': 180 * 24 * 3600,
+    'CNPJ': 365 * 24 * 3600,
+    'Fantasy name': 180 * 24 * 3600,
+    'Location': 90 * 24 * 3600,
+    'City': 90 * 24 * 3600,
+    'State': 90 * 24 * 3600,
+    'Domain': 90 * 24 * 3600,
+    'Size': 90 * 24 * 3600,
+    'Linkedin': 90 * 24 * 3600
+}
+REFRESH_MISSING_RETRY_AGE = 7 * 24 * 3600  # Intervalo mínimo entre tentativas de preencher um campo ausente (segundos)
+REFRESH_MIN_FIELD_WEIGHT = 5  # Soma mínima dos pesos de qualidade dos campos pendentes para agendar um scraper
+
+# Configurações do orçamento de enriquecimento por empresa (somado entre todos os scrapers)
+ENRICHMENT_BUDGET_ENABLED = True  # Limitar páginas e tempo gastos com cada empresa
+ENRICHMENT_TARGET_SCORE = 0.7  # Score de qualidade a partir do qual a coleta da empresa é encerrada
+ENRICHMENT_MAX_PAGE_LOADS = 25  # Páginas carregadas (HTTP ou navegador) por empresa
+ENRICHMENT_MAX_SECONDS = 180  # Tempo de coleta por empresa (segundos)
+
+# Configurações do planejador de fontes (scrapers por empresa, ver config/sources.json)
+SOURCE_PLANNER_MIN_GAIN = 1  # Peso mínimo dos campos ausentes que uma fonte pode preencher para ser consultada
+SOURCE_PLANNER_MIN_BROWSER_GAIN = 6  # Peso mínimo para consultar fontes que exigem navegador
+SOURCE_ENRICHMENT_ENABLED = True  # Consultar, para cada empresa, também as fontes que não a encontraram
+
+# Configurações da unificação de empresas (mesma empresa encontrada por nome, CNPJ ou domínio)
+ENTITY_RESOLUTION_ENABLED = True  # Unir resultados da mesma empresa antes e durante as coletas
+ENTITY_NAME_SIMILARITY = 0.8  # Semelhança mínima (trigramas) entre nomes normalizados da mesma empresa
+
+# Configurações da fila de coletas distribuída (--distributed e --worker)
+WORK_QUEUE_URL = "sqlite:///data/queue/work_queue.sqlite"  # sqlite:///caminho (um nó) ou redis://host:porta/db
+WORK_QUEUE_VISIBILITY_TIMEOUT = 600  # Tempo sem renovação após o qual a coleta volta para a fila (segundos)
+WORK_QUEUE_MAX_ATTEMPTS = 3  # Tentativas de cada coleta antes de registrá-la como falha
+WORK_QUEUE_POLL_INTERVAL = 1.0  # Intervalo entre consultas à fila vazia (segundos)
+WORK_QUEUE_WORKER_IDLE_EXIT = 0  # Encerrar o worker após esse tempo sem coletas (segundos; 0 = nunca)
+WORK_QUEUE_REDIS_PREFIX = "crawler"  # Prefixo das chaves no Redis
+
 # Configurações de exportação
 DEFAULT_OUTPUT_FORMAT = "excel"
 DEFAULT_OUTPUT_DIR = "data/output"
+RESULT_PREVIEW_SIZE = 20  # Empresas mantidas em memória para exibição ao final da execução
+EXCEL_STREAMING_ENABLED = True  # Gravar planilhas em modo somente escrita (memória constante, nova aba a cada 1.048.576 linhas)
+EXCEL_WIDTH_SAMPLE_ROWS = 1000  # Linhas lidas antes da gravação para calcular a largura das colunas
+PARQUET_COMPRESSION = "zstd"  # Compressão do Parquet: snappy, gzip, zstd, brotli, lz4 ou none
+PARQUET_ROW_GROUP_SIZE = 10000  # Empresas por grupo de linhas gravado
+PARQUET_DICTIONARY_COLUMNS = ["State", "City", "Size"]  # Colunas gravadas como categorias
+PARQUET_PARTITION_BY = []  # Colunas de particionamento da saída (ex.: ["State"] ou ["State", "LOTE"])
+EXPORT_COMPRESSION = "none"  # Compressão das saídas ndjson e csv: none, gzip ou zstd (requer zstandard)
+EXPORT_FSYNC = "close"  # Sincronização com o disco das saídas ndjson e csv: never, batch (a cada descarga) ou close
+EXPORT_QUEUE_SIZE = 1000  # Empresas aguardando a thread de gravação (a unificação espera se a fila encher)
+EXPORT_FLUSH_ROWS = 100  # Empresas por descarga do arquivo
+EXPORT_FLUSH_INTERVAL = 1.0  # Intervalo máximo entre descargas do arquivo (segundos)
+COMPANY_STORE_PATH = "data/output/empresas.sqlite"  # Banco acumulado entre execuções (--format sqlite)
+COMPANY_STORE_BATCH_SIZE = 500  # Empresas gravadas por transação no banco acumulado
+DELTA_IGNORED_FIELDS = ["LOTE"]  # Campos desconsiderados ao comparar uma empresa com a execução anterior (--delta)
 
 # Configurações de qualidade
 MIN_QUALITY_SCORE = 0.3  # Reduzido para aceitar dados parciais
@@ -64,9 +165,18 @@ WHITELIST_SITES = [
     {"domain": "duckduckgo.com", "priority": 5, "type": "search"}
 ]
 
+# Configurações de execução concorrente
+MAX_WORKERS = 8  # Número máximo de coletas simultâneas (1 = execução sequencial)
+SCRAPER_CONCURRENCY = {  # Coletas simultâneas permitidas por scraper
+    "linkedin": 2,
+    "cnpj": 4,
+    "company_site": 4
+}
+
 # Configurações de navegação
-NAVIGATION_DELAY = 10  # Segundos entre ações de navegação
-SCROLL_PAUSE_TIME = 3  # Segundos entre rolagens
+PAGE_READY_TIMEOUT = 20  # Tempo máximo de espera pela prontidão da página (segundos)
+NETWORK_IDLE_TIME = 1.0  # Segundos sem novos recursos para considerar a rede ociosa
+WAIT_POLL_FREQUENCY = 0.2  # Intervalo entre verificações de prontidão (segundos)
 MAX_SCROLL_ATTEMPTS = 15  # Número máximo de rolagens por página
 
 # Credenciais do LinkedIn (carregadas do arquivo .env)
@@ -5,16 +5,36 @@ Responsável por orquestrar o fluxo de execução com base nos critérios fornec
 
 import json
 import logging
+import multiprocessing
 import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 
 from config import settings
 from core.criteria_parser import CriteriaParser
+from core.distributed import RemoteCollector
+from core.entity_index import EntityIndex
+from core.journal import RunJournal
 from core.quality_checker import QualityChecker
+from core.refresh_planner import PREVIOUS_SOURCE, RefreshPlanner, load_refresh_baseline
+from core.sharding import apply_settings, settings_snapshot, shard_of, shard_run_id
+from core.source_planner import SourcePlanner
 from modules.scrapers import get_scraper, get_all_scrapers
 from modules.processors.data_processor import DataProcessor
-from modules.exporters.excel_exporter import ExcelExporter
+from modules.exporters import AVAILABLE_STREAM_EXPORTERS, DeltaExporter, JSONStreamExporter, StreamExporter
+from utils.domain_resolver import get_domain_resolver
+from utils.enrichment_budget import EnrichmentBudget, budget_stats
+from utils.page_fetcher import fetch_stats
+from utils.page_waiter import wait_stats
+from utils.rate_limiter import get_rate_limiter
+from utils.search_cache import get_search_cache
+from utils.selenium_manager import get_driver_pool
+from utils.work_queue import WorkQueue
 
 logger = logging.getLogger(__name__)
 
@@ -23,12 +43,24 @@ class CrawlerController:
     Controlador principal que coordena o fluxo de execução do crawler.
     """
     
-    def __init__(self):
-        """Inicializa o controlador com componentes necessários."""
+    def __init__(self, max_workers: Optional[int] = None, scraper_concurrency: Optional[Dict[str, int]] = None):
+        """
+        Inicializa o controlador com componentes necessários.
+        
+        Args:
+            max_workers: Número máximo de coletas simultâneas (opcional)
+            scraper_concurrency: Coletas simultâneas por scraper (opcional)
+        """
+        self.max_workers = max(1, max_workers or settings.MAX_WORKERS)
+        self.scraper_concurrency = dict(settings.SCRAPER_CONCURRENCY)
+        if scraper_concurrency:
+            self.scraper_concurrency.update(scraper_concurrency)
+        
         self.criteria_parser = CriteriaParser()
         self.quality_checker = QualityChecker()
         self.data_processor = DataProcessor()
-        self.excel_exporter = ExcelExporter()
+        self.source_planner = SourcePlanner(quality_checker=self.quality_checker,
+                                            field_mapping=self.data_processor.field_mapping)
         self.sources = self._load_sources()
         self._setup_logging()
         
@@ -51,17 +83,38 @@ class CrawlerController:
             logger.error(f"Erro ao carregar fontes: {e}")
             return []
     
-    def execute(self, criteria: Dict[str, Any]) -> Dict[str, Any]:
+    def execute(self, criteria: Optional[Dict[str, Any]] = None, resume_run_id: Optional[str] = None,
+                workers: int = 1, work_queue: Optional[WorkQueue] = None) -> Dict[str, Any]:
         """
         Executa o fluxo completo do crawler com base nos critérios fornecidos.
         
         Args:
-            criteria: Dicionário com os critérios de busca
+            criteria: Dicionário com os critérios de busca (opcional na retomada)
+            resume_run_id: Identificador de uma execução interrompida a retomar (opcional)
+            workers: Número de processos entre os quais as coletas são particionadas
+            work_queue: Fila para executar as coletas em workers distribuídos (opcional)
             
         Returns:
             Dicionário com os resultados da execução
+            
+        Raises:
+            ValueError: Se o diário da execução a retomar não existir, ou se
+                workers > 1 ou work_queue forem usados com o diário desativado
         """
         start_time = datetime.now()
+        
+        journal = self._open_journal(resume_run_id)
+        if (workers > 1 or work_queue is not None) and journal is None:
+            raise ValueError("A execução com vários processos exige o diário de execução (RUN_JOURNAL_ENABLED)")
+        if journal and journal.criteria is not None:
+            if criteria and criteria != journal.criteria:
+                logger.warning(f"Critérios informados diferem dos registrados na execução {journal.run_id}; usando os registrados")
+            criteria = journal.criteria
+            if 'refresh_from' in criteria:
+                raise ValueError(f"A execução {journal.run_id} é uma atualização; execute --refresh novamente")
+        elif journal:
+            journal.start(criteria)
+        
         logger.info(f"Iniciando execução com critérios: {criteria}")
         
         # Processar critérios
@@ -72,29 +125,391 @@ class CrawlerController:
         search_plan = self._plan_search(parsed_criteria)
         logger.info(f"Plano de busca criado com {len(search_plan)} etapas")
         
-        # Executar busca
-        raw_results = self._execute_search(search_plan)
-        logger.info(f"Busca concluída. {len(raw_results)} empresas encontradas")
+        if workers > 1:
+            raw_companies = self._execute_sharded(search_plan, journal, workers)
+        else:
+            raw_companies = self._execute_search(search_plan, journal, work_queue)
+        
+        companies = self._process_companies(raw_companies, journal)
+        return self._export_run(companies, criteria.get('output', {}), journal, start_time)
+    
+    def collect_shard(self, run_id: str, shard: int, shard_count: int) -> Dict[str, Any]:
+        """
+        Executa as coletas de uma partição de uma execução, sem processar nem exportar.
+        
+        As buscas são lidas do diário da execução (nenhuma busca é repetida) e
+        as coletas são registradas no diário da partição. Uma partição
+        interrompida pode ser executada novamente e retoma de onde parou; a
+        unificação e a exportação são feitas uma única vez, ao retomar a
+        execução com o mesmo número de processos.
+        
+        Args:
+            run_id: Identificador da execução
+            shard: Partição a executar (1 a shard_count)
+            shard_count: Total de partições
+            
+        Returns:
+            Dicionário com o diário da partição, empresas concluídas e coletas registradas
+            
+        Raises:
+            ValueError: Se o diário da execução não existir ou for de uma atualização
+        """
+        run_journal = RunJournal.open_existing(run_id)
+        if 'refresh_from' in run_journal.criteria:
+            raise ValueError(f"A execução {run_id} é uma atualização e não pode ser particionada")
+        run_journal.close()
+        
+        journal = RunJournal(shard_run_id(run_id, shard, shard_count))
+        journal.start(run_journal.criteria)
+        logger.info(f"Partição {shard}/{shard_count} da execução {run_id}: {journal.path}")
+        
+        # Apenas buscas concluídas na execução, para que todas as partições
+        # vejam as mesmas empresas
+        search_plan = [
+            step for step in self._plan_search(self.criteria_parser.parse(run_journal.criteria))
+            if run_journal.get_search(step['scraper']) is not None
+        ]
+        entity_index = self._create_entity_index()
+        tasks = self._build_tasks(search_plan, run_journal, entity_index)
+        tasks = [task for task in tasks if shard_of(task['company_id'], shard_count) == shard]
+        
+        companies = 0
+        try:
+            for _ in self._run_tasks(tasks, journal, self.source_planner, entity_index=entity_index):
+                companies += 1
+        finally:
+            journal.close()
+        
+        self._log_source_stats()
+        self._log_budget_stats()
+        
+        return {
+            'run_id': journal.run_id,
+            'companies': companies,
+            'collects': journal.recorded_collects
+        }
+    
+    def refresh(self, source: str, output_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Atualiza as empresas de uma execução anterior, coletando novamente
+        apenas os campos ausentes ou desatualizados.
+        
+        Args:
+            source: Exportação JSON, diário (.jsonl) ou identificador da execução anterior
+            output_config: Configurações de saída (opcional)
+            
+        Returns:
+            Dicionário com os resultados da execução
+            
+        Raises:
+            ValueError: Se a execução anterior não existir ou tiver formato não suportado
+        """
+        start_time = datetime.now()
+        output_config = output_config or {}
+        
+        baseline = load_refresh_baseline(source)
+        logger.info(f"Iniciando atualização de {len(baseline)} empresas a partir de {source}")
+        
+        journal = self._open_journal(None)
+        if journal:
+            journal.start({'refresh_from': source, 'output': output_config})
+        
+        planner = RefreshPlanner(self.quality_checker)
+        now = time.time()
+        scrapers = {}
+        companies = {}
+        tasks = []
+        
+        for company in baseline:
+            target = planner.build_target(company['record'])
+            company_id = company['company_id'] or self._get_company_id(target)
+            if company_id in companies:
+                logger.warning(f"Empresa repetida na execução anterior ignorada: {company_id}")
+                continue
+            
+            scraper_names = planner.plan(company, now)
+            companies[company_id] = (company, scraper_names)
+            
+            for scraper_name in scraper_names:
+                if scraper_name not in scrapers:
+                    scrapers[scraper_name] = get_scraper(scraper_name)
+                tasks.append({
+                    'order': len(tasks),
+                    'company_id': company_id,
+                    'scraper_name': scraper_name,
+                    'scraper': scrapers[scraper_name],
+                    'result': target
+                })
+        
+        full_crawl = len(companies) * len(planner.scraper_fields)
+        logger.info(
+            f"Atualização agendou {len(tasks)} de {full_crawl} coletas; "
+            f"{sum(1 for _, names in companies.values() if not names)} empresas sem campos a atualizar"
+        )
+        
+        refreshed = self._refresh_companies(companies, tasks, planner, now, journal)
+        return self._export_run(refreshed, output_config, journal, start_time)
+    
+    def _process_companies(self, raw_companies: Iterator[Dict[str, Any]],
+                           journal: Optional[RunJournal]) -> Iterator[Optional[Dict[str, Any]]]:
+        """
+        Processa cada empresa assim que suas coletas terminam.
+        
+        Args:
+            raw_companies: Empresas com 'company_id' e 'data_sources'
+            journal: Diário da execução (opcional)
+            
+        Yields:
+            Dados processados ou None se a empresa não for válida
+        """
+        for raw_company in raw_companies:
+            company_data = self._process_company(raw_company)
+            if journal:
+                journal.record_company(raw_company['company_id'], company_data is not None, company_data)
+            yield company_data
+    
+    def _refresh_companies(self, companies: Dict[str, Any], tasks: List[Dict[str, Any]],
+                           planner: RefreshPlanner, now: float,
+                           journal: Optional[RunJournal]) -> Iterator[Optional[Dict[str, Any]]]:
+        """
+        Executa as coletas agendadas e unifica os novos dados com os registros anteriores.
+        
+        Args:
+            companies: Empresa da linha de base e scrapers agendados, por identificador
+            tasks: Coletas agendadas
+            planner: Planejador da atualização
+            now: Momento da atualização
+            journal: Diário da execução (opcional)
+            
+        Yields:
+            Dados processados ou None se a empresa não for válida
+        """
+        # Empresas sem campos a atualizar seguem direto para a exportação
+        for company_id, (company, scraper_names) in companies.items():
+            if not scraper_names:
+                yield self._merge_refreshed(company_id, company, [], [], planner, now, journal)
+        
+        waiting = {company_id for company_id, (_, scraper_names) in companies.items() if scraper_names}
+        for raw_company in self._run_tasks(tasks, journal):
+            company_id = raw_company['company_id']
+            waiting.discard(company_id)
+            company, scraper_names = companies[company_id]
+            yield self._merge_refreshed(
+                company_id, company, scraper_names, raw_company['data_sources'], planner, now, journal
+            )
+        
+        # Empresas cujas coletas não retornaram dados mantêm o registro e as datas anteriores
+        for company_id in waiting:
+            company, _ = companies[company_id]
+            yield self._merge_refreshed(company_id, company, [], [], planner, now, journal)
+    
+    def _merge_refreshed(self, company_id: str, company: Dict[str, Any], scraper_names: List[str],
+                         data_sources: List[Dict[str, Any]], planner: RefreshPlanner, now: float,
+                         journal: Optional[RunJournal]) -> Optional[Dict[str, Any]]:
+        """
+        Unifica os dados coletados na atualização com o registro anterior da empresa.
+        
+        Args:
+            company_id: Identificador da empresa
+            company: Empresa da linha de base
+            scraper_names: Scrapers executados para a empresa
+            data_sources: Dados coletados na atualização
+            planner: Planejador da atualização
+            now: Momento da atualização
+            journal: Diário da execução (opcional)
+            
+        Returns:
+            Dados processados ou None se a empresa não for válida
+        """
+        previous = dict(company['record'], source=PREVIOUS_SOURCE)
+        company_data = self._process_company({
+            'company_id': company_id,
+            'data_sources': list(data_sources) + [previous]
+        })
+        
+        if journal:
+            field_ages = planner.updated_field_ages(company, scraper_names, now)
+            journal.record_company(company_id, company_data is not None, company_data, field_ages)
+        
+        return company_data
+    
+    def _export_run(self, companies: Iterator[Optional[Dict[str, Any]]], output_config: Dict[str, Any],
+                    journal: Optional[RunJournal], start_time: datetime) -> Dict[str, Any]:
+        """
+        Exporta as empresas à medida que são processadas e registra as estatísticas da execução.
+        
+        Args:
+            companies: Dados processados de cada empresa (None para empresas inválidas)
+            output_config: Configurações de saída
+            journal: Diário da execução (opcional)
+            start_time: Início da execução
+            
+        Returns:
+            Dicionário com os resultados da execução
+        """
+        # Cada empresa segue para processamento, validação e exportação assim
+        # que todas as suas coletas terminam
+        exporter = self._create_exporter(output_config)
+        delta_exporter = self._create_delta_exporter(output_config, journal)
+        preview = []
+        total_found = 0
+        total_valid = 0
+        completed = False
         
-        # Processar e validar resultados
-        processed_results = self._process_results(raw_results)
-        logger.info(f"Processamento concluído. {len(processed_results)} empresas válidas")
+        try:
+            for company_data in companies:
+                total_found += 1
+                if not company_data:
+                    continue
+                
+                exporter.write(company_data)
+                if delta_exporter:
+                    delta_exporter.write(company_data)
+                total_valid += 1
+                
+                if len(preview) < settings.RESULT_PREVIEW_SIZE:
+                    preview.append(company_data)
+            
+            # Empresas removidas só são conhecidas ao final de uma execução completa
+            if delta_exporter:
+                delta_exporter.finish()
+            completed = True
+        except BaseException:
+            if journal and 'refresh_from' not in journal.criteria:
+                logger.error(f"Execução interrompida; para retomá-la use --resume {journal.run_id}")
+            if delta_exporter:
+                logger.warning(f"Arquivo de diferenças incompleto (sem as empresas removidas): {delta_exporter.output_path}")
+            raise
+        finally:
+            # Mesmo em caso de falha, finalizar o arquivo com as empresas já exportadas
+            output_file = exporter.close()
+            delta_file = delta_exporter.close() if delta_exporter else None
+            if journal:
+                if completed:
+                    journal.finish(output_file, total_found, total_valid)
+                journal.close()
         
-        # Exportar resultados
-        output_file = self._export_results(processed_results, criteria.get('output', {}))
+        logger.info(f"Busca concluída. {total_found} empresas encontradas, {total_valid} válidas")
         logger.info(f"Resultados exportados para {output_file}")
+        if delta_file:
+            logger.info(f"Diferenças exportadas para {delta_file}")
         
         end_time = datetime.now()
         execution_time = (end_time - start_time).total_seconds()
         
+        # Calcular vazão (empresas por minuto)
+        throughput = total_found / (execution_time / 60) if execution_time > 0 else 0.0
+        logger.info(f"Vazão da execução: {throughput:.2f} empresas/minuto")
+        logger.info(f"Uso do pool de drivers: {get_driver_pool().stats()}")
+        self._log_wait_stats()
+        self._log_fetch_stats()
+        self._log_search_cache_stats()
+        self._log_domain_resolver_stats()
+        self._log_rate_limit_stats()
+        self._log_budget_stats()
+        
         return {
-            'companies': processed_results,
+            'run_id': journal.run_id if journal else None,
+            'companies': preview,
             'output_file': output_file,
+            'delta_file': delta_file,
             'execution_time': execution_time,
-            'total_found': len(raw_results),
-            'total_valid': len(processed_results)
+            'throughput': throughput,
+            'total_found': total_found,
+            'total_valid': total_valid
         }
     
+    def _open_journal(self, resume_run_id: Optional[str]) -> Optional[RunJournal]:
+        """
+        Abre o diário da execução.
+        
+        Args:
+            resume_run_id: Identificador de uma execução a retomar (opcional)
+            
+        Returns:
+            Diário da execução ou None se o diário estiver desativado
+            
+        Raises:
+            ValueError: Se o diário da execução a retomar não existir
+        """
+        if resume_run_id:
+            journal = RunJournal.open_existing(resume_run_id)
+            logger.info(
+                f"Retomando execução {journal.run_id}: {journal.recorded_collects} coletas e "
+                f"{journal.completed_companies} empresas concluídas registradas"
+            )
+            return journal
+        
+        if not settings.RUN_JOURNAL_ENABLED:
+            return None
+        
+        journal = RunJournal()
+        logger.info(f"Diário da execução {journal.run_id}: {journal.path}")
+        return journal
+    
+    def _log_wait_stats(self) -> None:
+        """Registra no log a duração real das esperas de página da execução."""
+        for label, entry in sorted(wait_stats.summary().items()):
+            logger.info(
+                f"Espera '{label}': {entry['count']} vezes, média {entry['avg']:.2f}s, "
+                f"máximo {entry['max']:.2f}s, {entry['timeouts']} timeouts"
+            )
+    
+    def _log_fetch_stats(self) -> None:
+        """Registra no log, por domínio, quantas páginas precisaram de navegador."""
+        for domain, entry in sorted(fetch_stats.summary().items()):
+            logger.info(
+                f"Domínio {domain}: {entry['http']} via HTTP, {entry['browser']} via navegador "
+                f"(escalada {entry['escalation_rate']:.0%}), {entry['missing']} inexistentes, "
+                f"{entry['failed']} falhas, motivos: {entry['reasons']}"
+            )
+    
+    def _log_search_cache_stats(self) -> None:
+        """Registra no log o aproveitamento do cache de buscas SearXNG."""
+        if not settings.SEARCH_CACHE_ENABLED:
+            return
+        
+        stats = get_search_cache().stats()
+        logger.info(
+            f"Cache de buscas: {stats['hits']} acertos, {stats['misses']} falhas "
+            f"(taxa de acerto {stats['hit_rate']:.0%}), {stats['expired']} expiradas, "
+            f"{stats['evicted']} descartadas, {stats['entries']} entradas"
+        )
+    
+    def _log_domain_resolver_stats(self) -> None:
+        """Registra no log quantos domínios adivinhados foram descartados antes de abrir o navegador."""
+        if not settings.DOMAIN_RESOLVER_ENABLED:
+            return
+        
+        stats = get_domain_resolver().stats()
+        if stats['hits'] or stats['lookups']:
+            logger.info(
+                f"Verificação de domínios: {stats['lookups']} consultas DNS, {stats['hits']} respostas do cache, "
+                f"{stats['live']} existentes, {stats['dead']} inexistentes, {stats['errors']} erros temporários"
+            )
+    
+    def _log_budget_stats(self) -> None:
+        """Registra no log o consumo dos orçamentos de enriquecimento, por motivo de parada."""
+        labels = {
+            'target': 'score alvo atingido',
+            'pages': 'limite de páginas',
+            'time': 'limite de tempo',
+            'complete': 'fontes esgotadas'
+        }
+        for reason, entry in sorted(budget_stats.summary().items()):
+            logger.info(
+                f"Orçamento ({labels.get(reason, reason)}): {entry['companies']} empresas, "
+                f"média de {entry['avg_page_loads']:.1f} páginas e {entry['avg_elapsed']:.1f}s por empresa"
+            )
+    
+    def _log_rate_limit_stats(self) -> None:
+        """Registra no log, por domínio, quanto tempo os workers aguardaram pelo limite de requisições."""
+        for domain, entry in sorted(get_rate_limiter().stats().items()):
+            logger.info(
+                f"Limite de requisições {domain}: {entry['permits']} permissões, {entry['waits']} esperas "
+                f"({entry['wait_time']:.1f}s no total), {entry['penalties']} pausas por sobrecarga"
+            )
+    
     def _plan_search(self, criteria: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
         Cria um plano de busca com base nos critérios processados.
@@ -107,8 +522,8 @@ class CrawlerController:
         """
         search_plan = []
         
-        # Definir ordem de execução dos scrapers
-        scraper_order = ['linkedin', 'cnpj', 'company_site']
+        # Ordem de execução dos scrapers definida pela prioridade e custo das fontes
+        scraper_order = self.source_planner.search_order(list(get_all_scrapers()))
         
         # Adicionar etapas de busca para cada scraper
         for scraper_name in scraper_order:
@@ -120,61 +535,643 @@ class CrawlerController:
         
         return search_plan
     
-    def _execute_search(self, search_plan: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _execute_search(self, search_plan: List[Dict[str, Any]], journal: Optional[RunJournal] = None,
+                        work_queue: Optional[WorkQueue] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Executa o plano de busca, entregando cada empresa assim que todas as
+        suas coletas terminam.
+        
+        As buscas de todas as etapas rodam primeiro, para que se saiba quais
+        fontes podem ser consultadas para cada empresa; em seguida as coletas
+        rodam em paralelo, limitadas pela concorrência de cada scraper e por
+        max_workers no total, na ordem escolhida pelo planejador de fontes.
+        Coletas já registradas no diário não são repetidas: seus dados são
+        reaproveitados e unificados novamente com os das demais fontes.
+        
+        Args:
+            search_plan: Plano de busca a ser executado
+            journal: Diário da execução (opcional)
+            work_queue: Fila para executar as coletas em workers distribuídos (opcional)
+            
+        Yields:
+            Dicionários com 'company_id' e 'data_sources' de cada empresa
+        """
+        entity_index = self._create_entity_index()
+        tasks = self._build_tasks(search_plan, journal, entity_index)
+        yield from self._run_tasks(tasks, journal, self.source_planner, work_queue, entity_index)
+        self._log_source_stats()
+        self._log_entity_stats(entity_index)
+    
+    def _execute_sharded(self, search_plan: List[Dict[str, Any]], journal: RunJournal,
+                         workers: int) -> Iterator[Dict[str, Any]]:
         """
-        Executa o plano de busca.
+        Executa o plano de busca com as coletas particionadas entre processos.
+        
+        As buscas rodam neste processo e ficam no diário da execução. Cada
+        processo executa as coletas de uma partição (ver collect_shard), com
+        seu próprio pool de drivers e diário; ao final, as coletas de todas
+        as partições são reunidas aqui para a unificação e exportação.
         
         Args:
             search_plan: Plano de busca a ser executado
+            journal: Diário da execução
+            workers: Número de processos (e de partições)
+            
+        Yields:
+            Dicionários com 'company_id' e 'data_sources' de cada empresa
+            
+        Raises:
+            RuntimeError: Se alguma partição falhar
+        """
+        entity_index = self._create_entity_index()
+        tasks = self._build_tasks(search_plan, journal, entity_index)
+        companies = len({task['company_id'] for task in tasks})
+        logger.info(f"Particionando {companies} empresas entre {workers} processos")
+        
+        # Processos iniciados do zero: sem herdar threads, pools de drivers ou locks deste processo.
+        # Os limites por domínio são divididos entre as partições, que acessam os mesmos hosts
+        snapshot = settings_snapshot()
+        snapshot['RATE_LIMIT_PROCESSES'] = settings.RATE_LIMIT_PROCESSES * workers
+        failed = []
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=apply_settings, initargs=(snapshot,)) as pool:
+            futures = {
+                pool.submit(_collect_shard_process, journal.run_id, shard, workers, self.max_workers): shard
+                for shard in range(1, workers + 1)
+            }
+            for future in as_completed(futures):
+                shard = futures[future]
+                try:
+                    result = future.result()
+                    logger.info(
+                        f"Partição {shard}/{workers} concluída: {result['companies']} empresas, "
+                        f"{result['collects']} coletas registradas em {result['run_id']}"
+                    )
+                except Exception as e:
+                    logger.error(f"Erro na partição {shard}/{workers}: {e}")
+                    failed.append(shard)
+        
+        if failed:
+            raise RuntimeError(
+                f"Partições {sorted(failed)} falharam; para retomá-las use --resume {journal.run_id} --workers {workers}"
+            )
+        
+        yield from self._merge_shards(tasks, journal.run_id, workers, entity_index)
+        self._log_entity_stats(entity_index)
+    
+    def _merge_shards(self, tasks: List[Dict[str, Any]], run_id: str, shard_count: int,
+                      entity_index: Optional[EntityIndex] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Reúne as coletas registradas nos diários das partições.
+        
+        Empresas de partições diferentes que as coletas revelaram ser a mesma
+        (mesmo CNPJ ou domínio) são unidas aqui.
+        
+        Args:
+            tasks: Coletas da execução, como geradas por _build_tasks
+            run_id: Identificador da execução
+            shard_count: Total de partições
+            entity_index: Índice de entidades usado em _build_tasks (opcional)
+            
+        Yields:
+            Dicionários com 'company_id' e 'data_sources' de cada empresa
+        """
+        journals = {
+            shard: RunJournal(shard_run_id(run_id, shard, shard_count))
+            for shard in range(1, shard_count + 1)
+        }
+        
+        companies = {}
+        for task in tasks:
+            company_id = task['company_id']
+            state = companies.setdefault(company_id, {'company_id': company_id, 'collected': [], 'budget': None})
+            
+            # Fontes não consultadas (evitadas pelo planejador ou pelo orçamento) não constam no diário
+            recorded, detailed_data = journals[shard_of(company_id, shard_count)].get_collect(
+                task['scraper_name'], company_id
+            )
+            if recorded:
+                self._add_collected(task, detailed_data, state)
+        
+        logger.info(f"Coletas de {shard_count} partições reunidas: {sum(j.recorded_collects for j in journals.values())} coletas")
+        
+        if entity_index is not None:
+            for state in companies.values():
+                for _, detailed_data in state['collected']:
+                    entity_index.link(state['company_id'], detailed_data)
             
+            entities = {}
+            for state in companies.values():
+                canonical = entity_index.canonical(state['company_id'])
+                if canonical in entities:
+                    entities[canonical]['collected'].extend(state['collected'])
+                else:
+                    entities[canonical] = dict(state, company_id=canonical)
+            companies = entities
+        
+        for state in companies.values():
+            company = self._finish_company(state)
+            if company:
+                yield company
+    
+    def _build_tasks(self, search_plan: List[Dict[str, Any]], journal: Optional[RunJournal],
+                     entity_index: Optional[EntityIndex] = None) -> List[Dict[str, Any]]:
+        """
+        Executa as buscas e monta a lista de coletas da execução.
+        
+        Args:
+            search_plan: Plano de busca a ser executado
+            journal: Diário da execução (opcional)
+            entity_index: Índice de entidades para unir resultados da mesma empresa (opcional)
+            
+        Returns:
+            Coletas das buscas, seguidas das coletas de enriquecimento (se ativado)
+        """
+        tasks = self._discover_companies(search_plan, journal, entity_index)
+        if settings.SOURCE_ENRICHMENT_ENABLED:
+            tasks = self._add_enrichment_tasks(tasks)
+        return tasks
+    
+    def _create_entity_index(self) -> Optional[EntityIndex]:
+        """
+        Cria o índice de entidades de uma execução.
+        
         Returns:
-            Lista de resultados brutos da busca
+            Índice de entidades ou None se a unificação estiver desativada
+        """
+        return EntityIndex() if settings.ENTITY_RESOLUTION_ENABLED else None
+    
+    def _log_entity_stats(self, entity_index: Optional[EntityIndex]) -> None:
+        """Registra no log as uniões feitas pelo índice de entidades."""
+        if entity_index is None:
+            return
+        
+        stats = entity_index.stats()
+        logger.info(
+            f"Unificação de empresas: {stats['merges']} uniões ({stats['fuzzy_merges']} por semelhança de nome), "
+            f"{stats['conflicts']} evitadas por CNPJs diferentes"
+        )
+    
+    def _log_source_stats(self) -> None:
+        """Registra no log as coletas feitas e evitadas pelo planejador, por fonte."""
+        for scraper_name, entry in sorted(self.source_planner.stats().items()):
+            logger.info(
+                f"Fonte {scraper_name}: {entry['calls']} coletas, {entry['successes']} com dados, "
+                f"{entry['skipped']} evitadas, latência média {entry['latency']:.1f}s, "
+                f"taxa de sucesso {entry['success_rate']:.0%}"
+            )
+    
+    def _add_enrichment_tasks(self, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
-        all_results = []
-        company_data = {}  # Dicionário para armazenar dados por empresa
+        Acrescenta, para cada empresa, coletas nas fontes que não a encontraram.
+        
+        O alvo dessas coletas é o primeiro resultado de busca da empresa; o
+        planejador de fontes decide se e quando elas são de fato executadas.
+        
+        Args:
+            tasks: Coletas geradas pelas buscas
+            
+        Returns:
+            Coletas originais seguidas das coletas de enriquecimento
+        """
+        scrapers = {task['scraper_name']: task['scraper'] for task in tasks}
+        sources = {}
+        targets = {}
+        for task in tasks:
+            sources.setdefault(task['company_id'], set()).add(task['scraper_name'])
+            targets.setdefault(task['company_id'], task['result'])
+        
+        available = get_all_scrapers()
+        enrichment_order = [
+            scraper_name for scraper_name in self.source_planner.search_order(list(self.source_planner.profiles))
+            if scraper_name in available
+        ]
+        
+        enriched = list(tasks)
+        for company_id, target in targets.items():
+            for scraper_name in enrichment_order:
+                if scraper_name in sources[company_id]:
+                    continue
+                
+                if scraper_name not in scrapers:
+                    scrapers[scraper_name] = get_scraper(scraper_name)
+                enriched.append({
+                    'order': len(enriched),
+                    'company_id': company_id,
+                    'scraper_name': scraper_name,
+                    'scraper': scrapers[scraper_name],
+                    'result': target
+                })
+        
+        return enriched
+    
+    def _run_tasks(self, tasks: List[Dict[str, Any]], journal: Optional[RunJournal] = None,
+                   source_planner: Optional[SourcePlanner] = None,
+                   work_queue: Optional[WorkQueue] = None,
+                   entity_index: Optional[EntityIndex] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Executa as coletas em paralelo, entregando cada empresa assim que
+        suas coletas terminam.
+        
+        Sem planejador, todas as coletas de cada empresa são executadas ao
+        mesmo tempo. Com planejador, as coletas de uma empresa são feitas uma
+        de cada vez, na ordem escolhida por ele, e as restantes são descartadas
+        quando o registro atinge o score alvo ou nenhuma fonte compensa o custo;
+        empresas diferentes continuam sendo coletadas em paralelo. Em ambos os
+        casos, a coleta de uma empresa para quando seu orçamento de páginas e
+        tempo se esgota. Com uma fila de coletas, as coletas são publicadas na
+        fila e executadas pelos workers distribuídos em vez de threads locais.
+        
+        Com o índice de entidades, o CNPJ e o domínio de cada coleta são
+        ligados à empresa; se revelarem que duas empresas em andamento são a
+        mesma, elas passam a ser coletadas como uma só e as fontes já
+        consultadas para uma delas não são consultadas de novo para a outra.
+        
+        Args:
+            tasks: Coletas com 'order', 'company_id', 'scraper_name', 'scraper' e 'result'
+            journal: Diário da execução (opcional)
+            source_planner: Planejador de fontes (opcional)
+            work_queue: Fila de coletas distribuída (opcional; exige o diário)
+            entity_index: Índice de entidades da execução (opcional)
+            
+        Yields:
+            Dicionários com 'company_id' e 'data_sources' de cada empresa
+        """
+        if not tasks:
+            return
+        
+        # Estado das empresas em andamento: coletas não iniciadas (uma por
+        # scraper), scrapers já iniciados, dados coletados, coletas em
+        # execução, orçamento e identificadores unidos ao da empresa (todos
+        # apontam para o mesmo estado)
+        companies = {}
+        for task in tasks:
+            state = companies.get(task['company_id'])
+            if state is None:
+                state = companies[task['company_id']] = {
+                    'company_id': task['company_id'],
+                    'remaining': {},
+                    'started': set(),
+                    'collected': [],
+                    'running': 0,
+                    'budget': self._create_budget(task['company_id']),
+                    'aliases': {task['company_id']}
+                }
+            state['remaining'].setdefault(task['scraper_name'], task)
+        restored = 0
+        merges = {'companies': 0, 'skipped': 0}
+        
+        global_slots = threading.BoundedSemaphore(self.max_workers)
+        executors = {}
+        futures = {}
+        done_queue = queue.Queue()
+        remote = RemoteCollector(work_queue, journal.run_id) if work_queue is not None else None
+        
+        def submit(task, state):
+            scraper_name = task['scraper_name']
+            if remote is not None:
+                future = remote.submit(task, state['budget'])
+            else:
+                if scraper_name not in executors:
+                    executors[scraper_name] = ThreadPoolExecutor(
+                        max_workers=self._get_worker_count(scraper_name),
+                        thread_name_prefix=f"{scraper_name}-worker"
+                    )
+                future = executors[scraper_name].submit(
+                    self._collect_result, task['scraper'], task['result'], global_slots, state['budget']
+                )
+            
+            futures[future] = task
+            state['running'] += 1
+            future.add_done_callback(done_queue.put)
+        
+        def add_collected(task, detailed_data, state):
+            """Guarda os dados coletados e une as empresas que eles revelam ser a mesma."""
+            self._add_collected(task, detailed_data, state)
+            if entity_index is None or not detailed_data:
+                return
+            if not entity_index.link(task['company_id'], detailed_data):
+                return
+            
+            for other in {id(other): other for other in companies.values()}.values():
+                if other is not state and entity_index.same_entity(other['company_id'], state['company_id']):
+                    merges['skipped'] += self._merge_states(state, other)
+                    merges['companies'] += 1
+                    for alias in other['aliases']:
+                        companies[alias] = state
+            state['company_id'] = entity_index.canonical(state['company_id'])
+        
+        def finish(state):
+            for alias in state['aliases']:
+                companies.pop(alias, None)
+            return self._finish_company(state)
+        
+        def advance(state):
+            """Inicia as próximas coletas da empresa; retorna True se ela terminou."""
+            nonlocal restored
+            
+            while not state['running']:
+                next_tasks = self._next_tasks(state, source_planner)
+                if not next_tasks:
+                    return True
+                
+                for task in next_tasks:
+                    state['started'].add(task['scraper_name'])
+                    recorded, detailed_data = (
+                        journal.get_collect(task['scraper_name'], task['company_id']) if journal else (False, None)
+                    )
+                    if recorded:
+                        add_collected(task, detailed_data, state)
+                        restored += 1
+                    else:
+                        submit(task, state)
+            
+            return False
+        
+        try:
+            # Os resultados são unificados apenas nesta thread; empresas cujas
+            # coletas estão todas no diário são entregues antes das demais
+            for company_id in list(companies):
+                state = companies.get(company_id)
+                if state is not None and advance(state):
+                    company = finish(state)
+                    if company:
+                        yield company
+            
+            if restored:
+                logger.info(f"{restored} coletas reaproveitadas do diário; {len(futures)} coletas em andamento")
+            
+            while futures:
+                future = done_queue.get()
+                task = futures.pop(future)
+                company_id = task['company_id']
+                state = companies[company_id]
+                state['running'] -= 1
+                
+                detailed_data, elapsed = future.result()
+                if source_planner and elapsed is not None:
+                    source_planner.record(task['scraper_name'], elapsed, detailed_data)
+                if journal and detailed_data is not None:
+                    journal.record_collect(task['scraper_name'], company_id, detailed_data)
+                
+                add_collected(task, detailed_data, state)
+                if advance(state):
+                    company = finish(state)
+                    if company:
+                        yield company
+            
+            if merges['companies']:
+                logger.info(
+                    f"{merges['companies']} empresas unidas durante as coletas; "
+                    f"{merges['skipped']} coletas duplicadas evitadas"
+                )
+        
+        finally:
+            for future in futures:
+                future.cancel()
+            for executor in executors.values():
+                executor.shutdown(wait=True)
+            if remote is not None:
+                remote.shutdown()
+    
+    def _create_budget(self, company_id: str) -> Optional[EnrichmentBudget]:
+        """
+        Cria o orçamento de enriquecimento de uma empresa.
+        
+        Args:
+            company_id: Identificador da empresa
+            
+        Returns:
+            Orçamento ou None se desativado
+        """
+        if not settings.ENRICHMENT_BUDGET_ENABLED:
+            return None
+        
+        def scorer(data_sources):
+            return self.quality_checker.weighted_score(self.source_planner.build_record(data_sources))
+        
+        return EnrichmentBudget(company_id, scorer)
+    
+    def _next_tasks(self, state: Dict[str, Any], source_planner: Optional[SourcePlanner]) -> List[Dict[str, Any]]:
+        """
+        Escolhe as próximas coletas de uma empresa.
+        
+        Args:
+            state: Estado da empresa em andamento
+            source_planner: Planejador de fontes (opcional)
+            
+        Returns:
+            Coletas a iniciar (vazia se a empresa não tem mais coletas a fazer)
+        """
+        company_tasks = state['remaining']
+        if not company_tasks:
+            return []
+        
+        if state['budget'] is not None and state['budget'].exhausted:
+            logger.info(f"Orçamento de {state['company_id']} esgotado; fontes não consultadas: {sorted(company_tasks)}")
+            company_tasks.clear()
+            return []
+        
+        if source_planner is None:
+            next_tasks = list(company_tasks.values())
+            company_tasks.clear()
+            return next_tasks
+        
+        data_sources = [data for _, data in state['collected']]
+        scraper_name = source_planner.next_source(data_sources, list(company_tasks))
+        if scraper_name is None:
+            logger.debug(f"Coleta de {state['company_id']} encerrada sem consultar: {sorted(company_tasks)}")
+            company_tasks.clear()
+            return []
+        
+        return [company_tasks.pop(scraper_name)]
+    
+    def _add_collected(self, task: Dict[str, Any], detailed_data: Optional[Dict[str, Any]],
+                       state: Dict[str, Any]) -> None:
+        """
+        Guarda os dados de uma coleta concluída.
+        
+        Args:
+            task: Coleta concluída
+            detailed_data: Dados coletados (None em caso de erro)
+            state: Estado da empresa em andamento
+        """
+        if not detailed_data:
+            return
+        
+        # Identificar a fonte para a unificação (nem todos os scrapers a informam)
+        if 'source' not in detailed_data:
+            detailed_data = dict(detailed_data, source=task['scraper_name'])
+        state['collected'].append((task['order'], detailed_data))
+        
+        if state['budget'] is not None:
+            state['budget'].add_source(detailed_data)
+    
+    def _merge_states(self, state: Dict[str, Any], other: Dict[str, Any]) -> int:
+        """
+        Une ao estado de uma empresa em andamento o de outra que é a mesma empresa.
+        
+        Coletas pendentes de um scraper já iniciado (ou também pendente) para
+        a empresa são descartadas. As coletas em execução da outra empresa
+        continuam e seus dados passam a ser entregues a este estado.
+        
+        Args:
+            state: Estado que permanece
+            other: Estado unido a ele
+            
+        Returns:
+            Número de coletas pendentes descartadas por duplicidade
+        """
+        skipped = 0
+        for scraper_name in list(state['remaining']):
+            if scraper_name in other['started']:
+                del state['remaining'][scraper_name]
+                skipped += 1
+        for scraper_name, task in other['remaining'].items():
+            if scraper_name in state['remaining'] or scraper_name in state['started']:
+                skipped += 1
+            else:
+                state['remaining'][scraper_name] = task
+        
+        state['started'] |= other['started']
+        state['collected'].extend(other['collected'])
+        state['running'] += other['running']
+        state['aliases'] |= other['aliases']
+        
+        if state['budget'] is not None and other['budget'] is not None:
+            state['budget'].charge(other['budget'].page_loads, other['budget'].elapsed)
+            for _, detailed_data in other['collected']:
+                state['budget'].add_source(detailed_data)
+        
+        logger.debug(f"Empresa {other['company_id']} unida a {state['company_id']}")
+        return skipped
+    
+    def _finish_company(self, state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Monta uma empresa cujas coletas terminaram.
+        
+        Args:
+            state: Estado da empresa concluída
+            
+        Returns:
+            Dicionário com 'company_id' e 'data_sources', ou None se nenhuma
+            fonte retornou dados
+        """
+        if state['budget'] is not None:
+            state['budget'].finish()
+        
+        data_sources = state['collected']
+        if not data_sources:
+            return None
+        
+        # Manter a ordem do plano de busca na unificação das fontes
+        data_sources.sort(key=lambda item: item[0])
+        return {
+            'company_id': state['company_id'],
+            'data_sources': [data for _, data in data_sources]
+        }
+    
+    def _discover_companies(self, search_plan: List[Dict[str, Any]],
+                            journal: Optional[RunJournal] = None,
+                            entity_index: Optional[EntityIndex] = None) -> List[Dict[str, Any]]:
+        """
+        Executa as buscas do plano e monta a lista de coletas a realizar.
+        
+        Buscas já registradas no diário são reaproveitadas, o que mantém a
+        ordem das coletas idêntica à da execução original. Com o índice de
+        entidades, os identificadores são atribuídos após todas as buscas,
+        para que variações do nome, o CNPJ e o domínio da mesma empresa
+        vindos de fontes diferentes resultem no mesmo identificador.
+        
+        Args:
+            search_plan: Plano de busca a ser executado
+            journal: Diário da execução (opcional)
+            entity_index: Índice de entidades (opcional)
+            
+        Returns:
+            Lista de coletas com empresa, scraper e resultado da busca, na ordem do plano
+        """
+        tasks = []
         
-        # Executar cada etapa do plano
         for step in search_plan:
+            if step['type'] != 'search':
+                continue
+            
             try:
                 logger.info(f"Executando etapa: {step['type']} com {step['scraper']}")
                 
-                # Obter scraper
                 scraper = get_scraper(step['scraper'])
-                
-                # Executar busca
-                if step['type'] == 'search':
+                search_results = journal.get_search(step['scraper']) if journal else None
+                if search_results is not None:
+                    logger.info(f"Busca com {step['scraper']} reaproveitada do diário: {len(search_results)} resultados")
+                else:
                     search_results = scraper.search(step['criteria'])
                     logger.info(f"Busca com {step['scraper']} encontrou {len(search_results)} resultados")
-                    
-                    # Para cada resultado da busca, coletar dados detalhados
-                    for result in search_results:
-                        try:
-                            # Identificar empresa (por nome ou domínio)
-                            company_id = self._get_company_id(result)
-                            
-                            # Coletar dados detalhados
-                            detailed_data = scraper.collect(result, [])
-                            
-                            # Armazenar dados no dicionário de empresas
-                            if company_id not in company_data:
-                                company_data[company_id] = []
-                            
-                            company_data[company_id].append(detailed_data)
-                            
-                        except Exception as e:
-                            logger.error(f"Erro ao coletar dados para {result.get('name', 'desconhecido')}: {e}")
+                    if journal:
+                        journal.record_search(step['scraper'], search_results)
+                
+                for result in search_results:
+                    tasks.append({
+                        'order': len(tasks),
+                        'company_id': None,
+                        'scraper_name': step['scraper'],
+                        'scraper': scraper,
+                        'result': result
+                    })
             
             except Exception as e:
                 logger.error(f"Erro ao executar etapa {step['type']} com {step['scraper']}: {e}")
         
-        # Converter dicionário para lista
-        for company_id, data_list in company_data.items():
-            all_results.append({
-                'company_id': company_id,
-                'data_sources': data_list
-            })
+        if entity_index is not None:
+            for task in tasks:
+                entity_index.add(task['result'])
+        
+        for task in tasks:
+            company_id = entity_index.lookup(task['result']) if entity_index is not None else None
+            task['company_id'] = company_id or self._get_company_id(task['result'])
         
-        return all_results
+        return tasks
+    
+    def _collect_result(self, scraper, result: Dict[str, Any], global_slots: threading.BoundedSemaphore,
+                        budget: Optional[EnrichmentBudget] = None) -> Tuple[Optional[Dict[str, Any]], Optional[float]]:
+        """
+        Coleta dados detalhados de um resultado de busca (executado nos workers).
+        
+        Args:
+            scraper: Instância do scraper
+            result: Resultado da busca
+            global_slots: Semáforo que limita as coletas simultâneas no total
+            budget: Orçamento de enriquecimento da empresa (opcional)
+            
+        Returns:
+            Tupla (dados coletados ou None em caso de erro, duração da coleta em
+            segundos ou None se a coleta não foi feita por falta de orçamento)
+        """
+        with global_slots:
+            if budget is not None and budget.exhausted:
+                return None, None
+            
+            start = time.monotonic()
+            try:
+                with budget.activate() if budget is not None else nullcontext():
+                    return scraper.collect(result, []), time.monotonic() - start
+            
+            except Exception as e:
+                logger.error(f"Erro ao coletar dados para {result.get('name', 'desconhecido')}: {e}")
+                return None, time.monotonic() - start
+    
+    def _get_worker_count(self, scraper_name: str) -> int:
+        """
+        Obtém o número de workers para as coletas de um scraper.
+        
+        Args:
+            scraper_name: Nome do scraper
+            
+        Returns:
+            Número de coletas simultâneas permitidas
+        """
+        concurrency = self.scraper_concurrency.get(scraper_name, 1)
+        return max(1, min(concurrency, self.max_workers))
     
     def _get_company_id(self, result: Dict[str, Any]) -> str:
         """
@@ -216,71 +1213,109 @@ class CrawlerController:
         """
         return ''.join(c for c in cnpj if c.isdigit())
     
-    def _process_results(self, raw_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _process_company(self, raw_company: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
-        Processa e valida os resultados brutos.
+        Unifica as fontes de uma empresa e verifica a qualidade dos dados.
         
         Args:
-            raw_results: Resultados brutos da busca
+            raw_company: Empresa com 'company_id' e 'data_sources'
             
         Returns:
-            Lista de resultados processados e validados
+            Dados processados ou None se a empresa não for válida
         """
         # Usar o processador de dados para unificar informações de múltiplas fontes
-        processed_data = self.data_processor.process(raw_results)
+        processed_data = self.data_processor.process([raw_company])
+        if not processed_data:
+            return None
         
-        # Verificar qualidade dos dados
-        validated_results = []
+        company_data = processed_data[0]
         
-        for company_data in processed_data:
-            # Verificar qualidade
-            quality_score = self.quality_checker.check_quality(company_data)
-            
-            if quality_score >= settings.MIN_QUALITY_SCORE:
-                validated_results.append(company_data)
-            else:
-                logger.warning(f"Empresa {company_data.get('Company Name (Revised)', 'Desconhecida')} não atingiu score mínimo de qualidade: {quality_score}")
+        # Verificar qualidade
+        quality_score = self.quality_checker.check_quality(company_data)
+        if quality_score < settings.MIN_QUALITY_SCORE:
+            logger.warning(f"Empresa {company_data.get('Company Name (Revised)', 'Desconhecida')} não atingiu score mínimo de qualidade: {quality_score}")
+            return None
         
-        return validated_results
+        return company_data
     
-    def _export_results(self, results: List[Dict[str, Any]], output_config: Dict[str, Any]) -> str:
+    def _create_exporter(self, output_config: Dict[str, Any]) -> StreamExporter:
         """
-        Exporta os resultados para o formato especificado.
+        Cria o exportador incremental para o formato especificado.
         
         Args:
-            results: Resultados processados
             output_config: Configurações de saída
             
         Returns:
-            Caminho do arquivo de saída
+            Exportador incremental (formatos desconhecidos são exportados em JSON)
         """
         output_format = output_config.get('format', settings.DEFAULT_OUTPUT_FORMAT)
+        exporter_class = AVAILABLE_STREAM_EXPORTERS.get(output_format, JSONStreamExporter)
         
         # Gerar nome de arquivo com timestamp
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f'empresas_{timestamp}'
-        
-        if output_format == 'excel':
-            # Usar exportador Excel
-            return self.excel_exporter.export_with_formatting(results, f"{filename}.xlsx")
-        elif output_format == 'csv':
-            # Usar exportador CSV (simplificado)
-            import pandas as pd
-            output_dir = os.path.join(os.path.dirname(__file__), '..', settings.DEFAULT_OUTPUT_DIR)
-            os.makedirs(output_dir, exist_ok=True)
-            output_path = os.path.join(output_dir, f"{filename}.csv")
-            
-            df = pd.DataFrame(results)
-            df.to_csv(output_path, index=False)
-            
-            return output_path
-        else:
-            # Formato JSON
-            output_dir = os.path.join(os.path.dirname(__file__), '..', settings.DEFAULT_OUTPUT_DIR)
-            os.makedirs(output_dir, exist_ok=True)
-            output_path = os.path.join(output_dir, f"{filename}.json")
+        output_dir = os.path.join(os.path.dirname(__file__), '..', settings.DEFAULT_OUTPUT_DIR)
+        output_path = os.path.join(output_dir, f"empresas_{timestamp}.{exporter_class.extension}")
+        
+        return exporter_class(output_path)
+    
+    def _create_delta_exporter(self, output_config: Dict[str, Any],
+                               journal: Optional[RunJournal]) -> Optional[DeltaExporter]:
+        """
+        Cria o exportador de diferenças, se solicitado em output_config['delta'].
+        
+        A origem pode ser a exportação JSON, o diário (.jsonl) ou o identificador
+        de uma execução anterior, ou "last" para a última execução concluída com
+        os mesmos critérios (em uma atualização, a execução atualizada).
+        
+        Args:
+            output_config: Configurações de saída
+            journal: Diário da execução (opcional)
             
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(results, f, indent=2, ensure_ascii=False)
+        Returns:
+            Exportador de diferenças ou None se não solicitado
             
-            return output_path
+        Raises:
+            ValueError: Se a execução anterior indicada não existir ou tiver formato não suportado
+        """
+        source = output_config.get('delta')
+        if not source:
+            return None
+        
+        criteria = journal.criteria if journal else None
+        if source == 'last' and criteria and 'refresh_from' in criteria:
+            source = criteria['refresh_from']
+        elif source == 'last':
+            previous = RunJournal.find_last_finished(criteria, exclude=journal.run_id) if journal else None
+            previous_run_id = previous.run_id if previous else None
+            if previous:
+                previous.close()
+            source = previous_run_id
+        
+        if source:
+            baseline = [company['record'] for company in load_refresh_baseline(source)]
+            logger.info(f"Comparando as empresas com as {len(baseline)} da execução anterior {source}")
+        else:
+            baseline = []
+            logger.warning("Nenhuma execução anterior concluída com os mesmos critérios; todas as empresas serão registradas como novas")
+        
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        output_dir = os.path.join(os.path.dirname(__file__), '..', settings.DEFAULT_OUTPUT_DIR)
+        output_path = os.path.join(output_dir, f"empresas_{timestamp}.{DeltaExporter.extension}")
+        
+        return DeltaExporter(output_path, baseline)
+
+
+def _collect_shard_process(run_id: str, shard: int, shard_count: int, max_workers: int) -> Dict[str, Any]:
+    """
+    Executa uma partição em um processo do pool (ver CrawlerController.collect_shard).
+    
+    Args:
+        run_id: Identificador da execução
+        shard: Partição a executar
+        shard_count: Total de partições
+        max_workers: Coletas simultâneas no processo
+        
+    Returns:
+        Resultado de collect_shard
+    """
+    return CrawlerController(max_workers=max_workers).collect_shard(run_id, shard, shard_count)
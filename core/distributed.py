@@ -0,0 +1,305 @@
+"""
+Execução distribuída das coletas.
+O coordenador (CrawlerController com uma fila de coletas) publica cada
+coleta na fila por meio do RemoteCollector e recebe os resultados como
+futures; os workers (QueueWorker), em qualquer nó, reservam as coletas,
+executam o scraper e devolvem os dados brutos para a unificação no coordenador.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import nullcontext
+from typing import Dict, Any, Optional
+
+from config import settings
+from core.quality_checker import QualityChecker
+from core.source_planner import SourcePlanner
+from modules.scrapers import get_scraper
+from utils.enrichment_budget import EnrichmentBudget
+from utils.work_queue import WorkQueue, get_work_queue
+
+logger = logging.getLogger(__name__)
+
+
+class RemoteCollector:
+    """
+    Publica coletas na fila e entrega seus resultados como futures.
+
+    Os futures resolvem com a mesma tupla (dados, duração) das coletas locais;
+    as páginas e o tempo gastos pelo worker são descontados do orçamento da
+    empresa no coordenador.
+    """
+
+    def __init__(self, work_queue: WorkQueue, run_id: str, poll_interval: Optional[float] = None):
+        """
+        Inicializa o coletor remoto.
+
+        Args:
+            work_queue: Fila de coletas
+            run_id: Identificador da execução (namespace das coletas na fila)
+            poll_interval: Intervalo entre consultas aos resultados (segundos)
+        """
+        self.work_queue = work_queue
+        self.run_id = run_id
+        self.poll_interval = poll_interval or settings.WORK_QUEUE_POLL_INTERVAL
+
+        self._lock = threading.Lock()
+        self._pending = {}
+        # Resultados de coletas publicadas antes de uma retomada, ainda não pedidas nesta sessão
+        self._orphans = {}
+        self._stop = threading.Event()
+        self._poller = None
+
+    def submit(self, task: Dict[str, Any], budget: Optional[EnrichmentBudget] = None) -> Future:
+        """
+        Publica uma coleta na fila.
+
+        Args:
+            task: Coleta com 'company_id', 'scraper_name' e 'result'
+            budget: Orçamento de enriquecimento da empresa (opcional)
+
+        Returns:
+            Future que resolve com (dados coletados ou None, duração ou None)
+        """
+        task_id = f"{self.run_id}:{task['scraper_name']}:{task['company_id']}"
+        future = Future()
+        future.set_running_or_notify_cancel()
+
+        with self._lock:
+            orphan = self._orphans.pop(task_id, None)
+            if orphan is None:
+                self._pending[task_id] = (future, budget)
+
+        if orphan is not None:
+            self._resolve(future, budget, orphan)
+            return future
+
+        self.work_queue.publish(self.run_id, [{
+            'task_id': task_id,
+            'company_id': task['company_id'],
+            'scraper': task['scraper_name'],
+            'target': task['result'],
+            'budget': budget.remaining() if budget is not None else None
+        }])
+        self._start_poller()
+        return future
+
+    def shutdown(self) -> None:
+        """Encerra a consulta aos resultados e cancela as coletas ainda não concluídas."""
+        self._stop.set()
+        if self._poller is not None:
+            self._poller.join()
+
+        with self._lock:
+            pending = list(self._pending.values())
+            self._pending.clear()
+        for future, _ in pending:
+            future.cancel()
+
+        logger.info(f"Fila de coletas da execução {self.run_id}: {self.work_queue.stats()}")
+
+    def _start_poller(self) -> None:
+        """Inicia a thread que recebe os resultados, se ainda não estiver rodando."""
+        with self._lock:
+            if self._poller is None:
+                self._poller = threading.Thread(target=self._poll_results, name="work-queue-results", daemon=True)
+                self._poller.start()
+
+    def _poll_results(self) -> None:
+        """Recebe os resultados da fila e resolve os futures correspondentes."""
+        while not self._stop.is_set():
+            try:
+                results = self.work_queue.fetch_results(self.run_id)
+                for result in results:
+                    with self._lock:
+                        entry = self._pending.pop(result['task_id'], None)
+                        if entry is None:
+                            self._orphans[result['task_id']] = result
+                    if entry is not None:
+                        self._resolve(entry[0], entry[1], result)
+                self.work_queue.acknowledge(self.run_id, [result['task_id'] for result in results])
+            except Exception as e:
+                logger.error(f"Erro ao consultar resultados da fila de coletas: {e}")
+                results = None
+
+            if not results:
+                self._stop.wait(self.poll_interval)
+
+    def _resolve(self, future: Future, budget: Optional[EnrichmentBudget], result: Dict[str, Any]) -> None:
+        """Entrega o resultado de uma coleta remota."""
+        if result['status'] == 'failed':
+            logger.error(f"Coleta {result['task_id']} falhou nos workers: {result['error']}")
+        if budget is not None and result['elapsed'] is not None:
+            budget.charge(result['page_loads'], result['elapsed'])
+        future.set_result((result['data'], result['elapsed']))
+
+
+class QueueWorker:
+    """
+    Worker sem estado que executa coletas da fila.
+
+    Cada thread reserva uma coleta, executa o scraper com o orçamento restante
+    da empresa e devolve os dados. Uma thread de manutenção renova as
+    reservas das coletas em andamento; se o worker for encerrado, as reservas
+    expiram e as coletas são entregues a outros workers.
+
+    Os limites de requisições por domínio são do processo: com vários
+    workers saindo pelo mesmo IP, defina settings.RATE_LIMIT_PROCESSES com o
+    número de workers para que o total respeite os limites configurados.
+    """
+
+    def __init__(self, work_queue: Optional[WorkQueue] = None, threads: Optional[int] = None,
+                 idle_exit: Optional[float] = None, poll_interval: Optional[float] = None):
+        """
+        Inicializa o worker.
+
+        Args:
+            work_queue: Fila de coletas (padrão: settings.WORK_QUEUE_URL)
+            threads: Coletas simultâneas (padrão: settings.MAX_WORKERS)
+            idle_exit: Segundos sem coletas para encerrar (0 = nunca)
+            poll_interval: Intervalo entre consultas à fila vazia (segundos)
+        """
+        self.work_queue = work_queue or get_work_queue()
+        self.threads = max(1, threads or settings.MAX_WORKERS)
+        self.idle_exit = settings.WORK_QUEUE_WORKER_IDLE_EXIT if idle_exit is None else idle_exit
+        self.poll_interval = poll_interval or settings.WORK_QUEUE_POLL_INTERVAL
+
+        self.quality_checker = QualityChecker()
+        self.source_planner = SourcePlanner(quality_checker=self.quality_checker)
+
+        self._lock = threading.Lock()
+        self._scrapers = {}
+        self._in_flight = {}
+        self._counters = {'completed': 0, 'failed': 0, 'discarded': 0}
+        self._last_activity = time.monotonic()
+        self._stop = threading.Event()
+
+    def run(self) -> Dict[str, int]:
+        """
+        Executa coletas até ser interrompido (ou ficar ocioso por idle_exit segundos).
+
+        Returns:
+            Contadores de coletas concluídas, com falha e descartadas
+        """
+        logger.info(f"Worker da fila de coletas iniciado com {self.threads} threads")
+        workers = [
+            threading.Thread(target=self._work_loop, name=f"queue-worker-{index}", daemon=True)
+            for index in range(self.threads)
+        ]
+        for worker in workers:
+            worker.start()
+
+        renew_interval = max(1.0, self.work_queue.visibility_timeout / 3)
+        try:
+            while not self._stop.wait(renew_interval):
+                self._renew_leases()
+        except KeyboardInterrupt:
+            logger.info("Encerrando worker após as coletas em andamento")
+            self._stop.set()
+
+        for worker in workers:
+            worker.join()
+
+        logger.info(f"Worker encerrado: {self._counters}")
+        return dict(self._counters)
+
+    def stop(self) -> None:
+        """Sinaliza o encerramento do worker após as coletas em andamento."""
+        self._stop.set()
+
+    def _work_loop(self) -> None:
+        """Reserva e executa coletas até o encerramento do worker."""
+        while not self._stop.is_set():
+            try:
+                task = self.work_queue.lease()
+            except Exception as e:
+                logger.error(f"Erro ao reservar coleta: {e}")
+                task = None
+
+            if task is not None:
+                self._process(task)
+                continue
+
+            with self._lock:
+                idle = not self._in_flight and time.monotonic() - self._last_activity
+            if self.idle_exit and idle and idle >= self.idle_exit:
+                logger.info(f"Fila de coletas vazia há {idle:.0f}s; encerrando worker")
+                self._stop.set()
+                break
+            self._stop.wait(self.poll_interval)
+
+    def _process(self, task: Dict[str, Any]) -> None:
+        """Executa uma coleta reservada e devolve o resultado à fila."""
+        task_id = task['task_id']
+        lease_token = task['lease_token']
+        with self._lock:
+            self._in_flight[task_id] = lease_token
+
+        try:
+            budget = self._create_budget(task)
+            start = time.monotonic()
+            try:
+                scraper = self._get_scraper(task['scraper'])
+                with budget.activate() if budget is not None else nullcontext():
+                    data = scraper.collect(task['target'], [])
+            except Exception as e:
+                logger.error(f"Erro na coleta {task_id} (tentativa {task['attempts']}): {e}")
+                self.work_queue.release(task_id, lease_token, str(e))
+                self._increment('failed')
+                return
+
+            page_loads = budget.page_loads if budget is not None else 0
+            if self.work_queue.complete(task_id, lease_token, data, time.monotonic() - start, page_loads):
+                self._increment('completed')
+            else:
+                self._increment('discarded')
+
+        finally:
+            with self._lock:
+                self._in_flight.pop(task_id, None)
+                self._last_activity = time.monotonic()
+
+    def _create_budget(self, task: Dict[str, Any]) -> Optional[EnrichmentBudget]:
+        """Recria o orçamento restante da empresa enviado pelo coordenador."""
+        remaining = task.get('budget')
+        if not remaining:
+            return None
+
+        def scorer(data_sources):
+            return self.quality_checker.weighted_score(self.source_planner.build_record(data_sources))
+
+        budget = EnrichmentBudget(
+            task['company_id'], scorer,
+            max_page_loads=remaining['max_page_loads'],
+            max_seconds=remaining['max_seconds'],
+            target_score=remaining['target_score']
+        )
+        for data in remaining['data_sources']:
+            budget.add_source(data)
+        return budget
+
+    def _get_scraper(self, scraper_name: str):
+        """Obtém a instância do scraper, compartilhada entre as threads do worker."""
+        with self._lock:
+            if scraper_name not in self._scrapers:
+                self._scrapers[scraper_name] = get_scraper(scraper_name)
+            return self._scrapers[scraper_name]
+
+    def _renew_leases(self) -> None:
+        """Renova as reservas das coletas em andamento."""
+        with self._lock:
+            in_flight = list(self._in_flight.items())
+
+        for task_id, lease_token in in_flight:
+            try:
+                if not self.work_queue.extend(task_id, lease_token):
+                    logger.warning(f"Reserva da coleta {task_id} perdida; o resultado será descartado")
+            except Exception as e:
+                logger.error(f"Erro ao renovar reserva da coleta {task_id}: {e}")
+
+    def _increment(self, counter: str) -> None:
+        """Incrementa um contador de coletas."""
+        with self._lock:
+            self._counters[counter] += 1
@@ -0,0 +1,253 @@
+"""
+Índice de entidades para deduplicação de empresas.
+Liga CNPJ, domínio e variações do nome de uma mesma empresa (sem acentos,
+sem sufixos societários e por semelhança de trigramas) em um único
+identificador canônico, à medida que buscas e coletas trazem novos dados.
+"""
+
+import logging
+import re
+from typing import Dict, Any, List, Optional, Set
+
+from config import settings
+from utils.company_identity import identity_keys
+
+logger = logging.getLogger(__name__)
+
+# Prioridade dos tipos de chave na escolha do identificador canônico
+KEY_PRIORITY = {'cnpj': 0, 'domain': 1, 'name': 2}
+
+
+def _trigrams(name: str) -> Set[str]:
+    """Obtém os trigramas de um nome normalizado."""
+    padded = f"  {name} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class EntityIndex:
+    """
+    Índice incremental de entidades (union-find sobre chaves de identificação).
+
+    Cada registro contribui com as chaves cnpj:<dígitos>, domain:<domínio> e
+    name:<nome normalizado>; chaves do mesmo registro pertencem à mesma
+    empresa. Nomes novos também são ligados ao nome já conhecido mais
+    parecido, se a semelhança de trigramas atingir ENTITY_NAME_SIMILARITY e
+    os números do nome coincidirem ("Alfa 1" e "Alfa 2" são empresas
+    diferentes). Duas entidades com CNPJs de raízes diferentes nunca são unidas.
+
+    O identificador canônico de uma entidade é sua chave mais forte
+    (CNPJ, depois domínio, depois nome), independente da ordem de chegada.
+    """
+
+    def __init__(self, similarity: Optional[float] = None):
+        """
+        Inicializa o índice.
+
+        Args:
+            similarity: Semelhança mínima (Jaccard de trigramas) entre nomes da mesma empresa
+        """
+        self.similarity = settings.ENTITY_NAME_SIMILARITY if similarity is None else similarity
+
+        self._parent = {}
+        # Por raiz: identificador canônico e raízes de CNPJ (8 primeiros dígitos)
+        self._canonical = {}
+        self._cnpj_roots = {}
+        # Trigramas -> nomes conhecidos (para a busca aproximada)
+        self._names_by_trigram = {}
+        self._counters = {'merges': 0, 'fuzzy_merges': 0, 'conflicts': 0}
+
+    def add(self, record: Dict[str, Any]) -> Optional[str]:
+        """
+        Acrescenta um resultado de busca ao índice.
+
+        Args:
+            record: Registro com 'cnpj', 'domain' (ou 'website') e 'name'
+
+        Returns:
+            Identificador canônico da empresa ou None se o registro não tiver chaves
+        """
+        keys = self.record_keys(record)
+        if not keys:
+            return None
+
+        for key in keys:
+            self._ensure(key)
+        for key in keys[1:]:
+            self._union(keys[0], key)
+
+        name_key = next((key for key in keys if key.startswith('name:')), None)
+        if name_key:
+            self._link_similar_name(name_key)
+
+        return self.canonical(keys[0])
+
+    def link(self, company_id: str, data: Dict[str, Any]) -> bool:
+        """
+        Liga à empresa o CNPJ e o domínio encontrados em uma coleta.
+
+        Nomes de dados coletados não são usados, apenas chaves fortes.
+
+        Args:
+            company_id: Identificador da empresa coletada
+            data: Dados retornados pela coleta
+
+        Returns:
+            True se a empresa foi unida a outra entidade
+        """
+        self._ensure(company_id)
+        keys = [key for key in self.record_keys(data) if not key.startswith('name:')]
+
+        merged = False
+        for key in keys:
+            known = key in self._parent
+            self._ensure(key)
+            merged = self._union(company_id, key) and known or merged
+        return merged
+
+    def lookup(self, record: Dict[str, Any]) -> Optional[str]:
+        """
+        Obtém o identificador canônico atual de um registro já acrescentado.
+
+        Args:
+            record: Registro passado anteriormente para add
+
+        Returns:
+            Identificador canônico ou None se o registro não tiver chaves
+        """
+        keys = self.record_keys(record)
+        return self.canonical(keys[0]) if keys else None
+
+    def canonical(self, company_id: str) -> str:
+        """
+        Obtém o identificador canônico de uma empresa.
+
+        Args:
+            company_id: Qualquer chave da empresa
+
+        Returns:
+            Identificador canônico (a própria chave, se desconhecida)
+        """
+        if company_id not in self._parent:
+            return company_id
+        return self._canonical[self._find(company_id)]
+
+    def same_entity(self, first_id: str, second_id: str) -> bool:
+        """
+        Verifica se duas chaves pertencem à mesma empresa.
+
+        Args:
+            first_id: Chave da primeira empresa
+            second_id: Chave da segunda empresa
+
+        Returns:
+            True se as chaves estiverem ligadas
+        """
+        if first_id == second_id:
+            return True
+        if first_id not in self._parent or second_id not in self._parent:
+            return False
+        return self._find(first_id) == self._find(second_id)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Obtém as estatísticas do índice.
+
+        Returns:
+            Dicionário com entidades, uniões, uniões por semelhança de nome e
+            uniões evitadas por conflito de CNPJ
+        """
+        entities = sum(1 for key, parent in self._parent.items() if key == parent)
+        return dict(self._counters, entities=entities)
+
+    @staticmethod
+    def record_keys(record: Dict[str, Any]) -> List[str]:
+        """
+        Extrai as chaves de identificação de um registro.
+
+        Args:
+            record: Resultado de busca ou dados coletados
+
+        Returns:
+            Chaves na ordem CNPJ, domínio, nome (apenas as presentes)
+        """
+        keys = identity_keys(record.get('cnpj'), record.get('domain') or record.get('website'), record.get('name'))
+        return [
+            f"{prefix}:{keys[key_type]}"
+            for key_type, prefix in (('cnpj', 'cnpj'), ('domain', 'domain'), ('name_key', 'name'))
+            if keys[key_type]
+        ]
+
+    def _ensure(self, key: str) -> None:
+        """Registra uma chave como entidade própria, se ainda desconhecida."""
+        if key in self._parent:
+            return
+
+        self._parent[key] = key
+        self._canonical[key] = key
+        cnpj = key[len('cnpj:'):] if key.startswith('cnpj:') else ''
+        self._cnpj_roots[key] = {cnpj[:8]} if len(cnpj) == 14 else set()
+
+        if key.startswith('name:'):
+            for trigram in _trigrams(key[len('name:'):]):
+                self._names_by_trigram.setdefault(trigram, set()).add(key)
+
+    def _find(self, key: str) -> str:
+        """Obtém a raiz de uma chave (com compressão de caminho)."""
+        root = key
+        while self._parent[root] != root:
+            root = self._parent[root]
+        while self._parent[key] != root:
+            self._parent[key], key = root, self._parent[key]
+        return root
+
+    def _union(self, first: str, second: str) -> bool:
+        """
+        Une as entidades de duas chaves.
+
+        Returns:
+            True se as entidades eram distintas e foram unidas
+        """
+        first_root, second_root = self._find(first), self._find(second)
+        if first_root == second_root:
+            return False
+
+        first_cnpjs, second_cnpjs = self._cnpj_roots[first_root], self._cnpj_roots[second_root]
+        if first_cnpjs and second_cnpjs and not first_cnpjs & second_cnpjs:
+            self._counters['conflicts'] += 1
+            logger.debug(f"Entidades com CNPJs diferentes não unidas: {first} e {second}")
+            return False
+
+        self._parent[second_root] = first_root
+        self._cnpj_roots[first_root] = first_cnpjs | second_cnpjs
+        self._canonical[first_root] = min(
+            self._canonical[first_root], self._canonical.pop(second_root),
+            key=lambda key: (KEY_PRIORITY[key.split(':', 1)[0]], key)
+        )
+        del self._cnpj_roots[second_root]
+        self._counters['merges'] += 1
+        return True
+
+    def _link_similar_name(self, name_key: str) -> None:
+        """Liga um nome ao nome conhecido mais parecido, se a semelhança for suficiente."""
+        name = name_key[len('name:'):]
+        trigrams = _trigrams(name)
+        numbers = set(re.findall(r'\d+', name))
+
+        shared = {}
+        for trigram in trigrams:
+            for other_key in self._names_by_trigram.get(trigram, ()):
+                if other_key != name_key:
+                    shared[other_key] = shared.get(other_key, 0) + 1
+
+        best_key, best_score = None, 0.0
+        for other_key, count in shared.items():
+            other_name = other_key[len('name:'):]
+            if set(re.findall(r'\d+', other_name)) != numbers:
+                continue
+            score = count / len(trigrams | _trigrams(other_name))
+            if score > best_score:
+                best_key, best_score = other_key, score
+
+        if best_key and best_score >= self.similarity and self._union(best_key, name_key):
+            self._counters['fuzzy_merges'] += 1
+            logger.debug(f"Nomes unidos por semelhança ({best_score:.2f}): {best_key} e {name_key}")
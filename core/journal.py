@@ -0,0 +1,305 @@
+"""
+Diário de execução.
+Registra em um arquivo JSON Lines (append-only) os critérios, os resultados de
+cada busca e a saída bruta de cada coleta, permitindo retomar uma execução
+interrompida sem repetir buscas, visitas com Selenium ou consultas à ReceitaWS.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from config import settings
+from utils.data_paths import resolve_data_path
+
+logger = logging.getLogger(__name__)
+
+
+class RunJournal:
+    """
+    Diário append-only de uma execução do crawler.
+
+    Cada linha é um evento JSON:
+    - run: critérios da execução (primeira linha)
+    - search: resultados da busca de um scraper
+    - collect: saída bruta da coleta de uma empresa por um scraper
+    - company: empresa processada e exportada (com o registro unificado e a
+      data de verificação de cada campo, usados pelo modo de atualização)
+    - finish: execução concluída
+
+    Uma linha incompleta no final do arquivo (processo encerrado durante a
+    gravação) é ignorada na leitura.
+    """
+
+    def __init__(self, run_id: Optional[str] = None, directory: Optional[str] = None):
+        """
+        Inicializa o diário, carregando os eventos já registrados.
+
+        Args:
+            run_id: Identificador da execução (gerado se omitido)
+            directory: Diretório dos diários (padrão: settings.RUN_JOURNAL_DIR)
+        """
+        self.run_id = run_id or self._new_run_id()
+        self.directory = resolve_data_path(directory or settings.RUN_JOURNAL_DIR)
+        self.path = os.path.join(self.directory, f"{self.run_id}.jsonl")
+
+        self.criteria = None
+        self.finished = False
+        self._searches = {}
+        self._collects = {}
+        self._completed = set()
+        self._file = None
+        self._needs_newline = False
+        self._lock = threading.Lock()
+
+        if os.path.exists(self.path):
+            self._load()
+
+    @classmethod
+    def open_existing(cls, run_id: str, directory: Optional[str] = None) -> "RunJournal":
+        """
+        Abre o diário de uma execução anterior para retomada.
+
+        Args:
+            run_id: Identificador da execução
+            directory: Diretório dos diários (opcional)
+
+        Returns:
+            Diário carregado
+
+        Raises:
+            ValueError: Se não existir diário para a execução
+        """
+        journal = cls(run_id, directory)
+        if journal.criteria is None:
+            raise ValueError(f"Diário de execução não encontrado: {journal.path}")
+        return journal
+
+    @classmethod
+    def find_last_finished(cls, criteria: Dict[str, Any], directory: Optional[str] = None,
+                           exclude: Optional[str] = None) -> Optional["RunJournal"]:
+        """
+        Localiza a execução concluída mais recente com os mesmos critérios de busca.
+
+        As configurações de saída ('output') não são comparadas.
+
+        Args:
+            criteria: Critérios da execução atual
+            directory: Diretório dos diários (padrão: settings.RUN_JOURNAL_DIR)
+            exclude: Identificador de execução a ignorar (ex.: a atual)
+
+        Returns:
+            Diário da execução anterior ou None se não houver
+        """
+        directory = resolve_data_path(directory or settings.RUN_JOURNAL_DIR)
+        if not os.path.isdir(directory):
+            return None
+
+        wanted = {key: value for key, value in (criteria or {}).items() if key != 'output'}
+        # Os identificadores começam pela data, então a ordem alfabética é cronológica
+        for filename in sorted(os.listdir(directory), reverse=True):
+            if not filename.endswith('.jsonl') or filename[:-len('.jsonl')] == exclude:
+                continue
+            # Comparar pela primeira linha antes de carregar o diário inteiro
+            with open(os.path.join(directory, filename), 'r', encoding='utf-8') as f:
+                try:
+                    event = json.loads(f.readline())
+                except json.JSONDecodeError:
+                    continue
+            previous = event.get('criteria') if event.get('event') == 'run' else None
+            if previous is None or {key: value for key, value in previous.items() if key != 'output'} != wanted:
+                continue
+
+            journal = cls(filename[:-len('.jsonl')], directory)
+            if journal.finished:
+                return journal
+        return None
+
+    @property
+    def completed_companies(self) -> int:
+        """Número de empresas já processadas e exportadas nesta execução."""
+        return len(self._completed)
+
+    @property
+    def recorded_collects(self) -> int:
+        """Número de coletas registradas no diário."""
+        return len(self._collects)
+
+    def start(self, criteria: Dict[str, Any]) -> None:
+        """
+        Registra o início da execução (apenas se o diário ainda estiver vazio).
+
+        Args:
+            criteria: Critérios de busca originais
+        """
+        if self.criteria is not None:
+            return
+
+        self.criteria = criteria
+        self._append({'event': 'run', 'run_id': self.run_id, 'criteria': criteria,
+                      'started_at': datetime.now().isoformat()})
+
+    def get_search(self, scraper_name: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Obtém os resultados registrados da busca de um scraper.
+
+        Args:
+            scraper_name: Nome do scraper
+
+        Returns:
+            Resultados da busca ou None se a busca ainda não foi registrada
+        """
+        return self._searches.get(scraper_name)
+
+    def record_search(self, scraper_name: str, results: List[Dict[str, Any]]) -> None:
+        """
+        Registra os resultados da busca de um scraper.
+
+        Args:
+            scraper_name: Nome do scraper
+            results: Resultados da busca
+        """
+        # Passar pelo JSON garante que a execução atual e a retomada vejam os mesmos dados
+        results = json.loads(json.dumps(results, ensure_ascii=False, default=str))
+        self._searches[scraper_name] = results
+        self._append({'event': 'search', 'scraper': scraper_name, 'results': results})
+
+    def get_collect(self, scraper_name: str, company_id: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """
+        Obtém a saída registrada de uma coleta.
+
+        Args:
+            scraper_name: Nome do scraper
+            company_id: Identificador da empresa
+
+        Returns:
+            Tupla (coleta registrada, dados coletados)
+        """
+        entry = self._collects.get((scraper_name, company_id))
+        if entry is None:
+            return False, None
+        return True, entry['data']
+
+    def record_collect(self, scraper_name: str, company_id: str, data: Optional[Dict[str, Any]]) -> None:
+        """
+        Registra a saída bruta de uma coleta.
+
+        Args:
+            scraper_name: Nome do scraper
+            company_id: Identificador da empresa
+            data: Dados retornados por collect
+        """
+        entry = {'event': 'collect', 'scraper': scraper_name, 'company_id': company_id, 'data': data}
+        self._collects[(scraper_name, company_id)] = entry
+        self._append(entry)
+
+    def record_company(self, company_id: str, valid: bool, record: Optional[Dict[str, Any]] = None,
+                       field_ages: Optional[Dict[str, float]] = None) -> None:
+        """
+        Registra que uma empresa foi processada.
+
+        Args:
+            company_id: Identificador da empresa
+            valid: Se a empresa passou na verificação de qualidade
+            record: Registro unificado exportado (opcional)
+            field_ages: Timestamp da última verificação de cada campo (opcional;
+                padrão: todos os campos verificados agora)
+        """
+        if company_id in self._completed:
+            return
+        self._completed.add(company_id)
+
+        event = {'event': 'company', 'company_id': company_id, 'valid': valid, 'completed_at': time.time()}
+        if record is not None:
+            event['record'] = record
+        if field_ages is not None:
+            event['field_ages'] = field_ages
+        self._append(event)
+
+    def iter_company_records(self) -> List[Dict[str, Any]]:
+        """
+        Lê os registros das empresas válidas concluídas nesta execução.
+
+        Returns:
+            Eventos 'company' com 'record', na ordem de conclusão
+        """
+        companies = {}
+        for event in self._read_events():
+            if event.get('event') == 'company' and event.get('valid') and event.get('record'):
+                companies[event['company_id']] = event
+        return list(companies.values())
+
+    def finish(self, output_file: str, total_found: int, total_valid: int) -> None:
+        """
+        Registra a conclusão da execução.
+
+        Args:
+            output_file: Arquivo exportado
+            total_found: Total de empresas encontradas
+            total_valid: Total de empresas válidas
+        """
+        self.finished = True
+        self._append({'event': 'finish', 'output_file': output_file, 'total_found': total_found,
+                      'total_valid': total_valid, 'finished_at': datetime.now().isoformat()})
+
+    def close(self) -> None:
+        """Fecha o arquivo do diário."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _append(self, event: Dict[str, Any]) -> None:
+        """Acrescenta um evento ao arquivo e descarrega o buffer em disco."""
+        line = json.dumps(event, ensure_ascii=False, default=str)
+
+        with self._lock:
+            if self._file is None:
+                os.makedirs(self.directory, exist_ok=True)
+                self._file = open(self.path, 'a', encoding='utf-8')
+                if self._needs_newline:
+                    # Isolar a linha incompleta deixada por uma execução interrompida
+                    self._file.write('\n')
+                    self._needs_newline = False
+            self._file.write(line + '\n')
+            self._file.flush()
+
+    def _read_events(self) -> Iterator[Dict[str, Any]]:
+        """Lê os eventos do arquivo, ignorando linhas incompletas."""
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                self._needs_newline = not line.endswith('\n')
+                if not line.strip():
+                    continue
+
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Linha {line_number} do diário {self.path} incompleta; ignorando")
+
+    def _load(self) -> None:
+        """Carrega os eventos de um diário existente."""
+        for event in self._read_events():
+            kind = event.get('event')
+            if kind == 'run':
+                self.criteria = event.get('criteria')
+            elif kind == 'search':
+                self._searches[event['scraper']] = event.get('results', [])
+            elif kind == 'collect':
+                self._collects[(event['scraper'], event['company_id'])] = event
+            elif kind == 'company':
+                self._completed.add(event['company_id'])
+            elif kind == 'finish':
+                self.finished = True
+
+    def _new_run_id(self) -> str:
+        """Gera um identificador de execução ordenável pela data."""
+        return f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
@@ -55,6 +55,27 @@ class QualityChecker:
             logger.warning("Dados sem nome da empresa")
             return 0.0
         
+        normalized_score = self.weighted_score(data)
+        
+        logger.info(f"Qualidade dos dados para {data.get('Company Name (Revised)', 'Desconhecido')}: {normalized_score:.2f}")
+        
+        return normalized_score
+    
+    def weighted_score(self, data: Dict[str, Any]) -> float:
+        """
+        Calcula a pontuação ponderada pelos pesos dos campos, sem registrar no log.
+        
+        Usada durante a coleta para decidir se vale continuar buscando dados.
+        
+        Args:
+            data: Dados a serem verificados
+            
+        Returns:
+            Pontuação de qualidade (0.0 a 1.0)
+        """
+        if not data or not data.get('Company Name (Revised)'):
+            return 0.0
+        
         # Calcular pontuação
         score = 0.0
         
@@ -71,11 +92,7 @@ class QualityChecker:
                     score += 1
         
         # Normalizar pontuação (0.0 a 1.0)
-        normalized_score = score / self.max_score
-        
-        logger.info(f"Qualidade dos dados para {data.get('Company Name (Revised)', 'Desconhecido')}: {normalized_score:.2f}")
-        
-        return normalized_score
+        return score / self.max_score
     
     def get_missing_fields(self, data: Dict[str, Any]) -> Dict[str, float]:
         """
@@ -0,0 +1,204 @@
+"""
+Planejador do modo de atualização.
+Carrega uma exportação ou diário anterior e agenda, para cada empresa, apenas
+os scrapers capazes de preencher campos ausentes ou desatualizados.
+"""
+
+import json
+import logging
+import os
+import time
+from typing import Dict, Any, List, Optional
+
+from config import settings
+from core.journal import RunJournal
+from core.quality_checker import QualityChecker
+from modules.processors.data_processor import DataProcessor
+
+logger = logging.getLogger(__name__)
+
+# Fonte que representa o registro anterior na unificação (ver DataProcessor.field_mapping)
+PREVIOUS_SOURCE = 'previous'
+
+
+def load_refresh_baseline(source: str) -> List[Dict[str, Any]]:
+    """
+    Carrega as empresas de uma execução anterior.
+
+    Aceita a exportação JSON de uma execução, o arquivo de diário (.jsonl) ou
+    o identificador de uma execução com diário em settings.RUN_JOURNAL_DIR.
+    Sem datas por campo (exportação JSON ou diário de uma busca completa),
+    todos os campos são considerados verificados na data da exportação.
+
+    Args:
+        source: Caminho do arquivo ou identificador da execução
+
+    Returns:
+        Lista de empresas com 'record', 'field_ages' e 'company_id' (se conhecido)
+
+    Raises:
+        ValueError: Se a origem não existir ou não tiver formato reconhecido
+    """
+    if not os.path.exists(source):
+        journal = RunJournal(source)
+        if not os.path.exists(journal.path):
+            raise ValueError(f"Execução anterior não encontrada: {source}")
+        return _load_journal(journal)
+
+    if source.endswith('.jsonl'):
+        directory, filename = os.path.split(os.path.abspath(source))
+        return _load_journal(RunJournal(filename[:-len('.jsonl')], directory))
+
+    if source.endswith('.json'):
+        with open(source, 'r', encoding='utf-8') as f:
+            records = json.load(f)
+        exported_at = os.path.getmtime(source)
+        return [
+            {'company_id': None, 'record': record, 'field_ages': {}, 'checked_at': exported_at}
+            for record in records if record.get('Company Name (Revised)')
+        ]
+
+    raise ValueError(f"Formato não suportado para atualização: {source} (use a exportação .json ou o diário .jsonl)")
+
+
+def _load_journal(journal: RunJournal) -> List[Dict[str, Any]]:
+    """Converte os eventos de empresa de um diário em empresas da linha de base."""
+    return [
+        {
+            'company_id': event['company_id'],
+            'record': event['record'],
+            'field_ages': event.get('field_ages', {}),
+            'checked_at': event.get('completed_at', os.path.getmtime(journal.path))
+        }
+        for event in journal.iter_company_records()
+    ]
+
+
+class RefreshPlanner:
+    """
+    Agenda as coletas de uma atualização incremental.
+
+    Um campo precisa ser coletado novamente quando está ausente e a última
+    tentativa de preenchê-lo passou de REFRESH_MISSING_RETRY_AGE, ou quando
+    está preenchido e sua última verificação passou da idade máxima do campo.
+    Para cada empresa são agendados apenas os scrapers que podem preencher
+    esses campos, desde que a soma dos pesos de qualidade dos campos
+    pendentes que cada um cobre atinja REFRESH_MIN_FIELD_WEIGHT (um telefone
+    secundário ausente, sozinho, não justifica visitar o site novamente).
+    """
+
+    def __init__(self, quality_checker: Optional[QualityChecker] = None,
+                 field_mapping: Optional[Dict[str, Dict[str, str]]] = None):
+        """
+        Inicializa o planejador.
+
+        Args:
+            quality_checker: Verificador usado para identificar campos ausentes (opcional)
+            field_mapping: Mapeamento fonte -> campos, como em DataProcessor (opcional)
+        """
+        self.quality_checker = quality_checker or QualityChecker()
+        self.default_max_age = settings.REFRESH_DEFAULT_MAX_AGE
+        self.field_max_age = dict(settings.REFRESH_FIELD_MAX_AGE)
+        self.missing_retry_age = settings.REFRESH_MISSING_RETRY_AGE
+        self.min_field_weight = settings.REFRESH_MIN_FIELD_WEIGHT
+
+        # Campos que cada scraper consegue preencher, derivados do processador
+        field_mapping = field_mapping or DataProcessor().field_mapping
+        self.scraper_fields = {
+            scraper_name: set(mapping.values())
+            for scraper_name, mapping in field_mapping.items()
+            if scraper_name != PREVIOUS_SOURCE
+        }
+
+    def due_fields(self, company: Dict[str, Any], now: Optional[float] = None) -> Dict[str, float]:
+        """
+        Identifica os campos ausentes ou desatualizados de uma empresa.
+
+        Args:
+            company: Empresa da linha de base
+            now: Momento de referência (padrão: agora)
+
+        Returns:
+            Dicionário campo -> peso de qualidade
+        """
+        now = now or time.time()
+        record = company['record']
+        missing = self.quality_checker.get_missing_fields(record)
+
+        due = {}
+        for field, weight in self.quality_checker.field_weights.items():
+            age = now - company['field_ages'].get(field, company['checked_at'])
+            if field in missing:
+                max_age = self.missing_retry_age
+            else:
+                max_age = self.field_max_age.get(field, self.default_max_age)
+
+            if age >= max_age:
+                due[field] = weight
+
+        return due
+
+    def plan(self, company: Dict[str, Any], now: Optional[float] = None) -> List[str]:
+        """
+        Define os scrapers a executar para uma empresa.
+
+        Args:
+            company: Empresa da linha de base
+            now: Momento de referência (padrão: agora)
+
+        Returns:
+            Nomes dos scrapers, na ordem de prioridade das fontes
+        """
+        due = self.due_fields(company, now)
+        if not due:
+            return []
+
+        return [
+            scraper_name for scraper_name, fields in self.scraper_fields.items()
+            if fields.intersection(due)
+            and sum(due[field] for field in fields.intersection(due)) >= self.min_field_weight
+        ]
+
+    def updated_field_ages(self, company: Dict[str, Any], scraper_names: List[str],
+                           now: Optional[float] = None) -> Dict[str, float]:
+        """
+        Calcula as datas de verificação dos campos após a atualização.
+
+        Campos que os scrapers executados podem preencher passam a ter a data
+        atual (inclusive os que continuaram ausentes, registrando a tentativa);
+        os demais mantêm a data anterior.
+
+        Args:
+            company: Empresa da linha de base
+            scraper_names: Scrapers executados para a empresa
+            now: Momento da atualização (padrão: agora)
+
+        Returns:
+            Dicionário campo -> timestamp da última verificação
+        """
+        now = now or time.time()
+        refreshed = set()
+        for scraper_name in scraper_names:
+            refreshed.update(self.scraper_fields.get(scraper_name, ()))
+
+        return {
+            field: now if field in refreshed else company['field_ages'].get(field, company['checked_at'])
+            for field in self.quality_checker.field_weights
+        }
+
+    def build_target(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Monta o alvo de coleta dos scrapers a partir de um registro exportado.
+
+        Args:
+            record: Registro unificado da empresa
+
+        Returns:
+            Alvo no formato dos resultados de busca (name, cnpj, domain)
+        """
+        target = {'name': record.get('Company Name (Revised)', '')}
+        if record.get('CNPJ'):
+            target['cnpj'] = str(record['CNPJ'])
+        if record.get('Domain'):
+            target['domain'] = str(record['Domain'])
+        return target
@@ -0,0 +1,91 @@
+"""
+Particionamento de uma execução entre vários processos.
+Cada empresa pertence a uma única partição, definida por um hash estável do
+seu identificador, de modo que qualquer processo (ou máquina) com os mesmos
+resultados de busca chega à mesma divisão do trabalho.
+"""
+
+import hashlib
+from typing import Dict, Any, Tuple
+
+from config import settings
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """
+    Interpreta uma partição no formato "i/N".
+
+    Args:
+        value: Partição, numerada de 1 a N (ex.: "3/8")
+
+    Returns:
+        Tupla (partição, total de partições)
+
+    Raises:
+        ValueError: Se o formato ou a numeração forem inválidos
+    """
+    try:
+        shard, shard_count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise ValueError(f"Partição inválida: {value} (use i/N, por exemplo 1/4)")
+
+    if shard_count < 1 or not 1 <= shard <= shard_count:
+        raise ValueError(f"Partição inválida: {value} (i deve estar entre 1 e N)")
+    return shard, shard_count
+
+
+def shard_of(company_id: str, shard_count: int) -> int:
+    """
+    Obtém a partição de uma empresa.
+
+    O hash embutido do Python muda a cada processo; o MD5 do identificador
+    garante a mesma partição em todos eles.
+
+    Args:
+        company_id: Identificador da empresa
+        shard_count: Total de partições
+
+    Returns:
+        Partição da empresa (1 a shard_count)
+    """
+    digest = hashlib.md5(company_id.encode('utf-8')).hexdigest()
+    return int(digest, 16) % shard_count + 1
+
+
+def shard_run_id(run_id: str, shard: int, shard_count: int) -> str:
+    """
+    Obtém o identificador do diário de uma partição.
+
+    Args:
+        run_id: Identificador da execução
+        shard: Partição (1 a shard_count)
+        shard_count: Total de partições
+
+    Returns:
+        Identificador do diário da partição
+    """
+    return f"{run_id}.shard{shard}of{shard_count}"
+
+
+def settings_snapshot() -> Dict[str, Any]:
+    """
+    Copia as configurações atuais, inclusive as alteradas pela linha de comando.
+
+    Os processos das partições são iniciados do zero e recarregam
+    config/settings.py; a cópia é aplicada neles com apply_settings.
+
+    Returns:
+        Dicionário nome -> valor das configurações
+    """
+    return {name: getattr(settings, name) for name in dir(settings) if name.isupper()}
+
+
+def apply_settings(snapshot: Dict[str, Any]) -> None:
+    """
+    Aplica uma cópia das configurações no processo atual.
+
+    Args:
+        snapshot: Configurações obtidas com settings_snapshot
+    """
+    for name, value in snapshot.items():
+        setattr(settings, name, value)
@@ -0,0 +1,245 @@
+"""
+Planejador de fontes.
+Escolhe, para cada empresa, qual scraper consultar em seguida com base nos
+campos que cada fonte fornece, na latência e na taxa de sucesso observadas,
+e encerra a coleta quando o registro atinge o score de qualidade desejado.
+"""
+
+import json
+import logging
+import os
+import threading
+from typing import Dict, Any, List, Optional
+
+from config import settings
+from core.quality_checker import QualityChecker
+from modules.processors.data_processor import DataProcessor
+
+logger = logging.getLogger(__name__)
+
+# Campos de saída associados a cada tipo de dado declarado em config/sources.json
+DATA_TYPE_FIELDS = {
+    'company_info': ['Company Name (Revised)', 'Fantasy name', 'Domain', 'Linkedin'],
+    'cnpj': ['CNPJ', 'Company Name (Revised)', 'Fantasy name'],
+    'size': ['Size'],
+    'contacts': ['First name', 'Second Name', 'Office', 'E-mail', 'Telephone', 'Telephone 2', 'Linkedin'],
+    'location': ['Location', 'City', 'State'],
+    'general': []
+}
+
+# Estimativas iniciais, substituídas pelas médias observadas durante a execução
+DEFAULT_EXPECTED_LATENCY = 5.0
+DEFAULT_SUCCESS_RATE = 0.8
+
+# Peso das observações recentes nas médias móveis exponenciais
+EWMA_ALPHA = 0.2
+
+
+def load_source_profiles() -> List[Dict[str, Any]]:
+    """
+    Carrega as fontes de config/sources.json associadas a um scraper.
+
+    Returns:
+        Lista de fontes com a chave "scraper" (vazia se o arquivo for inválido)
+    """
+    try:
+        sources_path = os.path.join(os.path.dirname(__file__), '..', 'config', 'sources.json')
+        with open(sources_path, 'r', encoding='utf-8') as f:
+            return [source for source in json.load(f).get('sources', []) if source.get('scraper')]
+    except Exception as e:
+        logger.error(f"Erro ao carregar fontes do planejador: {e}")
+        return []
+
+
+class SourcePlanner:
+    """
+    Planejador de fontes orientado a campos e custo.
+
+    A próxima fonte de uma empresa é a de maior valor esperado por segundo:
+    peso de qualidade dos campos ausentes que ela fornece, multiplicado pela
+    taxa de sucesso e dividido pela latência média. Fontes que exigem
+    navegador só são consultadas se puderem preencher campos relevantes,
+    e nenhuma fonte é consultada depois que o registro atinge o score alvo.
+    """
+
+    def __init__(self, sources: Optional[List[Dict[str, Any]]] = None,
+                 quality_checker: Optional[QualityChecker] = None,
+                 field_mapping: Optional[Dict[str, Dict[str, str]]] = None,
+                 target_score: Optional[float] = None):
+        """
+        Inicializa o planejador.
+
+        Args:
+            sources: Fontes de config/sources.json com a chave "scraper" (opcional)
+            quality_checker: Verificador de qualidade (opcional)
+            field_mapping: Mapeamento fonte -> campos, como em DataProcessor (opcional)
+            target_score: Score a partir do qual a coleta é encerrada (opcional)
+        """
+        self.quality_checker = quality_checker or QualityChecker()
+        self.field_mapping = field_mapping or DataProcessor().field_mapping
+        self.target_score = settings.ENRICHMENT_TARGET_SCORE if target_score is None else target_score
+        self.min_gain = settings.SOURCE_PLANNER_MIN_GAIN
+        self.min_browser_gain = settings.SOURCE_PLANNER_MIN_BROWSER_GAIN
+
+        self.profiles = {}
+        for source in (load_source_profiles() if sources is None else sources):
+            self.profiles[source['scraper']] = self._build_profile(source)
+
+        self._lock = threading.Lock()
+
+    def _build_profile(self, source: Dict[str, Any]) -> Dict[str, Any]:
+        """Monta o perfil de uma fonte a partir de sua entrada em sources.json."""
+        scraper_name = source['scraper']
+
+        declared = set()
+        for data_type in source.get('data_types', []):
+            declared.update(DATA_TYPE_FIELDS.get(data_type, []))
+
+        # Apenas campos que o processador aproveita desta fonte
+        mapped = set(self.field_mapping.get(scraper_name, {}).values())
+        fields = declared & mapped if mapped else declared
+
+        return {
+            'fields': fields or mapped,
+            'priority': source.get('priority', 99),
+            'requires_selenium': source.get('requires_selenium', False),
+            'latency': float(source.get('expected_latency', DEFAULT_EXPECTED_LATENCY)),
+            'success_rate': DEFAULT_SUCCESS_RATE,
+            'calls': 0,
+            'successes': 0,
+            'skipped': 0
+        }
+
+    def search_order(self, scraper_names: List[str]) -> List[str]:
+        """
+        Ordena os scrapers para as etapas de busca (prioridade e, em seguida, latência).
+
+        Args:
+            scraper_names: Scrapers disponíveis
+
+        Returns:
+            Scrapers ordenados; os que não constam em sources.json vão para o final
+        """
+        def sort_key(scraper_name):
+            profile = self.profiles.get(scraper_name)
+            if profile is None:
+                return (1, 99, 0.0)
+            return (0, profile['priority'], profile['latency'])
+
+        return sorted(scraper_names, key=sort_key)
+
+    def next_source(self, data_sources: List[Dict[str, Any]], candidates: List[str]) -> Optional[str]:
+        """
+        Escolhe a próxima fonte a consultar para uma empresa.
+
+        Args:
+            data_sources: Dados já coletados da empresa
+            candidates: Scrapers ainda não consultados
+
+        Returns:
+            Nome do scraper ou None se a coleta da empresa deve ser encerrada
+        """
+        record = self.build_record(data_sources)
+        if self.quality_checker.weighted_score(record) >= self.target_score:
+            self._count_skipped(candidates)
+            return None
+
+        missing = self.quality_checker.get_missing_fields(record)
+        best_name = None
+        best_key = None
+
+        with self._lock:
+            for scraper_name in candidates:
+                profile = self.profiles.get(scraper_name)
+                if profile is None:
+                    # Fonte sem perfil: consultada apenas depois das conhecidas
+                    if best_name is None:
+                        best_name, best_key = scraper_name, (0.0, 99)
+                    continue
+
+                gain = sum(weight for field, weight in missing.items() if field in profile['fields'])
+                min_gain = self.min_browser_gain if profile['requires_selenium'] else self.min_gain
+                if gain < min_gain:
+                    continue
+
+                value = gain * profile['success_rate'] / max(profile['latency'], 0.1)
+                key = (value, -profile['priority'])
+                if best_key is None or key > best_key:
+                    best_name, best_key = scraper_name, key
+
+        if best_name is None:
+            self._count_skipped(candidates)
+        return best_name
+
+    def record(self, scraper_name: str, latency: float, data: Optional[Dict[str, Any]]) -> None:
+        """
+        Atualiza a latência e a taxa de sucesso observadas de uma fonte.
+
+        Args:
+            scraper_name: Nome do scraper
+            latency: Duração da coleta (segundos)
+            data: Dados retornados (None em caso de erro)
+        """
+        success = self._is_success(scraper_name, data)
+
+        with self._lock:
+            profile = self.profiles.get(scraper_name)
+            if profile is None:
+                return
+
+            profile['latency'] += EWMA_ALPHA * (latency - profile['latency'])
+            profile['success_rate'] += EWMA_ALPHA * ((1.0 if success else 0.0) - profile['success_rate'])
+            profile['calls'] += 1
+            profile['successes'] += int(success)
+
+    def build_record(self, data_sources: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Monta um registro aproximado com os campos já preenchidos pelas fontes.
+
+        Args:
+            data_sources: Dados coletados da empresa
+
+        Returns:
+            Registro com os campos de saída preenchidos
+        """
+        record = {}
+        for source_data in data_sources:
+            mapping = self.field_mapping.get(source_data.get('source', ''), {})
+            for source_field, target_field in mapping.items():
+                if source_data.get(source_field) and not record.get(target_field):
+                    record[target_field] = source_data[source_field]
+        return record
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Obtém as estatísticas de cada fonte.
+
+        Returns:
+            Dicionário scraper -> consultas, sucessos, consultas evitadas, latência e taxa de sucesso médias
+        """
+        with self._lock:
+            return {
+                scraper_name: {
+                    'calls': profile['calls'],
+                    'successes': profile['successes'],
+                    'skipped': profile['skipped'],
+                    'latency': profile['latency'],
+                    'success_rate': profile['success_rate']
+                }
+                for scraper_name, profile in self.profiles.items()
+            }
+
+    def _is_success(self, scraper_name: str, data: Optional[Dict[str, Any]]) -> bool:
+        """Verifica se a coleta trouxe algum campo além do nome da empresa."""
+        if not data:
+            return False
+
+        mapping = self.field_mapping.get(scraper_name, {})
+        return any(data.get(field) for field, target in mapping.items() if target != 'Company Name (Revised)')
+
+    def _count_skipped(self, scraper_names: List[str]) -> None:
+        """Contabiliza as fontes que deixaram de ser consultadas."""
+        with self._lock:
+            for scraper_name in scraper_names:
+                if scraper_name in self.profiles:
+                    self.profiles[scraper_name]['skipped'] += 1
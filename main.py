@@ -11,7 +11,11 @@ import sys
 from datetime import datetime
 
 from core.controller import CrawlerController
+from core.distributed import QueueWorker
+from core.sharding import parse_shard
 from config import settings
+from modules.exporters import AVAILABLE_STREAM_EXPORTERS
+from utils.work_queue import create_work_queue
 
 def setup_logging():
     """Configura o sistema de logging."""
@@ -41,8 +45,21 @@ def parse_arguments():
     parser.add_argument('--max-employees', type=int, help='Número máximo de funcionários')
     parser.add_argument('--min-revenue', type=float, help='Faturamento mínimo')
     parser.add_argument('--output', type=str, help='Caminho para arquivo de saída')
-    parser.add_argument('--format', type=str, choices=['excel', 'csv', 'json'], default='excel', help='Formato de saída')
+    parser.add_argument('--format', type=str, choices=list(AVAILABLE_STREAM_EXPORTERS), default='excel', help='Formato de saída')
     parser.add_argument('--max-results', type=int, default=5, help='Número máximo de resultados')
+    parser.add_argument('--threads', type=int, help='Número máximo de coletas simultâneas (1 = sequencial)')
+    parser.add_argument('--no-search-cache', action='store_true', help='Ignorar o cache de buscas SearXNG')
+    parser.add_argument('--workers', type=int, default=1, help='Número de processos entre os quais as coletas são particionadas')
+    parser.add_argument('--shard', type=str, metavar='i/N', help='Executar apenas as coletas da partição i de N da execução indicada em --resume')
+    parser.add_argument('--distributed', action='store_true', help='Coordenar a execução publicando as coletas na fila para workers distribuídos')
+    parser.add_argument('--worker', action='store_true', help='Executar como worker da fila de coletas distribuída')
+    parser.add_argument('--queue', type=str, metavar='URL', help='Fila de coletas (sqlite:///caminho ou redis://host:porta/db; padrão: WORK_QUEUE_URL)')
+    parser.add_argument('--max-pages', type=int, help='Máximo de páginas carregadas por empresa, somando todos os scrapers')
+    parser.add_argument('--max-seconds', type=float, help='Máximo de segundos de coleta por empresa')
+    parser.add_argument('--target-score', type=float, help='Score de qualidade (0.0 a 1.0) que encerra a coleta de uma empresa')
+    parser.add_argument('--resume', type=str, metavar='RUN_ID', help='Retomar uma execução interrompida a partir do seu diário')
+    parser.add_argument('--refresh', type=str, metavar='ORIGEM', help='Atualizar apenas campos ausentes ou desatualizados de uma execução anterior (exportação .json, diário .jsonl ou identificador)')
+    parser.add_argument('--delta', type=str, nargs='?', const='last', metavar='ORIGEM', help='Exportar também as empresas novas, alteradas e removidas em relação a uma execução anterior (padrão: a última com os mesmos critérios)')
     
     return parser.parse_args()
 
@@ -104,6 +121,8 @@ def build_criteria_from_args(args):
         'format': args.format,
         'max_results': args.max_results
     }
+    if args.delta:
+        criteria['output']['delta'] = args.delta
     
     return criteria
 
@@ -123,31 +142,109 @@ def main():
         if not criteria:
             logging.error("Falha ao carregar critérios. Encerrando.")
             return 1
-    else:
+        if args.delta:
+            criteria.setdefault('output', {})['delta'] = args.delta
+    elif not args.resume and not args.refresh and not args.worker:
         criteria = build_criteria_from_args(args)
     
-    # Verificar se há critérios
-    if not criteria:
+    # Verificar se há critérios (na retomada, os critérios vêm do diário da execução)
+    if not criteria and not args.resume and not args.refresh and not args.worker:
         logging.error("Nenhum critério fornecido. Use --criteria ou argumentos diretos.")
         return 1
     
+    # Validar o orçamento de enriquecimento por empresa
+    if (args.max_pages is not None and args.max_pages < 1) or (args.max_seconds is not None and args.max_seconds <= 0):
+        logging.error("--max-pages deve ser no mínimo 1 e --max-seconds deve ser positivo.")
+        return 1
+    
+    # Validar o particionamento entre processos
+    shard = None
+    if args.shard:
+        if not args.resume:
+            logging.error("--shard exige --resume com o identificador da execução a particionar.")
+            return 1
+        try:
+            shard = parse_shard(args.shard)
+        except ValueError as e:
+            logging.error(str(e))
+            return 1
+    if args.workers < 1 or (args.workers > 1 and args.refresh):
+        logging.error("--workers deve ser positivo e não se aplica a --refresh.")
+        return 1
+    if args.distributed and (args.workers > 1 or args.refresh or shard):
+        logging.error("--distributed não pode ser combinado com --workers, --shard ou --refresh.")
+        return 1
+    
+    # Fila de coletas distribuída
+    if args.queue:
+        settings.WORK_QUEUE_URL = args.queue
+    
+    # Partições executadas isoladamente rodam ao mesmo tempo que as demais e dividem os limites por domínio
+    if shard:
+        settings.RATE_LIMIT_PROCESSES *= shard[1]
+    
+    # Desativar o cache de buscas, se solicitado
+    if args.no_search_cache:
+        settings.SEARCH_CACHE_ENABLED = False
+    
+    # Orçamento de enriquecimento por empresa
+    if args.max_pages is not None:
+        settings.ENRICHMENT_MAX_PAGE_LOADS = args.max_pages
+    if args.max_seconds is not None:
+        settings.ENRICHMENT_MAX_SECONDS = args.max_seconds
+    if args.target_score is not None:
+        settings.ENRICHMENT_TARGET_SCORE = args.target_score
+    
+    # Executar como worker da fila de coletas
+    if args.worker:
+        try:
+            QueueWorker(threads=args.threads).run()
+            return 0
+        except Exception as e:
+            logging.error(f"Erro no worker da fila de coletas: {e}")
+            return 1
+    
     # Inicializar controlador
-    controller = CrawlerController()
+    controller = CrawlerController(max_workers=args.threads)
     
     # Executar crawler
     try:
         logging.info("Iniciando execução do crawler...")
-        results = controller.execute(criteria)
+        if shard:
+            result = controller.collect_shard(args.resume, *shard)
+            logging.info(
+                f"Partição {args.shard} concluída: {result['companies']} empresas, "
+                f"{result['collects']} coletas registradas em {result['run_id']}"
+            )
+            logging.info(f"Para unificar e exportar todas as partições use --resume {args.resume} --workers {shard[1]}")
+            return 0
+        
+        if args.refresh:
+            output_config = (criteria or {}).get('output') or {'format': args.format}
+            if args.delta:
+                output_config = dict(output_config, delta=args.delta)
+            results = controller.refresh(args.refresh, output_config)
+        else:
+            work_queue = create_work_queue() if args.distributed else None
+            results = controller.execute(criteria, resume_run_id=args.resume, workers=args.workers,
+                                         work_queue=work_queue)
         
         # Exibir resultados
         logging.info(f"Execução concluída em {results['execution_time']:.2f} segundos")
+        logging.info(f"Vazão: {results['throughput']:.2f} empresas/minuto")
         logging.info(f"Total de empresas encontradas: {results['total_found']}")
         logging.info(f"Total de empresas válidas: {results['total_valid']}")
         logging.info(f"Resultados exportados para: {results['output_file']}")
+        if results['delta_file']:
+            logging.info(f"Diferenças exportadas para: {results['delta_file']}")
+        if results['run_id']:
+            logging.info(f"Identificador da execução: {results['run_id']}")
         
         # Exibir dados no console
         if results['companies']:
             print("\nEmpresas encontradas:")
+            if results['total_valid'] > len(results['companies']):
+                print(f"(exibindo as primeiras {len(results['companies'])} de {results['total_valid']}; lista completa no arquivo exportado)")
             for i, company in enumerate(results['companies'], 1):
                 print(f"\n{i}. {company.get('Company Name (Revised)', 'Desconhecido')}")
                 print(f"   CNPJ: {company.get('CNPJ', 'N/A')}")
@@ -1,3 +1,40 @@
 """
 Módulo de inicialização do pacote exporters.
+Importa e registra os exportadores incrementais disponíveis.
 """
+
+from .excel_exporter import ExcelExporter
+from .stream_exporter import (
+    StreamExporter, QueuedStreamExporter, JSONStreamExporter, NDJSONStreamExporter, CSVStreamExporter,
+    ExcelStreamExporter, ParquetStreamExporter, SQLiteStreamExporter
+)
+from .delta_exporter import DeltaExporter
+
+# Registrar exportadores incrementais por formato de saída
+AVAILABLE_STREAM_EXPORTERS = {
+    'excel': ExcelStreamExporter,
+    'csv': CSVStreamExporter,
+    'json': JSONStreamExporter,
+    'ndjson': NDJSONStreamExporter,
+    'parquet': ParquetStreamExporter,
+    'sqlite': SQLiteStreamExporter
+}
+
+def get_stream_exporter(output_format: str, output_path: str) -> StreamExporter:
+    """
+    Obtém uma instância de exportador incremental pelo formato.
+
+    Args:
+        output_format: Formato de saída (excel, csv, json, ndjson, parquet, sqlite)
+        output_path: Caminho do arquivo de saída
+
+    Returns:
+        Instância do exportador
+
+    Raises:
+        ValueError: Se o formato não existir
+    """
+    if output_format not in AVAILABLE_STREAM_EXPORTERS:
+        raise ValueError(f"Formato de exportação não encontrado: {output_format}")
+
+    return AVAILABLE_STREAM_EXPORTERS[output_format](output_path)
@@ -0,0 +1,178 @@
+"""
+Exportador de diferenças entre execuções.
+Compara cada empresa com a saída de uma execução anterior pelo hash do seu
+conteúdo e grava apenas as empresas novas, alteradas (com os campos
+alterados) e removidas.
+"""
+
+import hashlib
+import json
+import logging
+from typing import Dict, Any, List, Optional
+
+from config import settings
+from utils.company_identity import normalize_cnpj, normalize_domain
+from utils.company_store import company_keys
+from .stream_exporter import StreamExporter
+
+logger = logging.getLogger(__name__)
+
+# Campos comparados pela forma normalizada (como nas chaves de associação)
+NORMALIZED_FIELDS = {'CNPJ': normalize_cnpj, 'Domain': normalize_domain}
+
+
+class DeltaExporter(StreamExporter):
+    """
+    Exportador incremental das diferenças em relação a uma execução anterior.
+
+    Cada linha do arquivo (JSON Lines) é uma alteração:
+    - {"change": "added", "key": ..., "record": {campos preenchidos}}
+    - {"change": "changed", "key": ..., "fields": {...}, "previous": {...}}
+    - {"change": "removed", "key": ..., "record": {nome, CNPJ e domínio}}
+
+    As empresas são associadas às da execução anterior pelo CNPJ, depois
+    pelo domínio e por último pelo nome normalizado (como em
+    utils.company_store); a chave ("cnpj:...", "domain:..." ou "name:...")
+    é a mais forte disponível. Empresas com o mesmo hash de conteúdo não
+    geram linha; CNPJ e domínio são comparados normalizados, então mudanças
+    apenas de formatação não são alterações. As removidas só são gravadas
+    por finish, ao final de uma execução completa.
+    """
+
+    extension = "delta.ndjson"
+
+    def __init__(self, output_path: str, baseline: List[Dict[str, Any]],
+                 ignored_fields: Optional[List[str]] = None):
+        """
+        Inicializa o exportador.
+
+        Args:
+            output_path: Caminho do arquivo de diferenças
+            baseline: Registros exportados pela execução anterior
+            ignored_fields: Campos desconsiderados na comparação (padrão: settings.DELTA_IGNORED_FIELDS)
+        """
+        super().__init__(output_path)
+        self.ignored_fields = set(settings.DELTA_IGNORED_FIELDS if ignored_fields is None else ignored_fields)
+        self.counts = {'added': 0, 'changed': 0, 'removed': 0, 'unchanged': 0}
+
+        # Registros anteriores, seus hashes e índices por chave
+        self._baseline = list(baseline)
+        self._hashes = [self._content_hash(record) for record in self._baseline]
+        self._keys = [company_keys(record) for record in self._baseline]
+        self._matched = [False] * len(self._baseline)
+        self._index = {'cnpj': {}, 'domain': {}, 'name_key': {}}
+        for position, keys in enumerate(self._keys):
+            for key_type, value in keys.items():
+                if value:
+                    self._index[key_type].setdefault(value, []).append(position)
+
+    def _open(self) -> None:
+        self._file = open(self.output_path, 'w', encoding='utf-8')
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        keys = company_keys(record)
+        position = self._match(keys)
+
+        if position is None:
+            self._emit({
+                'change': 'added',
+                'key': self._key(keys),
+                'record': {field: value for field, value in record.items() if value not in (None, '')}
+            })
+            self.counts['added'] += 1
+            return
+
+        self._matched[position] = True
+        if self._content_hash(record) == self._hashes[position]:
+            self.counts['unchanged'] += 1
+            return
+
+        previous = self._baseline[position]
+        fields = {
+            field: record.get(field, '') for field in list(record) + [f for f in previous if f not in record]
+            if field not in self.ignored_fields
+            and self._value(field, record.get(field)) != self._value(field, previous.get(field))
+        }
+        self._emit({
+            'change': 'changed',
+            'key': self._key(keys),
+            'fields': fields,
+            'previous': {field: previous.get(field) for field in fields}
+        })
+        self.counts['changed'] += 1
+
+    def _close(self) -> None:
+        self._file.close()
+        logger.info(
+            f"Diferenças em relação à execução anterior: {self.counts['added']} novas, "
+            f"{self.counts['changed']} alteradas, {self.counts['removed']} removidas, "
+            f"{self.counts['unchanged']} sem alteração"
+        )
+
+    def finish(self) -> None:
+        """Grava as empresas da execução anterior que não foram exportadas nesta."""
+        if not self._is_open:
+            self.open()
+
+        for position, matched in enumerate(self._matched):
+            if matched:
+                continue
+            previous = self._baseline[position]
+            self._emit({
+                'change': 'removed',
+                'key': self._key(self._keys[position]),
+                'record': {field: previous.get(field, '') for field in ('Company Name (Revised)', 'CNPJ', 'Domain')}
+            })
+            self.counts['removed'] += 1
+
+    def _match(self, keys: Dict[str, Optional[str]]) -> Optional[int]:
+        """Localiza a empresa correspondente ainda não associada na execução anterior."""
+        for key_type in ('cnpj', 'domain', 'name_key'):
+            if not keys[key_type]:
+                continue
+            for position in self._index[key_type].get(keys[key_type], ()):
+                if self._matched[position]:
+                    continue
+                # Não associar empresas cujas chaves fortes divergem
+                other = self._keys[position]
+                if key_type != 'cnpj' and keys['cnpj'] and other['cnpj']:
+                    continue
+                if key_type == 'name_key' and keys['domain'] and other['domain'] and keys['domain'] != other['domain']:
+                    continue
+                return position
+        return None
+
+    def _emit(self, change: Dict[str, Any]) -> None:
+        """Grava uma alteração e descarrega o buffer em disco."""
+        self._file.write(json.dumps(change, ensure_ascii=False, default=str) + '\n')
+        self._file.flush()
+
+    def _content_hash(self, record: Dict[str, Any]) -> str:
+        """Calcula o hash do conteúdo de uma empresa (sem os campos ignorados)."""
+        content = {
+            field: self._value(field, value) for field, value in record.items()
+            if field not in self.ignored_fields
+        }
+        # Campos vazios não alteram o hash (registros antigos podem não tê-los)
+        content = {field: value for field, value in content.items() if value != ''}
+        return hashlib.sha1(
+            json.dumps(content, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')
+        ).hexdigest()
+
+    @staticmethod
+    def _value(field: str, value: Any) -> Any:
+        """Normaliza um valor para comparação (None equivale a vazio; CNPJ e domínio normalizados)."""
+        if value is None:
+            return ''
+        normalize = NORMALIZED_FIELDS.get(field)
+        if normalize and value != '':
+            return normalize(value) or value
+        return value
+
+    @staticmethod
+    def _key(keys: Dict[str, Optional[str]]) -> Optional[str]:
+        """Obtém a chave mais forte de uma empresa."""
+        for key_type, prefix in (('cnpj', 'cnpj'), ('domain', 'domain'), ('name_key', 'name')):
+            if keys[key_type]:
+                return f"{prefix}:{keys[key_type]}"
+        return None
@@ -5,24 +5,45 @@ Responsável por exportar os dados coletados para arquivos Excel.
 
 import logging
 import os
-from datetime import datetime
-from typing import Dict, Any, List
+from datetime import date, datetime, time
+from itertools import chain, islice
+from typing import Dict, Any, Iterable, Iterator, List, Optional
 
 import pandas as pd
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
+from openpyxl.utils import get_column_letter
 from openpyxl.utils.dataframe import dataframe_to_rows
 
+from config import settings
+
 logger = logging.getLogger(__name__)
 
+# Limite de linhas de uma planilha do Excel (incluindo o cabeçalho)
+EXCEL_MAX_ROWS = 1048576
+
+# Tipos gravados diretamente nas células; os demais são convertidos para texto
+CELL_TYPES = (str, int, float, bool, date, datetime, time)
+
 class ExcelExporter:
     """
     Exportador de dados para formato Excel.
     """
     
-    def __init__(self):
-        """Inicializa o exportador Excel."""
+    def __init__(self, streaming: Optional[bool] = None, max_rows: Optional[int] = None):
+        """
+        Inicializa o exportador Excel.
+        
+        Args:
+            streaming: Gravar a planilha em modo somente escrita, linha a linha
+                (padrão: settings.EXCEL_STREAMING_ENABLED)
+            max_rows: Linhas por aba, incluindo o cabeçalho, antes de continuar
+                em uma nova aba no modo somente escrita (padrão: limite do Excel)
+        """
         self.output_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'data', 'output')
+        self.streaming = settings.EXCEL_STREAMING_ENABLED if streaming is None else streaming
+        self.max_rows = max_rows or EXCEL_MAX_ROWS
         
         # Garantir que o diretório de saída existe
         os.makedirs(self.output_dir, exist_ok=True)
@@ -51,6 +72,10 @@ class ExcelExporter:
         filepath = os.path.join(self.output_dir, filename)
         
         try:
+            if self.streaming:
+                self._export_streaming(iter(data), filepath)
+                return filepath
+            
             # Converter dados para DataFrame
             df = pd.DataFrame(data)
             
@@ -62,6 +87,140 @@ class ExcelExporter:
             logger.error(f"Erro ao exportar dados para Excel: {e}")
             return ""
     
+    def export_rows(self, rows: Iterable[Dict[str, Any]], filename: str) -> str:
+        """
+        Exporta registros lidos sob demanda (por exemplo, de um arquivo parcial).
+        
+        No modo somente escrita os registros nunca ficam todos em memória;
+        caso contrário, são reunidos e exportados com export.
+        
+        Args:
+            rows: Registros a exportar (as colunas são as chaves do primeiro)
+            filename: Nome do arquivo
+            
+        Returns:
+            Caminho do arquivo exportado ou string vazia em caso de erro
+        """
+        if not self.streaming:
+            return self.export(list(rows), filename)
+        
+        filepath = os.path.join(self.output_dir, filename)
+        try:
+            if not self._export_streaming(iter(rows), filepath):
+                logger.warning("Nenhum dado para exportar")
+                return ""
+            return filepath
+        
+        except Exception as e:
+            logger.error(f"Erro ao exportar dados para Excel: {e}")
+            return ""
+    
+    def _export_streaming(self, rows: Iterator[Dict[str, Any]], filepath: str) -> int:
+        """
+        Exporta os dados em uma planilha somente escrita, linha a linha.
+        
+        Cada célula usa um dos dois estilos nomeados do arquivo (cabeçalho e
+        dados), em vez de objetos de estilo próprios. As larguras das colunas
+        precisam ser definidas antes da primeira linha de cada aba: são
+        calculadas sobre as primeiras EXCEL_WIDTH_SAMPLE_ROWS linhas e
+        atualizadas durante a gravação, valendo para as abas seguintes. Ao
+        atingir max_rows, a gravação continua em uma nova aba com o mesmo cabeçalho.
+        
+        Args:
+            rows: Registros a exportar
+            filepath: Caminho do arquivo de saída
+            
+        Returns:
+            Número de registros exportados
+        """
+        sample = list(islice(rows, settings.EXCEL_WIDTH_SAMPLE_ROWS))
+        if not sample:
+            return 0
+        
+        columns = list(sample[0].keys())
+        widths = [len(str(column)) for column in columns]
+        for record in sample:
+            self._update_widths(widths, record, columns)
+        
+        wb = Workbook(write_only=True)
+        header_style, data_style = self._named_styles()
+        wb.add_named_style(header_style)
+        wb.add_named_style(data_style)
+        
+        ws = None
+        sheet_rows = self.max_rows
+        written = 0
+        
+        # Uma célula por coluna, reaproveitada em todas as linhas (a linha é gravada em append)
+        cells = None
+        for record in chain(sample, rows):
+            if sheet_rows >= self.max_rows:
+                ws = self._add_streaming_sheet(wb, columns, widths, header_style.name)
+                cells = [WriteOnlyCell(ws) for _ in columns]
+                for cell in cells:
+                    cell.style = data_style.name
+                sheet_rows = 1
+            
+            for cell, column in zip(cells, columns):
+                value = record.get(column)
+                cell.value = '' if value is None else value if isinstance(value, CELL_TYPES) else str(value)
+            ws.append(cells)
+            
+            if written >= len(sample):
+                self._update_widths(widths, record, columns)
+            sheet_rows += 1
+            written += 1
+        
+        wb.save(filepath)
+        logger.info(f"Dados exportados com formatação para {filepath} ({len(wb.worksheets)} abas, modo somente escrita)")
+        return written
+    
+    def _add_streaming_sheet(self, wb: Workbook, columns: List[str], widths: List[int], header_style: str):
+        """Cria uma aba somente escrita com as larguras atuais e o cabeçalho."""
+        index = len(wb.worksheets) + 1
+        ws = wb.create_sheet("Empresas" if index == 1 else f"Empresas {index}")
+        
+        for column_index, max_length in enumerate(widths, 1):
+            ws.column_dimensions[get_column_letter(column_index)].width = (max_length + 2) if max_length < 50 else 50
+        
+        header = []
+        for column in columns:
+            cell = WriteOnlyCell(ws, value=column)
+            cell.style = header_style
+            header.append(cell)
+        ws.append(header)
+        return ws
+    
+    def _update_widths(self, widths: List[int], record: Dict[str, Any], columns: List[str]) -> None:
+        """Atualiza a largura máxima de cada coluna com os valores de um registro."""
+        for index, column in enumerate(columns):
+            length = len(str(record.get(column)))
+            if length > widths[index]:
+                widths[index] = length
+    
+    def _named_styles(self):
+        """Cria os estilos nomeados de cabeçalho e de dados, iguais aos da exportação formatada."""
+        thin_border = Border(
+            left=Side(style="thin"),
+            right=Side(style="thin"),
+            top=Side(style="thin"),
+            bottom=Side(style="thin")
+        )
+        
+        header_style = NamedStyle(
+            name="empresas_cabecalho",
+            font=Font(bold=True, color="FFFFFF"),
+            fill=PatternFill(start_color="4F81BD", end_color="4F81BD", fill_type="solid"),
+            alignment=Alignment(horizontal="center", vertical="center", wrap_text=True),
+            border=thin_border
+        )
+        data_style = NamedStyle(
+            name="empresas_dados",
+            alignment=Alignment(vertical="center", wrap_text=True),
+            border=thin_border
+        )
+        return header_style, data_style
+    
     def _export_with_formatting(self, df: pd.DataFrame, filepath: str) -> None:
         """
         Exporta os dados para Excel com formatação avançada.
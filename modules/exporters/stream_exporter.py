@@ -0,0 +1,556 @@
+"""
+Exportadores incrementais.
+Gravam cada empresa assim que ela é processada, mantendo a saída parcial
+em disco durante a execução e o uso de memória constante.
+"""
+
+import csv
+import gzip
+import io
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Any, List, Optional
+from urllib.parse import quote
+
+from config import settings
+from utils.company_store import CompanyStore
+from utils.data_paths import resolve_data_path
+from .excel_exporter import ExcelExporter
+
+logger = logging.getLogger(__name__)
+
+# Marca de encerramento na fila da thread de gravação
+_CLOSE = object()
+
+# Colunas gravadas como inteiros no Parquet; as demais são texto, pois os
+# valores coletados não têm tipo fixo (ex.: porte 50 ou "51-200")
+PARQUET_INTEGER_COLUMNS = {'LOTE'}
+
+
+class StreamExporter(ABC):
+    """
+    Classe base para exportadores incrementais.
+    """
+
+    # Extensão dos arquivos gerados
+    extension = ""
+
+    def __init__(self, output_path: str):
+        """
+        Inicializa o exportador.
+
+        Args:
+            output_path: Caminho do arquivo de saída
+        """
+        self.output_path = output_path
+        self.rows_written = 0
+        self._is_open = False
+
+    def open(self) -> "StreamExporter":
+        """
+        Abre o arquivo de saída.
+
+        Returns:
+            O próprio exportador
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(self.output_path)), exist_ok=True)
+        self._open()
+        self._is_open = True
+        logger.info(f"Exportação incremental iniciada em {self.output_path}")
+        return self
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """
+        Grava uma empresa no arquivo de saída.
+
+        Args:
+            record: Dados processados da empresa
+        """
+        if not self._is_open:
+            self.open()
+        self._write(record)
+        self.rows_written += 1
+
+    def close(self) -> str:
+        """
+        Finaliza o arquivo de saída.
+
+        Returns:
+            Caminho do arquivo exportado
+        """
+        if self._is_open:
+            self._close()
+            self._is_open = False
+            logger.info(f"{self.rows_written} empresas exportadas para {self.output_path}")
+        return self.output_path
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @abstractmethod
+    def _open(self) -> None:
+        """Abre o arquivo de saída."""
+        pass
+
+    @abstractmethod
+    def _write(self, record: Dict[str, Any]) -> None:
+        """Grava uma empresa e descarrega o buffer em disco."""
+        pass
+
+    @abstractmethod
+    def _close(self) -> None:
+        """Finaliza e fecha o arquivo de saída."""
+        pass
+
+
+class JSONStreamExporter(StreamExporter):
+    """
+    Exportador incremental para um array JSON.
+    """
+
+    extension = "json"
+
+    def _open(self) -> None:
+        self._file = open(self.output_path, 'w', encoding='utf-8')
+        self._file.write('[')
+        self._file.flush()
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        separator = ',\n' if self.rows_written else '\n'
+        self._file.write(separator + json.dumps(record, indent=2, ensure_ascii=False, default=str))
+        self._file.flush()
+
+    def _close(self) -> None:
+        self._file.write('\n]\n' if self.rows_written else ']\n')
+        self._file.close()
+
+
+class QueuedStreamExporter(StreamExporter):
+    """
+    Classe base para exportadores em arquivo somente de acréscimo, gravados
+    por uma thread própria.
+
+    write apenas enfileira a empresa (fila limitada a EXPORT_QUEUE_SIZE); a
+    thread de gravação formata as linhas e descarrega o arquivo a cada
+    EXPORT_FLUSH_ROWS empresas ou EXPORT_FLUSH_INTERVAL segundos, de modo que
+    a thread que distribui as coletas não espera pelo disco (salvo se a fila
+    encher). A sincronização com o disco (fsync) segue EXPORT_FSYNC e o
+    arquivo pode ser comprimido com gzip ou zstd (EXPORT_COMPRESSION).
+    """
+
+    # Extensões acrescentadas ao arquivo por tipo de compressão
+    COMPRESSION_EXTENSIONS = {'none': '', 'gzip': '.gz', 'zstd': '.zst'}
+    FSYNC_POLICIES = ('never', 'batch', 'close')
+
+    # Codificação do arquivo de saída
+    encoding = 'utf-8'
+
+    def __init__(self, output_path: str, compression: Optional[str] = None, fsync: Optional[str] = None,
+                 queue_size: Optional[int] = None, flush_rows: Optional[int] = None,
+                 flush_interval: Optional[float] = None):
+        """
+        Inicializa o exportador.
+
+        Args:
+            output_path: Caminho do arquivo de saída (sem a extensão da compressão)
+            compression: none, gzip ou zstd (padrão: settings.EXPORT_COMPRESSION)
+            fsync: never, batch ou close (padrão: settings.EXPORT_FSYNC)
+            queue_size: Empresas aguardando gravação (padrão: settings.EXPORT_QUEUE_SIZE)
+            flush_rows: Empresas por descarga (padrão: settings.EXPORT_FLUSH_ROWS)
+            flush_interval: Intervalo máximo entre descargas em segundos (padrão: settings.EXPORT_FLUSH_INTERVAL)
+
+        Raises:
+            ValueError: Se a compressão ou a política de fsync forem desconhecidas
+            ImportError: Se a compressão zstd for pedida sem o pacote zstandard
+        """
+        self.compression = compression or settings.EXPORT_COMPRESSION
+        self.fsync = fsync or settings.EXPORT_FSYNC
+        if self.compression not in self.COMPRESSION_EXTENSIONS:
+            raise ValueError(f"Compressão desconhecida: {self.compression}")
+        if self.fsync not in self.FSYNC_POLICIES:
+            raise ValueError(f"Política de fsync desconhecida: {self.fsync}")
+        if self.compression == 'zstd':
+            try:
+                import zstandard  # noqa: F401
+            except ImportError:
+                raise ImportError("A compressão zstd exige o pacote zstandard (pip install zstandard)")
+
+        super().__init__(output_path + self.COMPRESSION_EXTENSIONS[self.compression])
+        self.queue_size = queue_size or settings.EXPORT_QUEUE_SIZE
+        self.flush_rows = max(1, flush_rows or settings.EXPORT_FLUSH_ROWS)
+        self.flush_interval = flush_interval or settings.EXPORT_FLUSH_INTERVAL
+
+        self._queue = None
+        self._thread = None
+        self._error = None
+        self._counters = {'flushes': 0, 'fsyncs': 0, 'queue_full': 0}
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Obtém os contadores da gravação.
+
+        Returns:
+            Dicionário com descargas, fsyncs e vezes em que a fila estava cheia
+        """
+        return dict(self._counters)
+
+    def _open(self) -> None:
+        self._raw = open(self.output_path, 'wb')
+        if self.compression == 'gzip':
+            stream = gzip.GzipFile(fileobj=self._raw, mode='wb')
+        elif self.compression == 'zstd':
+            import zstandard
+            stream = zstandard.ZstdCompressor().stream_writer(self._raw, closefd=False)
+        else:
+            stream = self._raw
+        self._file = io.TextIOWrapper(stream, encoding=self.encoding, newline='')
+        self._start_file()
+
+        self._queue = queue.Queue(maxsize=self.queue_size)
+        self._error = None
+        self._thread = threading.Thread(target=self._writer_loop, name="export-writer", daemon=True)
+        self._thread.start()
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self._raise_writer_error()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self._counters['queue_full'] += 1
+            self._queue.put(record)
+
+    def _close(self) -> None:
+        self._queue.put(_CLOSE)
+        self._thread.join()
+
+        try:
+            self._file.close()
+        finally:
+            if not self._raw.closed:
+                self._raw.close()
+        logger.debug(f"Gravação de {self.output_path}: {self.stats()}")
+        self._raise_writer_error()
+
+    def _writer_loop(self) -> None:
+        """Grava as empresas da fila, descarregando o arquivo em lotes."""
+        pending = 0
+        last_flush = time.monotonic()
+
+        while True:
+            try:
+                record = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                record = None
+
+            try:
+                if record is _CLOSE:
+                    self._flush(sync=self.fsync != 'never')
+                    return
+                if record is not None and self._error is None:
+                    self._write_record(record)
+                    pending += 1
+
+                if pending and (pending >= self.flush_rows or time.monotonic() - last_flush >= self.flush_interval):
+                    self._flush(sync=self.fsync == 'batch')
+                    pending = 0
+                    last_flush = time.monotonic()
+
+            except Exception as e:
+                # Continuar consumindo a fila para não travar quem escreve; o erro é repassado em write/close
+                logger.error(f"Erro ao gravar {self.output_path}: {e}")
+                self._error = self._error or e
+                if record is _CLOSE:
+                    return
+
+    def _flush(self, sync: bool) -> None:
+        """Descarrega o arquivo (e o sincroniza com o disco, se pedido)."""
+        self._file.flush()
+        self._raw.flush()
+        self._counters['flushes'] += 1
+        if sync:
+            os.fsync(self._raw.fileno())
+            self._counters['fsyncs'] += 1
+
+    def _raise_writer_error(self) -> None:
+        """Repassa um erro ocorrido na thread de gravação."""
+        if self._error is not None:
+            raise IOError(f"Falha na gravação de {self.output_path}: {self._error}")
+
+    def _start_file(self) -> None:
+        """Grava o início do arquivo, se houver (executado na abertura)."""
+        pass
+
+    @abstractmethod
+    def _write_record(self, record: Dict[str, Any]) -> None:
+        """Grava uma empresa no arquivo (executado na thread de gravação)."""
+        pass
+
+
+class NDJSONStreamExporter(QueuedStreamExporter):
+    """
+    Exportador incremental para JSON delimitado por linhas (uma empresa por linha).
+    """
+
+    extension = "ndjson"
+
+    def _write_record(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+
+
+class CSVStreamExporter(QueuedStreamExporter):
+    """
+    Exportador incremental para CSV (cabeçalho definido pela primeira empresa).
+    """
+
+    extension = "csv"
+    encoding = 'utf-8-sig'
+
+    def _start_file(self) -> None:
+        self._writer = None
+
+    def _write_record(self, record: Dict[str, Any]) -> None:
+        if self._writer is None:
+            self._writer = csv.DictWriter(self._file, fieldnames=list(record.keys()), extrasaction='ignore')
+            self._writer.writeheader()
+        self._writer.writerow(record)
+
+
+class ExcelStreamExporter(StreamExporter):
+    """
+    Exportador incremental para Excel.
+
+    O formato XLSX só é gravado por completo ao final, então cada empresa é
+    acrescentada a um arquivo JSON Lines parcial ao lado da planilha; se a
+    execução for interrompida, os dados coletados permanecem nesse arquivo.
+    """
+
+    extension = "xlsx"
+
+    def __init__(self, output_path: str, excel_exporter: Optional[ExcelExporter] = None):
+        """
+        Inicializa o exportador.
+
+        Args:
+            output_path: Caminho da planilha de saída
+            excel_exporter: Exportador usado para gerar a planilha formatada (opcional)
+        """
+        super().__init__(output_path)
+        self.partial_path = f"{output_path}.partial.jsonl"
+        self.excel_exporter = excel_exporter or ExcelExporter()
+
+    def _open(self) -> None:
+        self._file = open(self.partial_path, 'w', encoding='utf-8')
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+        self._file.flush()
+
+    def _close(self) -> None:
+        self._file.close()
+
+        if not self.rows_written:
+            os.remove(self.partial_path)
+            return
+
+        output_dir, filename = os.path.split(os.path.abspath(self.output_path))
+        self.excel_exporter.output_dir = output_dir
+        with open(self.partial_path, 'r', encoding='utf-8') as f:
+            exported = self.excel_exporter.export_rows((json.loads(line) for line in f if line.strip()), filename)
+
+        if exported:
+            os.remove(self.partial_path)
+        else:
+            logger.error(f"Falha ao gerar a planilha; dados preservados em {self.partial_path}")
+
+
+class ParquetStreamExporter(StreamExporter):
+    """
+    Exportador incremental para Parquet (requer o pacote pyarrow).
+
+    As empresas são acumuladas e gravadas em grupos de linhas de
+    PARQUET_ROW_GROUP_SIZE, sem montar um DataFrame da execução inteira.
+    As colunas de PARQUET_DICTIONARY_COLUMNS são gravadas como categorias
+    (dicionário) e a compressão vem de PARQUET_COMPRESSION. Com
+    PARQUET_PARTITION_BY, a saída é um diretório particionado no formato
+    Hive (ex.: State=SP/LOTE=1/part-0.parquet), legível por
+    pyarrow.dataset, pandas, Spark ou DuckDB.
+
+    O rodapé do Parquet só é gravado ao final; se a execução for
+    interrompida, os dados permanecem no diário da execução (--resume).
+    """
+
+    extension = "parquet"
+
+    def __init__(self, output_path: str, partition_by: Optional[List[str]] = None,
+                 compression: Optional[str] = None, row_group_size: Optional[int] = None):
+        """
+        Inicializa o exportador.
+
+        Args:
+            output_path: Caminho do arquivo (ou do diretório, se particionado)
+            partition_by: Colunas de particionamento (padrão: settings.PARQUET_PARTITION_BY)
+            compression: Compressão (padrão: settings.PARQUET_COMPRESSION)
+            row_group_size: Empresas por grupo de linhas (padrão: settings.PARQUET_ROW_GROUP_SIZE)
+
+        Raises:
+            ImportError: Se o pyarrow não estiver instalado
+        """
+        super().__init__(output_path)
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("A exportação em Parquet exige o pacote pyarrow (pip install pyarrow)")
+
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self.partition_by = list(settings.PARQUET_PARTITION_BY if partition_by is None else partition_by)
+        self.compression = compression or settings.PARQUET_COMPRESSION
+        self.row_group_size = max(1, row_group_size or settings.PARQUET_ROW_GROUP_SIZE)
+
+        self._schema = None
+        # Por partição (caminho relativo): empresas pendentes e gravador aberto
+        self._buffers = {}
+        self._writers = {}
+
+    def _open(self) -> None:
+        if self.partition_by:
+            os.makedirs(self.output_path, exist_ok=True)
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        if self._schema is None:
+            self._schema = self._build_schema(record)
+
+        partition = self._partition_path(record)
+        buffer = self._buffers.setdefault(partition, [])
+        buffer.append(record)
+        if len(buffer) >= self.row_group_size:
+            self._flush(partition)
+
+    def _close(self) -> None:
+        try:
+            for partition in list(self._buffers):
+                self._flush(partition)
+        finally:
+            for writer in self._writers.values():
+                writer.close()
+            self._writers.clear()
+
+    def _build_schema(self, record: Dict[str, Any]):
+        """
+        Monta o esquema com as colunas da primeira empresa (sem as de
+        particionamento). Os tipos não dependem dos valores: apenas as
+        colunas de PARQUET_INTEGER_COLUMNS são inteiras.
+        """
+        pa = self._pa
+        fields = []
+        for column in record:
+            if column in self.partition_by:
+                continue
+            if column in settings.PARQUET_DICTIONARY_COLUMNS:
+                fields.append(pa.field(column, pa.dictionary(pa.int32(), pa.string())))
+            elif column in PARQUET_INTEGER_COLUMNS:
+                fields.append(pa.field(column, pa.int64()))
+            else:
+                fields.append(pa.field(column, pa.string()))
+        return pa.schema(fields)
+
+    def _partition_path(self, record: Dict[str, Any]) -> str:
+        """Obtém o diretório relativo da partição de uma empresa (vazio sem particionamento)."""
+        parts = []
+        for column in self.partition_by:
+            value = record.get(column)
+            value = '__HIVE_DEFAULT_PARTITION__' if value in (None, '') else quote(str(value), safe='')
+            parts.append(f"{column}={value}")
+        return os.path.join(*parts) if parts else ''
+
+    def _flush(self, partition: str) -> None:
+        """Grava as empresas pendentes de uma partição como um grupo de linhas."""
+        records = self._buffers.pop(partition, None)
+        if not records:
+            return
+
+        pa = self._pa
+        columns = []
+        for field in self._schema:
+            values = [record.get(field.name) for record in records]
+            if pa.types.is_integer(field.type):
+                values = [None if value in (None, '') else int(value) for value in values]
+            else:
+                values = [None if value is None else str(value) for value in values]
+            columns.append(pa.array(values, type=field.type))
+        table = pa.Table.from_arrays(columns, schema=self._schema)
+
+        writer = self._writers.get(partition)
+        if writer is None:
+            if partition:
+                directory = os.path.join(self.output_path, partition)
+                os.makedirs(directory, exist_ok=True)
+                path = os.path.join(directory, 'part-0.parquet')
+            else:
+                path = self.output_path
+            writer = self._writers[partition] = self._pq.ParquetWriter(
+                path, self._schema,
+                compression=None if self.compression == 'none' else self.compression
+            )
+        writer.write_table(table, row_group_size=self.row_group_size)
+
+
+class SQLiteStreamExporter(StreamExporter):
+    """
+    Exportador para o banco acumulado de empresas (utils.company_store).
+
+    Em vez de um arquivo por execução, as empresas são unidas às já
+    armazenadas por execuções anteriores (pelo CNPJ, domínio ou nome
+    normalizado) em COMPANY_STORE_PATH. As gravações são feitas em
+    transações de COMPANY_STORE_BATCH_SIZE empresas.
+    """
+
+    extension = "sqlite"
+
+    def __init__(self, output_path: str, store: Optional[CompanyStore] = None,
+                 batch_size: Optional[int] = None):
+        """
+        Inicializa o exportador.
+
+        Args:
+            output_path: Ignorado; o banco fica em settings.COMPANY_STORE_PATH
+            store: Banco de empresas (opcional, aberto na primeira gravação)
+            batch_size: Empresas por transação (padrão: settings.COMPANY_STORE_BATCH_SIZE)
+        """
+        super().__init__(store.path if store else resolve_data_path(settings.COMPANY_STORE_PATH))
+        self.store = store
+        self.batch_size = max(1, batch_size or settings.COMPANY_STORE_BATCH_SIZE)
+        self._pending = []
+        self._counts = {'inserted': 0, 'updated': 0}
+
+    def _open(self) -> None:
+        if self.store is None:
+            self.store = CompanyStore(self.output_path)
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self._pending.append(record)
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+
+    def _close(self) -> None:
+        self._flush()
+        logger.info(f"Banco de empresas: {self._counts['inserted']} novas, "
+                    f"{self._counts['updated']} atualizadas")
+
+    def _flush(self) -> None:
+        """Grava as empresas pendentes em uma transação."""
+        if not self._pending:
+            return
+        counts = self.store.upsert_many(self._pending)
+        self._pending = []
+        for name, count in counts.items():
+            self._counts[name] += count
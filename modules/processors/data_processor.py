@@ -3,10 +3,52 @@ Processador de dados para unificar informações de múltiplas fontes.
 """
 
 import logging
-from typing import Dict, List, Any
+from typing import Dict, Iterable, List, Any
+
+import numpy as np
+import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+
+class _MissingValue:
+    """Marca de campo ausente em process_batch (falsa, ao contrário de um NaN coletado)."""
+
+    def __bool__(self) -> bool:
+        return False
+
+    def __repr__(self) -> str:
+        return '<ausente>'
+
+
+_MISSING = _MissingValue()
+
+# Campos do registro unificado, na ordem de exportação (LOTE é preenchido com 1)
+OUTPUT_FIELDS = [
+    'Company Name (Revised)', 'Location', 'CNPJ', 'Fantasy name', 'Domain', 'Size',
+    'First name', 'Second Name', 'Office', 'E-mail', 'Telephone', 'Telephone 2',
+    'City', 'State', 'Linkedin'
+]
+
+# Prioridade de fontes por campo
+SOURCE_PRIORITIES = {
+    'Company Name (Revised)': ['cnpj', 'linkedin', 'company_site'],
+    'Location': ['cnpj', 'company_site', 'linkedin'],
+    'CNPJ': ['cnpj'],
+    'Fantasy name': ['cnpj'],
+    'Domain': ['company_site', 'linkedin', 'cnpj'],
+    'Size': ['linkedin', 'company_site'],
+    'First name': ['linkedin'],
+    'Second Name': ['linkedin'],
+    'Office': ['linkedin'],
+    'E-mail': ['company_site', 'cnpj'],
+    'Telephone': ['cnpj', 'company_site'],
+    'Telephone 2': ['cnpj', 'company_site'],
+    'City': ['cnpj', 'linkedin', 'company_site'],
+    'State': ['cnpj', 'linkedin', 'company_site'],
+    'Linkedin': ['linkedin']
+}
+
 class DataProcessor:
     """
     Processador responsável por unificar dados de múltiplas fontes.
@@ -50,6 +92,25 @@ class DataProcessor:
                 'phone2': 'Telephone 2',
                 'address': 'Location',
                 'size': 'Size'
+            },
+            # Registro de uma exportação anterior (modo de atualização); por não
+            # constar nas prioridades, só preenche campos que as coletas novas deixaram vazios
+            'previous': {
+                'Company Name (Revised)': 'Company Name (Revised)',
+                'Location': 'Location',
+                'CNPJ': 'CNPJ',
+                'Fantasy name': 'Fantasy name',
+                'Domain': 'Domain',
+                'Size': 'Size',
+                'First name': 'First name',
+                'Second Name': 'Second Name',
+                'Office': 'Office',
+                'E-mail': 'E-mail',
+                'Telephone': 'Telephone',
+                'Telephone 2': 'Telephone 2',
+                'City': 'City',
+                'State': 'State',
+                'Linkedin': 'Linkedin'
             }
         }
         
@@ -72,24 +133,8 @@ class DataProcessor:
         for company_result in raw_results:
             try:
                 # Inicializar dados unificados
-                unified_data = {
-                    'Company Name (Revised)': '',
-                    'Location': '',
-                    'CNPJ': '',
-                    'Fantasy name': '',
-                    'Domain': '',
-                    'Size': '',
-                    'First name': '',
-                    'Second Name': '',
-                    'Office': '',
-                    'E-mail': '',
-                    'Telephone': '',
-                    'Telephone 2': '',
-                    'City': '',
-                    'State': '',
-                    'Linkedin': '',
-                    'LOTE': 1  # Valor padrão para LOTE
-                }
+                unified_data = dict.fromkeys(OUTPUT_FIELDS, '')
+                unified_data['LOTE'] = 1  # Valor padrão para LOTE
                 
                 # Processar cada fonte de dados
                 for source_data in company_result.get('data_sources', []):
@@ -130,6 +175,143 @@ class DataProcessor:
         
         return processed_results
     
+    def process_batch(self, raw_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Processa e unifica um lote grande de empresas de uma só vez.
+        
+        Equivalente a process (mesma saída e mesmos avisos), mas com todas as
+        fontes reunidas em uma tabela colunar e a unificação feita com
+        operações vetorizadas; indicado para importações com milhares de
+        empresas. O fluxo do crawler unifica empresa a empresa com process;
+        este método é um ponto de entrada para uso como biblioteca.
+        
+        Args:
+            raw_results: Empresas com 'data_sources'
+        
+        Returns:
+            Lista de resultados processados
+        """
+        records = []
+        companies = []
+        for index, company_result in enumerate(raw_results):
+            for source_data in company_result.get('data_sources', []):
+                records.append(source_data)
+                companies.append(index)
+        
+        # dtype=object preserva os valores originais (sem conversão para tipos numpy)
+        sources = pd.DataFrame(records, dtype=object)
+        
+        # O preenchimento dos campos ausentes (NaN) não pode ser confundido com um
+        # NaN coletado, que process trata como valor preenchido: nas colunas com
+        # NaN coletado, os campos ausentes recebem _MISSING
+        nan_records = [record for record in records for value in record.values() if value != value]
+        nan_columns = {
+            field for record in nan_records for field, value in record.items() if value != value
+        }
+        for column in nan_columns:
+            sources[column] = pd.Series([record.get(column, _MISSING) for record in records], dtype=object)
+        
+        sources['_company'] = np.asarray(companies, dtype=np.int64)
+        return self.process_frame(sources, len(raw_results), nan_fields=nan_columns)
+    
+    def process_frame(self, sources: pd.DataFrame, company_count: int,
+                      nan_fields: Iterable[str] = ()) -> List[Dict[str, Any]]:
+        """
+        Unifica fontes já organizadas em uma tabela colunar.
+        
+        Cada linha é o registro de uma fonte, com a coluna 'source', a coluna
+        '_company' (posição da empresa, de 0 a company_count - 1) e uma coluna
+        por campo coletado; valores vazios, None ou NaN equivalem a campos não
+        coletados (exceto nas colunas de nan_fields). Para cada empresa e campo vence o valor da fonte de maior
+        prioridade; entre fontes de mesma prioridade, o primeiro valor na ordem
+        das linhas (e do mapeamento de campos), como em process.
+        
+        Args:
+            sources: Registros das fontes, na ordem de unificação
+            company_count: Número de empresas
+            nan_fields: Colunas em que NaN é um valor coletado, como em process
+                (nelas, os campos não coletados são marcados com _MISSING)
+        
+        Returns:
+            Lista de resultados processados, na ordem das empresas
+        """
+        field_index = {field: index for index, field in enumerate(OUTPUT_FIELDS)}
+        source_types = sources['source'].to_numpy() if 'source' in sources else np.full(len(sources), '', dtype=object)
+        company_column = sources['_company'].to_numpy(dtype=np.int64) if len(sources) else np.empty(0, dtype=np.int64)
+        row_order = np.arange(len(sources), dtype=np.int64)
+        mapping_width = max(len(mapping) for mapping in self.field_mapping.values())
+        order_span = (len(sources) + 1) * mapping_width
+        
+        # Candidatos (empresa, campo, chave, valor), uma coluna do mapeamento por vez; a
+        # chave combina a prioridade da fonte e a ordem do valor (menor chave vence)
+        pieces = []
+        for source_type, mapping in self.field_mapping.items():
+            rows = np.flatnonzero(source_types == source_type)
+            if not len(rows):
+                continue
+        
+            for position, (source_field, target_field) in enumerate(mapping.items()):
+                if source_field not in sources or target_field not in field_index:
+                    continue
+        
+                values = sources[source_field].to_numpy(dtype=object)[rows]
+                present = values.astype(bool)
+                if source_field not in nan_fields:
+                    present &= pd.notna(values)
+                if not present.any():
+                    continue
+        
+                selected = rows[present]
+                order = row_order[selected] * mapping_width + position
+                priorities = SOURCE_PRIORITIES.get(target_field)
+                if priorities is None:
+                    # Campo sem prioridades: qualquer fonte substitui a anterior (vence o último valor)
+                    rank, order = 0, -order
+                else:
+                    rank = priorities.index(source_type) if source_type in priorities else len(priorities)
+        
+                pieces.append((
+                    company_column[selected],
+                    np.full(len(selected), field_index[target_field], dtype=np.int64),
+                    rank * order_span + order,
+                    values[present]
+                ))
+        
+        unified = np.full((company_count, len(OUTPUT_FIELDS) + 1), '', dtype=object)
+        unified[:, -1] = 1  # LOTE
+        filled = np.zeros(company_count, dtype=np.int64)
+        if pieces:
+            company, field, key, values = (np.concatenate(column) for column in zip(*pieces))
+        
+            # Menor chave de cada par (empresa, campo), sem ordenar os candidatos
+            cell = company * len(OUTPUT_FIELDS) + field
+            best = np.full(company_count * len(OUTPUT_FIELDS), np.iinfo(np.int64).max, dtype=np.int64)
+            np.minimum.at(best, cell, key)
+            winners = key == best[cell]
+        
+            unified[company[winners], field[winners]] = values[winners]
+            filled = np.bincount(company[winners], minlength=company_count)
+            named = company[winners & (field == field_index['Company Name (Revised)'])]
+        else:
+            named = np.empty(0, dtype=np.int64)
+        
+        # Mesmo critério de _has_minimum_data sobre o registro com os campos
+        # de controle _source_* (um por campo preenchido) e LOTE
+        has_name = np.zeros(company_count, dtype=bool)
+        has_name[named] = True
+        minimum = has_name & ((2 * filled + 1) / (len(OUTPUT_FIELDS) + 1 + filled) >= 0.3)
+        
+        partial = ~minimum & has_name if self.export_partial else np.zeros(company_count, dtype=bool)
+        for index in np.flatnonzero(~minimum):
+            if partial[index]:
+                logger.warning(f"Exportando dados parciais para {unified[index, 0]}")
+            else:
+                logger.warning(f"Empresa {unified[index, 0]} não tem dados mínimos necessários")
+        
+        columns = OUTPUT_FIELDS + ['LOTE']
+        processed_results = [dict(zip(columns, row)) for row in unified[minimum | partial].tolist()]
+        return processed_results
+    
     def _is_better_source(self, new_source: str, field: str, current_source: str) -> bool:
         """
         Verifica se a nova fonte é mais confiável que a atual para um campo específico.
@@ -142,24 +324,7 @@ class DataProcessor:
         Returns:
             True se a nova fonte for mais confiável, False caso contrário
         """
-        # Prioridade de fontes por campo
-        priorities = {
-            'Company Name (Revised)': ['cnpj', 'linkedin', 'company_site'],
-            'Location': ['cnpj', 'company_site', 'linkedin'],
-            'CNPJ': ['cnpj'],
-            'Fantasy name': ['cnpj'],
-            'Domain': ['company_site', 'linkedin', 'cnpj'],
-            'Size': ['linkedin', 'company_site'],
-            'First name': ['linkedin'],
-            'Second Name': ['linkedin'],
-            'Office': ['linkedin'],
-            'E-mail': ['company_site', 'cnpj'],
-            'Telephone': ['cnpj', 'company_site'],
-            'Telephone 2': ['cnpj', 'company_site'],
-            'City': ['cnpj', 'linkedin', 'company_site'],
-            'State': ['cnpj', 'linkedin', 'company_site'],
-            'Linkedin': ['linkedin']
-        }
+        priorities = SOURCE_PRIORITIES
         
         # Se o campo não estiver no dicionário de prioridades, qualquer fonte é válida
         if field not in priorities:
@@ -9,6 +9,7 @@ from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Optional
 
 from config import settings
+from utils.page_waiter import PageWaiter
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +31,7 @@ class BaseScraper(ABC):
         self.max_retries = settings.MAX_RETRIES
         self.retry_delay = settings.RETRY_DELAY
         self.user_agent = settings.USER_AGENT
+        self.page_waiter = PageWaiter()
     
     @abstractmethod
     def search(self, criteria: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -4,7 +4,6 @@ Responsável por extrair informações fiscais e cadastrais de empresas.
 """
 
 import logging
-import time
 import re
 from typing import Dict, Any, List, Optional
 from urllib.parse import quote
@@ -17,6 +16,11 @@ import requests
 from bs4 import BeautifulSoup
 
 from .base_scraper import BaseScraper
+from config import settings
+from utils.cnpj_store import dedupe_cnpjs, get_cnpj_store
+from utils.html_extractor import PageSnapshot
+from utils.rate_limiter import get_rate_limiter
+from utils.receita_index import get_receita_index, resolve_uf, sector_cnae_prefixes
 from utils.selenium_manager import SeleniumManager
 
 logger = logging.getLogger(__name__)
@@ -31,6 +35,21 @@ class CNPJScraper(BaseScraper):
         super().__init__("CNPJ", requires_selenium=True)
         self.cnpj_biz_url = "https://cnpj.biz/"
         self.receita_ws_url = "https://receitaws.com.br/v1/cnpj/"
+        self.cnpj_store = get_cnpj_store() if settings.CNPJ_STORE_ENABLED else None
+        self.receita_index = get_receita_index()
+        
+        # Rótulos da tabela do CNPJ.biz e campos correspondentes
+        self.cnpjbiz_table_fields = [
+            ('Nome Fantasia', 'fantasy_name'),
+            ('CNPJ', 'cnpj_formatted'),
+            ('Endereço', 'address'),
+            ('CEP', 'zip_code'),
+            ('Telefone', 'phone'),
+            ('Email', 'email'),
+            ('Data de Abertura', 'opening_date'),
+            ('Situação', 'status'),
+            ('Capital Social', 'capital')
+        ]
     
     def search(self, criteria: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
@@ -59,6 +78,13 @@ class CNPJScraper(BaseScraper):
             
             return results
         
+        # Responder localmente quando o índice da Receita estiver disponível
+        if self.receita_index:
+            results = self._search_receita_index(criteria)
+            if results:
+                logger.info(f"Índice da Receita encontrou {len(results)} empresas")
+                return results
+        
         # Construir query de busca
         query_parts = []
         
@@ -146,6 +172,74 @@ class CNPJScraper(BaseScraper):
         
         return results
     
+    def _search_receita_index(self, criteria: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Busca empresas no índice local da Receita por setor, localização e porte.
+        
+        Args:
+            criteria: Critérios de busca
+            
+        Returns:
+            Lista de empresas encontradas (vazia se os critérios não puderem ser traduzidos)
+        """
+        sector = criteria.get('sector', {})
+        cnae_prefixes = sector_cnae_prefixes(sector.get('main', ''))
+        
+        location = criteria.get('location', {})
+        ufs = [uf for uf in (resolve_uf(state) for state in location.get('states', [])) if uf]
+        cities = location.get('cities', [])
+        
+        # Sem setor ou localização reconhecidos, a busca devolveria empresas aleatórias
+        if not (cnae_prefixes or ufs or cities):
+            return []
+        
+        max_results = criteria.get('output', {}).get('max_results', 5)
+        records = self.receita_index.search(
+            cnae_prefixes=cnae_prefixes,
+            ufs=ufs,
+            cities=cities,
+            portes=self._criteria_portes(criteria),
+            limit=max_results
+        )
+        
+        return [
+            {
+                'name': record['name'],
+                'cnpj': record['cnpj'],
+                'source': 'cnpj',
+                'url': f"{self.cnpj_biz_url}{record['cnpj']}"
+            }
+            for record in records
+        ]
+    
+    def _criteria_portes(self, criteria: Dict[str, Any]) -> Optional[List[str]]:
+        """
+        Converte os critérios de tamanho em códigos de porte da Receita.
+        
+        O porte é definido pelo faturamento (micro: até R$ 360 mil; pequeno
+        porte: até R$ 4,8 milhões), então o número de funcionários é apenas
+        uma aproximação.
+        
+        Args:
+            criteria: Critérios de busca
+            
+        Returns:
+            Lista de códigos de porte ou None para não filtrar
+        """
+        size = criteria.get('size', {})
+        min_revenue = size.get('revenue', {}).get('min') or 0
+        employees = size.get('employees', {})
+        min_employees = employees.get('min') or 0
+        max_employees = employees.get('max')
+        
+        if min_revenue > 4800000 or min_employees >= 100:
+            return ['05']
+        if min_revenue > 360000 or min_employees >= 10:
+            return ['03', '05']
+        if max_employees is not None and max_employees < 10:
+            return ['01']
+        return None
+    
     def collect(self, target: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
         """
         Coleta informações detalhadas de CNPJ para uma empresa específica.
@@ -180,13 +274,83 @@ class CNPJScraper(BaseScraper):
         # Normalizar CNPJ (remover caracteres especiais)
         cnpj = ''.join(filter(str.isdigit, collected_data['cnpj']))
         
+        # Registro armazenado de execuções anteriores
+        if self.cnpj_store:
+            stored_data = self.cnpj_store.get(cnpj)
+            if stored_data:
+                collected_data.update(stored_data)
+                logger.info(f"Dados do CNPJ {cnpj} obtidos do armazenamento local")
+                return collected_data
+        
+        fetched_data = self._fetch_cnpj_record(cnpj)
+        if fetched_data:
+            collected_data.update(fetched_data)
+        
+        return collected_data
+    
+    def collect_many(self, cnpjs: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Coleta dados de vários CNPJs de uma vez.
+        
+        CNPJs repetidos são consultados uma única vez, registros armazenados
+        são devolvidos imediatamente e apenas os ausentes são consultados nas
+        fontes, respeitando o limite de requisições da ReceitaWS.
+        
+        Args:
+            cnpjs: Lista de CNPJs (formatados ou não)
+            
+        Returns:
+            Dicionário CNPJ normalizado -> dados coletados, na ordem de entrada
+            (CNPJs sem dados em nenhuma fonte não são incluídos)
+        """
+        unique_cnpjs = dedupe_cnpjs(cnpjs)
+        stored = self.cnpj_store.get_many(unique_cnpjs) if self.cnpj_store else {}
+        missing = [cnpj for cnpj in unique_cnpjs if cnpj not in stored]
+        
+        logger.info(
+            f"Coleta em lote de {len(unique_cnpjs)} CNPJs: {len(stored)} no armazenamento local, "
+            f"{len(missing)} a consultar"
+        )
+        
+        fetched = {}
+        for cnpj in missing:
+            data = self._fetch_cnpj_record(cnpj)
+            if data:
+                fetched[cnpj] = data
+        
+        results = {}
+        for cnpj in unique_cnpjs:
+            data = stored.get(cnpj) or fetched.get(cnpj)
+            if data:
+                results[cnpj] = {'source': 'cnpj', 'cnpj': cnpj, **data}
+        
+        return results
+    
+    def _fetch_cnpj_record(self, cnpj: str) -> Optional[Dict[str, Any]]:
+        """
+        Consulta um CNPJ nas fontes externas e armazena o resultado.
+        
+        Args:
+            cnpj: CNPJ normalizado (somente dígitos)
+            
+        Returns:
+            Dados coletados ou None
+        """
+        # Índice local da Receita (sem rede)
+        if self.receita_index:
+            index_data = self.receita_index.get(cnpj)
+            if index_data:
+                logger.info(f"Dados do CNPJ {cnpj} obtidos do índice local da Receita")
+                return index_data
+        
         # Tentar primeiro com ReceitaWS (mais confiável, mas com limites)
         try:
             receita_data = self._collect_from_receitaws(cnpj)
             if receita_data:
-                collected_data.update(receita_data)
                 logger.info(f"Dados coletados com sucesso da ReceitaWS para CNPJ {cnpj}")
-                return collected_data
+                if self.cnpj_store:
+                    self.cnpj_store.put(cnpj, receita_data, 'receitaws')
+                return receita_data
         except Exception as e:
             logger.warning(f"Erro ao coletar dados da ReceitaWS: {e}")
         
@@ -194,13 +358,14 @@ class CNPJScraper(BaseScraper):
         try:
             cnpj_biz_data = self._collect_from_cnpjbiz(cnpj)
             if cnpj_biz_data:
-                collected_data.update(cnpj_biz_data)
                 logger.info(f"Dados coletados com sucesso do CNPJ.biz para CNPJ {cnpj}")
-                return collected_data
+                if self.cnpj_store:
+                    self.cnpj_store.put(cnpj, cnpj_biz_data, 'cnpjbiz')
+                return cnpj_biz_data
         except Exception as e:
             logger.error(f"Erro ao coletar dados do CNPJ.biz: {e}")
         
-        return collected_data
+        return None
     
     def _search_cnpj_by_name(self, company_name: str) -> Optional[Dict[str, Any]]:
         """
@@ -214,13 +379,26 @@ class CNPJScraper(BaseScraper):
         """
         logger.info(f"Buscando CNPJ para empresa: {company_name}")
         
+        # Consultar o índice local antes de abrir o navegador
+        if self.receita_index:
+            matches = self.receita_index.search_by_name(company_name, limit=1)
+            if matches:
+                match = matches[0]
+                return {
+                    'name': match['name'],
+                    'cnpj': match['cnpj'],
+                    'cnpj_formatted': match['cnpj_formatted'],
+                    'source': 'cnpj',
+                    'url': f"{self.cnpj_biz_url}{match['cnpj']}"
+                }
+        
         # Usar Selenium para buscar no CNPJ.biz
-        with SeleniumManager(headless=True) as driver:
+        with SeleniumManager(headless=True, tenant=self.name) as driver:
             try:
                 # Navegar para página de busca
                 search_url = f"https://www.google.com/search?q={quote(company_name)}+cnpj"
                 driver.get(search_url)
-                time.sleep(3)
+                self.page_waiter.wait_for_page(driver, label=f"{self.name}:google")
                 
                 # Procurar padrões de CNPJ nos resultados
                 page_source = driver.page_source
@@ -246,15 +424,16 @@ class CNPJScraper(BaseScraper):
                 # Se não encontrou, tentar buscar diretamente no CNPJ.biz
                 search_url = f"{self.cnpj_biz_url}?q={quote(company_name)}"
                 driver.get(search_url)
-                time.sleep(3)
+                self.page_waiter.wait_for_page(driver, label=f"{self.name}:cnpjbiz_search")
                 
                 # Procurar resultados
                 try:
                     result_links = driver.find_elements(By.CSS_SELECTOR, "a.empresa")
                     if result_links and len(result_links) > 0:
                         # Clicar no primeiro resultado
+                        search_page_url = driver.current_url
                         result_links[0].click()
-                        time.sleep(3)
+                        self.page_waiter.wait_for_url_change(driver, search_page_url, label=f"{self.name}:cnpjbiz_result")
                         
                         # Extrair CNPJ da URL
                         current_url = driver.current_url
@@ -294,6 +473,7 @@ class CNPJScraper(BaseScraper):
         """
         try:
             url = f"{self.receita_ws_url}{cnpj}"
+            get_rate_limiter().acquire(url)
             response = requests.get(url, timeout=10)
             
             if response.status_code == 200:
@@ -343,6 +523,8 @@ class CNPJScraper(BaseScraper):
                 return result
             else:
                 logger.warning(f"Erro ao acessar ReceitaWS: {response.status_code}")
+                if response.status_code == 429:
+                    get_rate_limiter().penalize(url)
                 return None
                 
         except Exception as e:
@@ -359,127 +541,76 @@ class CNPJScraper(BaseScraper):
         Returns:
             Dados coletados ou None
         """
-        with SeleniumManager(headless=True) as driver:
+        with SeleniumManager(headless=True, tenant=self.name) as driver:
             try:
                 # Navegar para página da empresa
                 url = f"{self.cnpj_biz_url}{cnpj}"
                 logger.info(f"Navegando para: {url}")
                 driver.get(url)
-                time.sleep(5)  # Aguardar carregamento
-                
-                # Extrair dados
-                result = {}
-                
-                # Nome e fantasia
-                try:
-                    name_element = driver.find_element(By.CSS_SELECTOR, "h1")
-                    if name_element:
-                        result['name'] = name_element.text.strip()
-                except NoSuchElementException:
-                    logger.warning("Elemento de nome não encontrado")
-                
-                try:
-                    fantasy_element = driver.find_element(By.XPATH, "//th[contains(text(), 'Nome Fantasia')]/following-sibling::td")
-                    if fantasy_element:
-                        result['fantasy_name'] = fantasy_element.text.strip()
-                except NoSuchElementException:
-                    logger.warning("Elemento de nome fantasia não encontrado")
-                
-                # CNPJ formatado
-                try:
-                    cnpj_element = driver.find_element(By.XPATH, "//th[contains(text(), 'CNPJ')]/following-sibling::td")
-                    if cnpj_element:
-                        result['cnpj_formatted'] = cnpj_element.text.strip()
-                except NoSuchElementException:
-                    logger.warning("Elemento de CNPJ não encontrado")
-                
-                # Localização
-                try:
-                    address_element = driver.find_element(By.XPATH, "//th[contains(text(), 'Endereço')]/following-sibling::td")
-                    if address_element:
-                        result['address'] = address_element.text.strip()
-                except NoSuchElementException:
-                    logger.warning("Elemento de endereço não encontrado")
-                
-                try:
-                    city_state_element = driver.find_element(By.XPATH, "//th[contains(text(), 'Município')]/following-sibling::td")
-                    if city_state_element:
-                        city_state = city_state_element.text.strip()
-                        if " / " in city_state:
-                            city, state = city_state.split(" / ", 1)
-                            result['city'] = city.strip()
-                            result['state'] = state.strip()
-                except NoSuchElementException:
-                    logger.warning("Elemento de município/estado não encontrado")
-                
-                try:
-                    zip_element = driver.find_element(By.XPATH, "//th[contains(text(), 'CEP')]/following-sibling::td")
-                    if zip_element:
-                        result['zip_code'] = zip_element.text.strip()
-                except NoSuchElementException:
-                    logger.warning("Elemento de CEP não encontrado")
-                
-                # Contato
-                try:
-                    phone_element = driver.find_element(By.XPATH, "//th[contains(text(), 'Telefone')]/following-sibling::td")
-                    if phone_element:
-                        result['phone'] = phone_element.text.strip()
-                except NoSuchElementException:
-                    logger.warning("Elemento de telefone não encontrado")
+                self.page_waiter.wait_for_page(driver, label=f"{self.name}:cnpjbiz", selector="h1")
                 
-                try:
-                    email_element = driver.find_element(By.XPATH, "//th[contains(text(), 'Email')]/following-sibling::td")
-                    if email_element:
-                        result['email'] = email_element.text.strip()
-                except NoSuchElementException:
-                    logger.warning("Elemento de email não encontrado")
-                
-                # Informações adicionais
-                try:
-                    opening_element = driver.find_element(By.XPATH, "//th[contains(text(), 'Data de Abertura')]/following-sibling::td")
-                    if opening_element:
-                        result['opening_date'] = opening_element.text.strip()
-                except NoSuchElementException:
-                    logger.warning("Elemento de data de abertura não encontrado")
-                
-                try:
-                    status_element = driver.find_element(By.XPATH, "//th[contains(text(), 'Situação')]/following-sibling::td")
-                    if status_element:
-                        result['status'] = status_element.text.strip()
-                except NoSuchElementException:
-                    logger.warning("Elemento de situação não encontrado")
-                
-                try:
-                    capital_element = driver.find_element(By.XPATH, "//th[contains(text(), 'Capital Social')]/following-sibling::td")
-                    if capital_element:
-                        result['capital'] = capital_element.text.strip()
-                except NoSuchElementException:
-                    logger.warning("Elemento de capital social não encontrado")
-                
-                # Atividade principal
-                try:
-                    activity_element = driver.find_element(By.XPATH, "//th[contains(text(), 'Atividade Principal')]/following-sibling::td")
-                    if activity_element:
-                        activity_text = activity_element.text.strip()
-                        
-                        # Tentar extrair código e descrição
-                        activity_match = re.match(r'(\d+\.\d+-\d+-\d+) - (.+)', activity_text)
-                        if activity_match:
-                            result['main_activity_code'] = activity_match.group(1)
-                            result['main_activity'] = activity_match.group(2)
-                        else:
-                            result['main_activity'] = activity_text
-                except NoSuchElementException:
-                    logger.warning("Elemento de atividade principal não encontrado")
-                
-                # Montar localização completa
-                if 'address' in result and 'city' in result and 'state' in result:
-                    result['location'] = f"{result['address']}, {result['city']} - {result['state']}"
-                    if 'zip_code' in result:
-                        result['location'] += f", {result['zip_code']}"
-                
-                return result
+                # Copiar o DOM uma única vez e extrair todos os campos localmente
+                return self._extract_cnpjbiz_data(PageSnapshot.from_driver(driver))
                 
             except Exception as e:
                 logger.error(f"Erro durante coleta no CNPJ.biz: {e}")
                 return None
+    
+    def _extract_cnpjbiz_data(self, snapshot: PageSnapshot) -> Dict[str, Any]:
+        """
+        Extrai os dados cadastrais de uma página do CNPJ.biz.
+        
+        Args:
+            snapshot: Cópia local da página da empresa
+            
+        Returns:
+            Dados extraídos
+        """
+        # Extrair dados
+        result = {}
+        
+        # Nome e fantasia
+        name = snapshot.first_text("//h1")
+        if name:
+            result['name'] = name.strip()
+        else:
+            logger.warning("Elemento de nome não encontrado")
+        
+        # Campos simples da tabela de dados cadastrais
+        for label, field in self.cnpjbiz_table_fields:
+            value = snapshot.table_value(label)
+            if value is not None:
+                result[field] = value
+            else:
+                logger.warning(f"Elemento de {label} não encontrado")
+        
+        # Localização
+        city_state = snapshot.table_value('Município')
+        if city_state is not None:
+            if " / " in city_state:
+                city, state = city_state.split(" / ", 1)
+                result['city'] = city.strip()
+                result['state'] = state.strip()
+        else:
+            logger.warning("Elemento de município/estado não encontrado")
+        
+        # Atividade principal
+        activity_text = snapshot.table_value('Atividade Principal')
+        if activity_text is not None:
+            # Tentar extrair código e descrição
+            activity_match = re.match(r'(\d+\.\d+-\d+-\d+) - (.+)', activity_text)
+            if activity_match:
+                result['main_activity_code'] = activity_match.group(1)
+                result['main_activity'] = activity_match.group(2)
+            else:
+                result['main_activity'] = activity_text
+        else:
+            logger.warning("Elemento de atividade principal não encontrado")
+        
+        # Montar localização completa
+        if 'address' in result and 'city' in result and 'state' in result:
+            result['location'] = f"{result['address']}, {result['city']} - {result['state']}"
+            if 'zip_code' in result:
+                result['location'] += f", {result['zip_code']}"
+        
+        return result
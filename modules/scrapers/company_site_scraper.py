@@ -4,7 +4,6 @@ Responsável por extrair informações diretamente dos sites das empresas.
 """
 
 import logging
-import time
 import re
 import json
 from typing import Dict, Any, List, Optional
@@ -12,12 +11,16 @@ from urllib.parse import urlparse, urljoin
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
 from modules.scrapers.base_scraper import BaseScraper
-from utils.selenium_manager import SeleniumManager
+from utils.domain_resolver import get_domain_resolver
+from utils.enrichment_budget import should_stop_enrichment
+from utils.html_extractor import PageSnapshot
+from utils.page_fetcher import PageFetcher, BrowserSession
+from utils.company_identity import normalize_company_name
 from utils.searx_client import SearxClient
 from config import settings
 
@@ -32,6 +35,7 @@ class CompanySiteScraper(BaseScraper):
         """Inicializa o scraper de sites corporativos."""
         super().__init__("company_site")
         self.searx_client = SearxClient()
+        self.page_fetcher = PageFetcher(page_waiter=self.page_waiter)
         
         # Padrões para identificação de informações
         self.email_pattern = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
@@ -69,17 +73,18 @@ class CompanySiteScraper(BaseScraper):
         
         # Verificar se há uma lista específica de empresas
         if 'companies' in criteria and criteria['companies']:
-            for company in criteria['companies']:
-                company_name = company.get('name', '')
-                if company_name:
-                    logger.info(f"Buscando site corporativo para: {company_name}")
-                    company_data = self._find_company_site(company_name)
-                    if company_data:
-                        results.append({
-                            'name': company_name,
-                            'data': company_data,
-                            'source': 'company_site'
-                        })
+            company_names = [company.get('name', '') for company in criteria['companies'] if company.get('name', '')]
+            site_results = self._search_official_sites(company_names)
+            
+            for company_name in company_names:
+                logger.info(f"Buscando site corporativo para: {company_name}")
+                company_data = self._find_company_site(company_name, site_results[company_name])
+                if company_data:
+                    results.append({
+                        'name': company_name,
+                        'data': company_data,
+                        'source': 'company_site'
+                    })
         else:
             logger.warning("Nenhuma lista de empresas fornecida para busca de sites corporativos")
         
@@ -106,12 +111,43 @@ class CompanySiteScraper(BaseScraper):
             logger.error(f"Erro ao coletar dados do site corporativo para {company_name}: {e}")
             return {}
     
-    def _find_company_site(self, company_name: str) -> Dict[str, Any]:
+    def _search_official_sites(self, company_names: List[str]) -> Dict[str, List[Any]]:
+        """
+        Busca o site oficial de várias empresas, com as consultas ao SearX em paralelo.
+        
+        Args:
+            company_names: Nomes das empresas
+            
+        Returns:
+            Dicionário nome -> resultados da busca
+        """
+        responses = self.searx_client.search_many(
+            [f"{company_name} site oficial" for company_name in company_names], max_results=10
+        )
+        site_results = {
+            company_name: response.get('results', []) for company_name, response in zip(company_names, responses)
+        }
+        
+        # Busca alternativa para as empresas sem resultados
+        missing = [company_name for company_name in company_names if not site_results[company_name]]
+        if missing:
+            for company_name in missing:
+                logger.warning(f"Nenhum resultado de busca encontrado para {company_name}")
+            responses = self.searx_client.search_many(
+                [f"{company_name} website" for company_name in missing], max_results=10
+            )
+            for company_name, response in zip(missing, responses):
+                site_results[company_name] = response.get('results', [])
+        
+        return site_results
+    
+    def _find_company_site(self, company_name: str, search_results: Optional[List[Any]] = None) -> Dict[str, Any]:
         """
         Encontra e extrai informações do site corporativo de uma empresa.
         
         Args:
             company_name: Nome da empresa
+            search_results: Resultados já obtidos da busca do site oficial (opcional)
             
         Returns:
             Dados extraídos do site corporativo
@@ -120,16 +156,8 @@ class CompanySiteScraper(BaseScraper):
         
         try:
             # Buscar site oficial da empresa usando SearX
-            search_query = f"{company_name} site oficial"
-            search_results = self.searx_client.search(search_query, max_results=10)
-            
-            if not search_results:
-                logger.warning(f"Nenhum resultado de busca encontrado para {company_name}")
-                # Tentar busca alternativa
-                search_query = f"{company_name} website"
-                search_results = self.searx_client.search(search_query, max_results=10)
-                if not search_results:
-                    return company_data
+            if search_results is None:
+                search_results = self._search_official_sites([company_name])[company_name]
             
             # Filtrar resultados para encontrar o site oficial
             official_site = None
@@ -151,7 +179,7 @@ class CompanySiteScraper(BaseScraper):
                     break
             
             if not official_site:
-                # Tentar busca direta pelo domínio
+                # Tentar busca direta pelo domínio (apenas domínios que existem)
                 company_domain = self._guess_domain(company_name)
                 if company_domain:
                     official_site = f"https://{company_domain}"
@@ -164,69 +192,65 @@ class CompanySiteScraper(BaseScraper):
             company_data['domain'] = self._extract_domain(official_site)
             company_data['website'] = official_site
             
-            # Extrair informações do site oficial
-            with SeleniumManager() as driver:
-                if not driver:
-                    logger.error("Falha ao inicializar o driver Selenium")
-                    return company_data
-                
-                # Navegar para o site oficial
+            # Extrair informações do site oficial (HTTP primeiro, navegador sob demanda)
+            with BrowserSession(tenant=self.name) as browser:
                 logger.info(f"Navegando para: {official_site}")
-                try:
-                    driver.get(official_site)
-                    time.sleep(settings.NAVIGATION_DELAY)
-                except Exception as e:
-                    logger.error(f"Falha ao navegar para {official_site}: {e}")
+                home_page = self.page_fetcher.fetch(official_site, browser, label=f"{self.name}:home")
+                if not home_page:
+                    logger.error(f"Falha ao navegar para {official_site}")
                     return company_data
                 
                 # Extrair informações da página inicial
-                self._extract_contact_info(driver, company_data)
-                self._extract_company_info(driver, company_data, company_name)
+                self._extract_contact_info(home_page, company_data)
+                self._extract_company_info(home_page, company_data, company_name)
                 
                 # Verificar páginas de contato
                 for contact_page in self.contact_pages:
+                    # Se já tem informações suficientes, parar
+                    if self._should_stop(company_data, company_name):
+                        break
+                    
                     try:
                         contact_url = urljoin(official_site, contact_page)
                         logger.info(f"Verificando página de contato: {contact_url}")
                         
-                        driver.get(contact_url)
-                        time.sleep(settings.NAVIGATION_DELAY)
+                        page = self.page_fetcher.fetch(contact_url, browser, label=f"{self.name}:contact")
+                        if not page:
+                            continue
                         
                         # Extrair informações da página de contato
-                        self._extract_contact_info(driver, company_data)
-                        self._extract_company_info(driver, company_data, company_name)
-                        
-                        # Se encontrou informações suficientes, parar
-                        if self._has_sufficient_info(company_data):
-                            break
+                        self._extract_contact_info(page, company_data)
+                        self._extract_company_info(page, company_data, company_name)
                     
                     except Exception as e:
                         logger.warning(f"Erro ao acessar página de contato {contact_page}: {e}")
                         continue
                 
                 # Buscar página "Sobre" ou "Quem Somos" se ainda faltam informações
-                if not self._has_sufficient_info(company_data):
-                    self._find_and_navigate_about_page(driver, company_data, company_name)
+                if not self._should_stop(company_data, company_name):
+                    self._find_and_navigate_about_page(home_page, browser, company_data, company_name)
                 
                 # Buscar informações específicas que ainda estão faltando
-                self._search_for_missing_info(driver, company_data, company_name)
+                if not self._should_stop(company_data, company_name):
+                    self._search_for_missing_info(home_page, browser, company_data, company_name)
         
         except Exception as e:
             logger.error(f"Erro ao buscar site corporativo para {company_name}: {e}")
         
         return company_data
     
-    def _extract_contact_info(self, driver, company_data: Dict[str, Any]) -> None:
+    def _extract_contact_info(self, page: Dict[str, Any], company_data: Dict[str, Any]) -> None:
         """
         Extrai informações de contato de uma página.
         
         Args:
-            driver: Driver Selenium
+            page: Página obtida pelo PageFetcher
             company_data: Dicionário para armazenar os dados extraídos
         """
         try:
             # Extrair todo o texto da página
-            page_text = driver.page_source
+            page_text = page['html']
+            snapshot = page['snapshot']
             
             # Extrair emails
             if 'email' not in company_data:
@@ -273,184 +297,158 @@ class CompanySiteScraper(BaseScraper):
             # Extrair endereço
             if 'address' not in company_data:
                 # Procurar por elementos que possam conter endereços
-                address_candidates = driver.find_elements(By.XPATH, "//*[contains(text(), 'Endereço') or contains(text(), 'endereço') or contains(text(), 'Localização') or contains(text(), 'localização') or contains(text(), 'Address')]")
+                address_terms = ['Endereço', 'endereço', 'Localização', 'localização', 'Address']
+                address_candidates = snapshot.elements_with_text(address_terms)
                 
                 for candidate in address_candidates:
-                    try:
-                        # Verificar o texto do elemento pai ou próximo irmão
-                        parent = candidate.find_element(By.XPATH, "./..")
-                        address_text = parent.text
+                    # Verificar o texto do elemento pai
+                    parent = candidate.getparent()
+                    address_text = snapshot.element_text(parent if parent is not None else candidate)
+                    
+                    # Se o texto parece um endereço (contém número, CEP, etc.)
+                    if re.search(r'\d+.*(?:CEP|cep).*\d+', address_text) or re.search(r'\d+.*(?:Bairro|bairro)', address_text):
+                        company_data['address'] = address_text
                         
-                        # Se o texto parece um endereço (contém número, CEP, etc.)
-                        if re.search(r'\d+.*(?:CEP|cep).*\d+', address_text) or re.search(r'\d+.*(?:Bairro|bairro)', address_text):
-                            company_data['address'] = address_text
-                            
-                            # Tentar extrair cidade e estado
-                            city_state_match = re.search(r'([A-Za-zÀ-ÿ\s]+)\s*[-,]\s*([A-Z]{2})', address_text)
-                            if city_state_match:
-                                company_data['city'] = city_state_match.group(1).strip()
-                                company_data['state'] = city_state_match.group(2).strip()
-                            
-                            break
-                    except (NoSuchElementException, StaleElementReferenceException):
-                        continue
+                        # Tentar extrair cidade e estado
+                        city_state_match = re.search(r'([A-Za-zÀ-ÿ\s]+)\s*[-,]\s*([A-Z]{2})', address_text)
+                        if city_state_match:
+                            company_data['city'] = city_state_match.group(1).strip()
+                            company_data['state'] = city_state_match.group(2).strip()
+                        
+                        break
         
         except Exception as e:
             logger.error(f"Erro ao extrair informações de contato: {e}")
     
-    def _extract_company_info(self, driver, company_data: Dict[str, Any], company_name: str) -> None:
+    def _extract_company_info(self, page: Dict[str, Any], company_data: Dict[str, Any], company_name: str) -> None:
         """
         Extrai informações gerais da empresa.
         
         Args:
-            driver: Driver Selenium
+            page: Página obtida pelo PageFetcher
             company_data: Dicionário para armazenar os dados extraídos
             company_name: Nome da empresa
         """
+        snapshot = page['snapshot']
+        
         try:
             # Extrair nome fantasia
             if 'fantasy_name' not in company_data:
                 # Procurar por elementos que possam conter o nome fantasia
                 for term in self.terms['fantasy_name']:
-                    try:
-                        elements = driver.find_elements(By.XPATH, f"//*[contains(text(), '{term}')]")
-                        for element in elements:
-                            try:
-                                parent = element.find_element(By.XPATH, "./..")
-                                text = parent.text
-                                
-                                # Procurar por padrões como "Nome Fantasia: XYZ"
-                                match = re.search(f"{term}[:\s]+([^\n]+)", text, re.IGNORECASE)
-                                if match:
-                                    company_data['fantasy_name'] = match.group(1).strip()
-                                    break
-                            except (NoSuchElementException, StaleElementReferenceException):
-                                continue
+                    for element in snapshot.elements_with_text([term]):
+                        parent = element.getparent()
+                        text = snapshot.element_text(parent if parent is not None else element)
                         
-                        if 'fantasy_name' in company_data:
+                        # Procurar por padrões como "Nome Fantasia: XYZ"
+                        match = re.search(f"{term}[:\\s]+([^\\n]+)", text, re.IGNORECASE)
+                        if match:
+                            company_data['fantasy_name'] = match.group(1).strip()
                             break
-                    except Exception:
-                        continue
+                    
+                    if 'fantasy_name' in company_data:
+                        break
                 
                 # Se não encontrou, usar o nome da empresa como fallback
                 if 'fantasy_name' not in company_data:
-                    # Tentar encontrar o nome da empresa em destaque na página
-                    try:
-                        # Procurar em h1, h2, logo alt text, etc.
-                        headers = driver.find_elements(By.CSS_SELECTOR, "h1, h2, img[alt*='logo']")
-                        for header in headers:
-                            text = header.text if header.tag_name in ['h1', 'h2'] else header.get_attribute('alt')
-                            if text and company_name.lower() in text.lower():
-                                company_data['fantasy_name'] = text.strip()
-                                break
-                    except Exception:
-                        pass
+                    # Procurar em h1, h2, logo alt text, etc.
+                    for header in snapshot.xpath("//h1 | //h2 | //img[contains(@alt, 'logo')]"):
+                        text = snapshot.element_text(header) if header.tag in ['h1', 'h2'] else header.get('alt')
+                        if text and company_name.lower() in text.lower():
+                            company_data['fantasy_name'] = text.strip()
+                            break
             
             # Extrair tamanho da empresa (número de funcionários)
             if 'size' not in company_data:
                 for term in self.terms['employees']:
-                    try:
-                        elements = driver.find_elements(By.XPATH, f"//*[contains(text(), '{term}')]")
-                        for element in elements:
-                            try:
-                                text = element.text
-                                # Procurar por padrões como "X funcionários" ou "equipe de X pessoas"
-                                size_match = re.search(r'(\d+[\d.]*)\s*(?:' + term + ')', text, re.IGNORECASE)
-                                if size_match:
-                                    company_data['size'] = f"{size_match.group(1)} {term}"
-                                    break
-                            except (StaleElementReferenceException):
-                                continue
-                        
-                        if 'size' in company_data:
+                    for element in snapshot.elements_with_text([term]):
+                        text = snapshot.element_text(element)
+                        # Procurar por padrões como "X funcionários" ou "equipe de X pessoas"
+                        size_match = re.search(r'(\d+[\d.]*)\s*(?:' + term + ')', text, re.IGNORECASE)
+                        if size_match:
+                            company_data['size'] = f"{size_match.group(1)} {term}"
                             break
-                    except Exception:
-                        continue
+                    
+                    if 'size' in company_data:
+                        break
             
             # Extrair CNPJ se ainda não tiver
             if 'cnpj' not in company_data:
                 for term in self.terms['cnpj']:
-                    try:
-                        elements = driver.find_elements(By.XPATH, f"//*[contains(text(), '{term}')]")
-                        for element in elements:
-                            try:
-                                parent = element.find_element(By.XPATH, "./..")
-                                text = parent.text
-                                
-                                # Procurar por CNPJ no formato XX.XXX.XXX/XXXX-XX
-                                cnpj_match = re.search(r'\d{2}\.\d{3}\.\d{3}/\d{4}-\d{2}', text)
-                                if cnpj_match:
-                                    company_data['cnpj'] = cnpj_match.group(0)
-                                    break
-                            except (NoSuchElementException, StaleElementReferenceException):
-                                continue
+                    for element in snapshot.elements_with_text([term]):
+                        parent = element.getparent()
+                        text = snapshot.element_text(parent if parent is not None else element)
                         
-                        if 'cnpj' in company_data:
+                        # Procurar por CNPJ no formato XX.XXX.XXX/XXXX-XX
+                        cnpj_match = re.search(r'\d{2}\.\d{3}\.\d{3}/\d{4}-\d{2}', text)
+                        if cnpj_match:
+                            company_data['cnpj'] = cnpj_match.group(0)
                             break
-                    except Exception:
-                        continue
+                    
+                    if 'cnpj' in company_data:
+                        break
         
         except Exception as e:
             logger.error(f"Erro ao extrair informações da empresa: {e}")
     
-    def _find_and_navigate_about_page(self, driver, company_data: Dict[str, Any], company_name: str) -> None:
+    def _find_and_navigate_about_page(self, page: Dict[str, Any], browser: BrowserSession,
+                                      company_data: Dict[str, Any], company_name: str) -> None:
         """
         Encontra e navega para a página "Sobre" ou "Quem Somos".
         
         Args:
-            driver: Driver Selenium
+            page: Página onde os links são procurados
+            browser: Sessão de navegador para fallback
             company_data: Dicionário para armazenar os dados extraídos
             company_name: Nome da empresa
         """
         try:
             # Lista de termos para procurar links de "Sobre"
             about_terms = ['sobre', 'about', 'quem somos', 'who we are', 'a empresa', 'the company', 'institucional']
+            anchors = page['snapshot'].links()
             
             # Procurar links que contenham esses termos
             for term in about_terms:
-                try:
-                    links = driver.find_elements(By.XPATH, f"//a[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '{term}')]")
-                    
-                    if not links:
-                        # Tentar encontrar por href
-                        links = driver.find_elements(By.XPATH, f"//a[contains(@href, '{term}')]")
-                    
-                    if links:
-                        for link in links:
-                            try:
-                                href = link.get_attribute('href')
-                                if href:
-                                    logger.info(f"Navegando para página 'Sobre': {href}")
-                                    driver.get(href)
-                                    time.sleep(settings.NAVIGATION_DELAY)
-                                    
-                                    # Extrair informações
-                                    self._extract_contact_info(driver, company_data)
-                                    self._extract_company_info(driver, company_data, company_name)
-                                    
-                                    # Se encontrou informações suficientes, parar
-                                    if self._has_sufficient_info(company_data):
-                                        return
-                            except Exception:
-                                continue
-                except Exception:
-                    continue
+                links = [href for text, href in anchors if term in text.lower()]
+                
+                if not links:
+                    # Tentar encontrar por href
+                    links = [href for text, href in anchors if term in href]
+                
+                for href in links:
+                    try:
+                        logger.info(f"Navegando para página 'Sobre': {href}")
+                        
+                        about_page = self.page_fetcher.fetch(href, browser, label=f"{self.name}:about")
+                        if not about_page:
+                            continue
+                        
+                        # Extrair informações
+                        self._extract_contact_info(about_page, company_data)
+                        self._extract_company_info(about_page, company_data, company_name)
+                        
+                        # Se encontrou informações suficientes, parar
+                        if self._should_stop(company_data, company_name):
+                            return
+                    except Exception:
+                        continue
         
         except Exception as e:
             logger.error(f"Erro ao procurar página 'Sobre': {e}")
     
-    def _search_for_missing_info(self, driver, company_data: Dict[str, Any], company_name: str) -> None:
+    def _search_for_missing_info(self, page: Dict[str, Any], browser: BrowserSession,
+                                 company_data: Dict[str, Any], company_name: str) -> None:
         """
         Busca informações específicas que ainda estão faltando.
         
         Args:
-            driver: Driver Selenium
+            page: Página inicial do site
+            browser: Sessão de navegador (necessária para usar a busca interna do site)
             company_data: Dicionário para armazenar os dados extraídos
             company_name: Nome da empresa
         """
         try:
-            current_url = driver.current_url
-            base_url = '/'.join(current_url.split('/')[:3])  # http(s)://domain.com
+            base_url = '/'.join(page['url'].split('/')[:3])  # http(s)://domain.com
             
             # Lista de informações faltantes e termos de busca
             missing_info = []
@@ -464,51 +462,67 @@ class CompanySiteScraper(BaseScraper):
             if 'cnpj' not in company_data:
                 missing_info.append(('cnpj', 'cnpj'))
             
-            # Buscar cada informação faltante
-            for info_key, search_term in missing_info:
-                try:
-                    # Tentar usar a busca interna do site
-                    search_elements = driver.find_elements(By.XPATH, "//input[@type='search' or contains(@class, 'search') or @placeholder='Buscar' or @placeholder='Search']")
+            # A busca interna exige navegador: só abri-lo se o site tiver campo de busca
+            search_xpath = "//input[@type='search' or contains(@class, 'search') or @placeholder='Buscar' or @placeholder='Search']"
+            if missing_info and page['snapshot'].has_element(search_xpath):
+                driver = browser.get_driver()
+                
+                if driver and not driver.current_url.startswith(base_url):
+                    driver.get(page['url'])
+                    self.page_waiter.wait_for_page(driver, label=f"{self.name}:home")
+                
+                # Buscar cada informação faltante
+                for info_key, search_term in missing_info:
+                    if not driver or self._should_stop(company_data, company_name):
+                        break
                     
-                    if search_elements:
-                        search_input = search_elements[0]
-                        search_input.clear()
-                        search_input.send_keys(search_term)
-                        search_input.send_keys(Keys.RETURN)
-                        time.sleep(settings.NAVIGATION_DELAY)
-                        
-                        # Extrair informações da página de resultados
-                        self._extract_contact_info(driver, company_data)
-                        self._extract_company_info(driver, company_data, company_name)
+                    try:
+                        # Tentar usar a busca interna do site
+                        search_elements = driver.find_elements(By.XPATH, search_xpath)
                         
-                        # Voltar para a página anterior
-                        driver.back()
-                        time.sleep(settings.NAVIGATION_DELAY)
-                except Exception:
-                    pass
+                        if search_elements:
+                            search_input = search_elements[0]
+                            search_input.clear()
+                            search_input.send_keys(search_term)
+                            previous_url = driver.current_url
+                            search_input.send_keys(Keys.RETURN)
+                            self.page_waiter.wait_for_url_change(driver, previous_url, label=f"{self.name}:site_search")
+                            
+                            # Extrair informações da página de resultados
+                            snapshot = PageSnapshot.from_driver(driver)
+                            results_page = {'url': snapshot.url, 'html': snapshot.html, 'snapshot': snapshot, 'via': 'browser'}
+                            self._extract_contact_info(results_page, company_data)
+                            self._extract_company_info(results_page, company_data, company_name)
+                            
+                            # Voltar para a página anterior
+                            driver.back()
+                            self.page_waiter.wait_for_page(driver, label=f"{self.name}:back")
+                    except Exception:
+                        pass
             
             # Se ainda faltam informações, tentar buscar em páginas específicas
-            if not self._has_sufficient_info(company_data):
+            if not self._should_stop(company_data, company_name):
                 specific_pages = [
                     '/legal', '/juridico', '/termos', '/terms', 
                     '/privacidade', '/privacy', '/politica-de-privacidade',
                     '/dados-da-empresa', '/company-data'
                 ]
                 
-                for page in specific_pages:
+                for specific_page in specific_pages:
                     try:
-                        page_url = urljoin(base_url, page)
+                        page_url = urljoin(base_url, specific_page)
                         logger.info(f"Verificando página específica: {page_url}")
                         
-                        driver.get(page_url)
-                        time.sleep(settings.NAVIGATION_DELAY)
+                        specific = self.page_fetcher.fetch(page_url, browser, label=f"{self.name}:specific")
+                        if not specific:
+                            continue
                         
                         # Extrair informações
-                        self._extract_contact_info(driver, company_data)
-                        self._extract_company_info(driver, company_data, company_name)
+                        self._extract_contact_info(specific, company_data)
+                        self._extract_company_info(specific, company_data, company_name)
                         
                         # Se encontrou informações suficientes, parar
-                        if self._has_sufficient_info(company_data):
+                        if self._should_stop(company_data, company_name):
                             break
                     except Exception:
                         continue
@@ -577,51 +591,58 @@ class CompanySiteScraper(BaseScraper):
         except:
             return url
     
-    def _guess_domain(self, company_name: str) -> str:
+    def _guess_domain(self, company_name: str) -> Optional[str]:
         """
         Tenta adivinhar o domínio da empresa com base no nome.
         
+        Os candidatos são verificados em lote via DNS (com cache), para que
+        apenas domínios existentes cheguem a ser visitados.
+        
         Args:
             company_name: Nome da empresa
             
         Returns:
-            Domínio adivinhado ou None
+            Primeiro domínio candidato existente ou None
         """
-        # Simplificar o nome da empresa
-        simplified = company_name.lower()
-        
-        # Remover termos comuns
-        for term in ['s.a.', 's/a', 'sa', 'ltda', 'eireli', 'mei', 'me', 'epp', 'corporation', 'inc', 'corp']:
-            simplified = simplified.replace(term, '')
-        
-        # Remover pontuação e espaços
-        simplified = re.sub(r'[^\w\s]', '', simplified)
-        simplified = simplified.strip()
-        
-        # Substituir espaços por vazio
-        simplified = simplified.replace(' ', '')
-        
-        # Tentar domínios comuns
-        domains = [
-            f"{simplified}.com.br",
-            f"{simplified}.com",
-            f"{simplified}.net.br",
-            f"{simplified}.net",
-            f"{simplified}.org.br",
-            f"{simplified}.org"
-        ]
+        candidates = self._guess_domains(company_name)
+        if not candidates:
+            return None
         
-        # Se o nome for composto, tentar variações com hífen
-        if ' ' in company_name:
-            hyphenated = company_name.lower().replace(' ', '-')
-            hyphenated = re.sub(r'[^\w\-]', '', hyphenated)
-            
-            domains.extend([
-                f"{hyphenated}.com.br",
-                f"{hyphenated}.com"
-            ])
+        if not settings.DOMAIN_RESOLVER_ENABLED:
+            return candidates[0]
         
-        return domains[0] if domains else None
+        domain = get_domain_resolver().first_live(candidates)
+        if not domain:
+            logger.info(f"Nenhum domínio candidato existe para {company_name}: {candidates}")
+        return domain
+    
+    def _guess_domains(self, company_name: str) -> List[str]:
+        """
+        Gera domínios candidatos para a empresa, do mais ao menos provável.
+        
+        Args:
+            company_name: Nome da empresa
+            
+        Returns:
+            Domínios candidatos (.com.br e .com primeiro, depois variações com
+            hífen e os demais sufixos)
+        """
+        # Sem acentos, pontuação e sufixos societários (S.A., LTDA, ME...)
+        words = normalize_company_name(company_name).lower().split()
+        if not words:
+            return []
+        
+        names = [''.join(words)]
+        if len(words) > 1:
+            names.append('-'.join(words))
+        
+        domains = []
+        for suffixes in (['.com.br', '.com'], ['.net.br', '.net', '.org.br', '.org']):
+            for name in names:
+                domains.extend(f"{name}{suffix}" for suffix in suffixes)
+        
+        # Rótulos DNS têm no máximo 63 caracteres
+        return [domain for domain in domains if len(domain.split('.')[0]) <= 63]
     
     def _is_generic_email(self, email: str) -> bool:
         """
@@ -655,6 +676,26 @@ class CompanySiteScraper(BaseScraper):
         
         return False
     
+    def _should_stop(self, company_data: Dict[str, Any], company_name: str) -> bool:
+        """
+        Verifica se a coleta do site pode parar.
+        
+        Durante uma execução do controlador, decide o orçamento da empresa
+        (score de qualidade somando as demais fontes, páginas e tempo);
+        fora dele, vale o critério de campos importantes preenchidos.
+        
+        Args:
+            company_data: Dados coletados
+            company_name: Nome da empresa
+            
+        Returns:
+            True se a coleta deve parar, False caso contrário
+        """
+        stop = should_stop_enrichment(dict(company_data, name=company_name), self.name)
+        if stop is None:
+            return self._has_sufficient_info(company_data)
+        return stop
+    
     def _has_sufficient_info(self, company_data: Dict[str, Any]) -> bool:
         """
         Verifica se já foram coletadas informações suficientes.
@@ -4,7 +4,6 @@ Responsável por extrair informações de perfis de empresas no LinkedIn.
 """
 
 import logging
-import time
 import re
 import json
 from typing import Dict, Any, List, Optional
@@ -97,16 +96,18 @@ class LinkedInScraper(BaseScraper):
         logger.info(f"Busca no LinkedIn encontrou {len(results)} resultados")
         return results
     
-    def collect(self, company_name: str) -> Dict[str, Any]:
+    def collect(self, target: Dict[str, Any], fields: List[str] = None) -> Dict[str, Any]:
         """
         Coleta dados detalhados de uma empresa específica no LinkedIn.
         
         Args:
-            company_name: Nome da empresa
+            target: Dicionário com dados da empresa (ou o nome da empresa)
+            fields: Lista de campos a serem coletados (opcional)
             
         Returns:
             Dados coletados
         """
+        company_name = target.get('name', '') if isinstance(target, dict) else target
         logger.info(f"Coletando dados do LinkedIn para: {company_name}")
         
         try:
@@ -140,7 +141,7 @@ class LinkedInScraper(BaseScraper):
             
             # Navegar para a página de login
             driver.get("https://www.linkedin.com/login")
-            time.sleep(settings.NAVIGATION_DELAY)
+            self.page_waiter.wait_for_page(driver, label=f"{self.name}:login")
             
             # Verificar se já está logado
             if "feed" in driver.current_url:
@@ -161,10 +162,11 @@ class LinkedInScraper(BaseScraper):
             
             # Clicar no botão de login
             login_button = driver.find_element(By.XPATH, "//button[@type='submit']")
+            login_url = driver.current_url
             login_button.click()
             
             # Aguardar redirecionamento
-            time.sleep(settings.NAVIGATION_DELAY * 2)
+            self.page_waiter.wait_for_url_change(driver, login_url, label=f"{self.name}:login_redirect")
             
             # Verificar se o login foi bem-sucedido
             if "feed" in driver.current_url or "checkpoint" in driver.current_url:
@@ -202,7 +204,7 @@ class LinkedInScraper(BaseScraper):
             logger.info(f"Perfil do LinkedIn encontrado para {company_name}: {company_url}")
             
             # Extrair informações do perfil
-            with SeleniumManager() as driver:
+            with SeleniumManager(tenant=self.name) as driver:
                 if not driver:
                     logger.error("Falha ao inicializar o driver Selenium")
                     return company_data
@@ -213,7 +215,7 @@ class LinkedInScraper(BaseScraper):
                 # Navegar para o perfil da empresa
                 logger.info(f"Navegando para: {company_url}")
                 driver.get(company_url)
-                time.sleep(settings.NAVIGATION_DELAY)
+                self.page_waiter.wait_for_page(driver, label=f"{self.name}:profile", selector="h1")
                 
                 # Extrair informações básicas
                 company_data.update(self._extract_basic_info(driver))
@@ -250,7 +252,7 @@ class LinkedInScraper(BaseScraper):
         """
         try:
             # Método 1: Buscar diretamente no LinkedIn
-            with SeleniumManager() as driver:
+            with SeleniumManager(tenant=self.name) as driver:
                 if not driver:
                     logger.error("Falha ao inicializar o driver Selenium")
                     return None
@@ -264,7 +266,7 @@ class LinkedInScraper(BaseScraper):
                 
                 logger.info(f"Buscando empresa no LinkedIn: {url}")
                 driver.get(url)
-                time.sleep(settings.NAVIGATION_DELAY)
+                self.page_waiter.wait_for_page(driver, label=f"{self.name}:search")
                 
                 # Procurar resultados
                 try:
@@ -423,7 +425,7 @@ class LinkedInScraper(BaseScraper):
                         logger.info(f"Navegando para página 'Sobre': {about_url}")
                         
                         driver.get(about_url)
-                        time.sleep(settings.NAVIGATION_DELAY)
+                        self.page_waiter.wait_for_page(driver, label=f"{self.name}:about")
                         
                         # Tentar extrair informações novamente
                         if not info.get('phone'):
@@ -578,7 +580,7 @@ class LinkedInScraper(BaseScraper):
         companies = []
         
         try:
-            with SeleniumManager() as driver:
+            with SeleniumManager(tenant=self.name) as driver:
                 if not driver:
                     logger.error("Falha ao inicializar o driver Selenium")
                     return companies
@@ -592,7 +594,7 @@ class LinkedInScraper(BaseScraper):
                 
                 logger.info(f"Buscando empresas no LinkedIn: {url}")
                 driver.get(url)
-                time.sleep(settings.NAVIGATION_DELAY)
+                self.page_waiter.wait_for_page(driver, label=f"{self.name}:search", network_idle=True)
                 
                 # Procurar resultados
                 company_elements = driver.find_elements(By.XPATH, "//span[contains(@class, 'entity-result__title-text')]")
@@ -612,7 +614,7 @@ class LinkedInScraper(BaseScraper):
                 if len(companies) < max_results:
                     for _ in range(3):  # Tentar rolar até 3 vezes
                         driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                        time.sleep(settings.SCROLL_PAUSE_TIME)
+                        self.page_waiter.wait_for_network_idle(driver, label=f"{self.name}:scroll")
                         
                         # Procurar mais resultados
                         company_elements = driver.find_elements(By.XPATH, "//span[contains(@class, 'entity-result__title-text')]")
@@ -2,11 +2,15 @@
 Cliente para interação com a API de IA local.
 """
 
+import asyncio
 import logging
-import requests
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+
+import aiohttp
 
 from config import settings
+from utils.async_http import get_async_http_client, run_async
+from utils.http_session import get_http_session
 
 logger = logging.getLogger(__name__)
 
@@ -42,16 +46,10 @@ class AIClient:
         """
         logger.info(f"Enviando prompt para IA: {prompt[:50]}...")
         
-        data = {
-            "model": self.model,
-            "prompt": prompt,
-            "stream": stream
-        }
-        
         try:
-            response = requests.post(
+            response = get_http_session().post(
                 self.api_url,
-                json=data,
+                json=self._build_payload(prompt, stream),
                 headers=self.headers,
                 timeout=settings.REQUEST_TIMEOUT
             )
@@ -62,6 +60,64 @@ class AIClient:
             logger.error(f"Erro na consulta à IA: {e}")
             return {"error": str(e), "response": ""}
     
+    async def agenerate(self, prompt: str) -> Dict[str, Any]:
+        """
+        Gera texto com base em um prompt sem bloquear o event loop.
+        
+        Usa o cliente HTTP assíncrono compartilhado (keep-alive e limite de
+        requisições simultâneas por host). O cancelamento da tarefa é propagado.
+        
+        Args:
+            prompt: Prompt para geração de texto
+            
+        Returns:
+            Resposta da IA
+        """
+        logger.info(f"Enviando prompt para IA: {prompt[:50]}...")
+        
+        try:
+            return await get_async_http_client().post(
+                self.api_url,
+                json=self._build_payload(prompt, stream=False),
+                headers=self.headers
+            )
+            
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logger.error(f"Erro na consulta à IA: {e}")
+            return {"error": str(e) or type(e).__name__, "response": ""}
+    
+    async def agenerate_many(self, prompts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Envia vários prompts simultaneamente.
+        
+        Args:
+            prompts: Prompts para geração de texto
+            
+        Returns:
+            Respostas da IA, na mesma ordem dos prompts
+        """
+        return await asyncio.gather(*(self.agenerate(prompt) for prompt in prompts))
+    
+    def generate_many(self, prompts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Versão síncrona de agenerate_many, para uso fora de um event loop.
+        
+        Args:
+            prompts: Prompts para geração de texto
+            
+        Returns:
+            Respostas da IA, na mesma ordem dos prompts
+        """
+        return run_async(self.agenerate_many(prompts))
+    
+    def _build_payload(self, prompt: str, stream: bool) -> Dict[str, Any]:
+        """Monta o corpo da requisição de geração."""
+        return {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": stream
+        }
+    
     def enrich_company_data(self, company_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Enriquece dados de uma empresa usando IA.
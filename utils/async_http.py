@@ -0,0 +1,163 @@
+"""
+Cliente HTTP assíncrono compartilhado.
+Mantém um pool de conexões com keep-alive por event loop e limita o número
+de requisições simultâneas por host, permitindo manter centenas de buscas e
+consultas à IA em andamento ao mesmo tempo.
+"""
+
+import asyncio
+import logging
+import threading
+import weakref
+from typing import Any, Awaitable, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Um cliente por event loop (sessões aiohttp não podem ser compartilhadas entre loops)
+_clients = weakref.WeakKeyDictionary()
+_clients_lock = threading.Lock()
+
+
+class AsyncHttpClient:
+    """
+    Cliente HTTP assíncrono com pool de conexões e limite de concorrência por host.
+
+    Requisições aguardando vaga no limite do host não consomem o tempo
+    limite; o cancelamento da tarefa interrompe a requisição e libera a vaga.
+    """
+
+    def __init__(self, pool_size: Optional[int] = None, per_host_limit: Optional[int] = None,
+                 timeout: Optional[float] = None):
+        """
+        Inicializa o cliente.
+
+        Args:
+            pool_size: Número máximo de conexões abertas no total
+            per_host_limit: Número máximo de requisições simultâneas por host
+            timeout: Tempo limite de cada requisição (segundos)
+        """
+        self.pool_size = pool_size or settings.ASYNC_HTTP_POOL_SIZE
+        self.per_host_limit = per_host_limit or settings.ASYNC_HTTP_PER_HOST_LIMIT
+        self.timeout = timeout or settings.REQUEST_TIMEOUT
+
+        self._session = None
+        self._host_semaphores = {}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Obtém a sessão, criando-a no event loop atual na primeira chamada."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                limit_per_host=self.per_host_limit,
+                keepalive_timeout=30
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={'User-Agent': settings.USER_AGENT}
+            )
+        return self._session
+
+    def _get_host_semaphore(self, url: str) -> asyncio.Semaphore:
+        """Obtém o semáforo que limita as requisições simultâneas ao host da URL."""
+        host = urlparse(url).netloc.lower()
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_host_limit)
+            self._host_semaphores[host] = semaphore
+        return semaphore
+
+    async def request(self, method: str, url: str, response_type: str = "json", **kwargs) -> Any:
+        """
+        Realiza uma requisição HTTP.
+
+        Args:
+            method: Método HTTP (GET, POST...)
+            url: URL da requisição
+            response_type: 'json' para decodificar o corpo como JSON, 'text' para texto
+            **kwargs: Parâmetros repassados ao aiohttp (params, json, headers...)
+
+        Returns:
+            Corpo da resposta decodificado
+
+        Raises:
+            aiohttp.ClientError: Em falhas de conexão ou status HTTP de erro
+            asyncio.TimeoutError: Se o tempo limite for excedido
+        """
+        async with self._get_host_semaphore(url):
+            session = self._get_session()
+            async with session.request(method, url, raise_for_status=True, **kwargs) as response:
+                if response_type == "json":
+                    return await response.json(content_type=None)
+                return await response.text()
+
+    async def get(self, url: str, response_type: str = "json", **kwargs) -> Any:
+        """Realiza uma requisição GET (ver request)."""
+        return await self.request("GET", url, response_type=response_type, **kwargs)
+
+    async def post(self, url: str, response_type: str = "json", **kwargs) -> Any:
+        """Realiza uma requisição POST (ver request)."""
+        return await self.request("POST", url, response_type=response_type, **kwargs)
+
+    async def close(self) -> None:
+        """Fecha a sessão e as conexões abertas."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._host_semaphores.clear()
+
+
+def get_async_http_client() -> AsyncHttpClient:
+    """
+    Obtém o cliente HTTP assíncrono compartilhado do event loop atual.
+
+    Returns:
+        Cliente HTTP assíncrono
+
+    Raises:
+        RuntimeError: Se chamado fora de um event loop em execução
+    """
+    loop = asyncio.get_running_loop()
+
+    with _clients_lock:
+        client = _clients.get(loop)
+        if client is None:
+            client = AsyncHttpClient()
+            _clients[loop] = client
+        return client
+
+
+async def close_async_http_client() -> None:
+    """Fecha o cliente HTTP assíncrono do event loop atual, se existir."""
+    loop = asyncio.get_running_loop()
+
+    with _clients_lock:
+        client = _clients.pop(loop, None)
+
+    if client is not None:
+        await client.close()
+
+
+def run_async(coroutine: Awaitable) -> Any:
+    """
+    Executa uma corrotina a partir de código síncrono, fechando as conexões ao final.
+
+    Args:
+        coroutine: Corrotina a executar
+
+    Returns:
+        Resultado da corrotina
+    """
+    async def runner():
+        try:
+            return await coroutine
+        finally:
+            await close_async_http_client()
+
+    return asyncio.run(runner())
+
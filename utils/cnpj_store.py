@@ -0,0 +1,220 @@
+"""
+Armazenamento persistente de registros de CNPJ.
+Guarda os dados cadastrais já coletados em SQLite, chaveados pelo CNPJ
+normalizado (14 dígitos), com controle de atualização.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, Iterable, List, Optional
+
+from config import settings
+from utils.company_identity import normalize_cnpj
+from utils.data_paths import resolve_data_path
+
+logger = logging.getLogger(__name__)
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def dedupe_cnpjs(cnpjs: Iterable[str]) -> List[str]:
+    """
+    Normaliza e remove CNPJs repetidos ou inválidos, preservando a ordem.
+
+    Args:
+        cnpjs: CNPJs (formatados ou não)
+
+    Returns:
+        Lista de CNPJs normalizados únicos
+    """
+    unique = []
+    seen = set()
+    for cnpj in cnpjs:
+        key = normalize_cnpj(cnpj)
+        if key and key not in seen:
+            seen.add(key)
+            unique.append(key)
+    return unique
+
+
+def parse_update_date(value: Optional[str]) -> Optional[float]:
+    """
+    Converte a data de atualização da ReceitaWS (ultima_atualizacao) em timestamp.
+
+    Args:
+        value: Data em formato ISO 8601 (ex.: 2024-03-08T20:19:41.390Z)
+
+    Returns:
+        Timestamp ou None se ausente ou inválida
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+class CNPJStore:
+    """
+    Registros de CNPJ em SQLite, com verificação de atualização.
+
+    Um registro é considerado atual quando os dados da fonte
+    (ultima_atualizacao) têm menos de max_age, ou quando foi coletado há menos
+    de min_refetch_interval (evita consultar de novo uma fonte que ainda
+    não atualizou seus próprios dados).
+    """
+
+    def __init__(self, path: Optional[str] = None, max_age: Optional[float] = None,
+                 min_refetch_interval: Optional[float] = None):
+        """
+        Inicializa o armazenamento.
+
+        Args:
+            path: Caminho do banco SQLite
+            max_age: Idade máxima dos dados da fonte (segundos)
+            min_refetch_interval: Intervalo mínimo entre coletas do mesmo CNPJ (segundos)
+        """
+        self.path = resolve_data_path(path or settings.CNPJ_STORE_PATH)
+        self.max_age = max_age if max_age is not None else settings.CNPJ_STORE_MAX_AGE
+        self.min_refetch_interval = (min_refetch_interval if min_refetch_interval is not None
+                                     else settings.CNPJ_STORE_MIN_REFETCH_INTERVAL)
+
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'stale': 0, 'stored': 0}
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS cnpj_records (
+                cnpj TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                data TEXT NOT NULL,
+                source_updated_at REAL,
+                fetched_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def get(self, cnpj: str) -> Optional[Dict[str, Any]]:
+        """
+        Obtém o registro atual de um CNPJ.
+
+        Args:
+            cnpj: CNPJ (formatado ou não)
+
+        Returns:
+            Dados armazenados ou None se ausente ou desatualizado
+        """
+        return self.get_many([cnpj]).get(normalize_cnpj(cnpj))
+
+    def get_many(self, cnpjs: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Obtém os registros atuais de vários CNPJs em uma única consulta.
+
+        Args:
+            cnpjs: CNPJs (formatados ou não)
+
+        Returns:
+            Dicionário CNPJ normalizado -> dados, apenas para registros atuais
+        """
+        keys = dedupe_cnpjs(cnpjs)
+        if not keys:
+            return {}
+
+        now = time.time()
+        records = {}
+
+        with self._lock:
+            # Consultar em blocos para respeitar o limite de parâmetros do SQLite
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT cnpj, data, source_updated_at, fetched_at FROM cnpj_records WHERE cnpj IN ({placeholders})",
+                    chunk
+                ).fetchall()
+
+                for cnpj, data, source_updated_at, fetched_at in rows:
+                    if self._is_fresh(source_updated_at, fetched_at, now):
+                        records[cnpj] = json.loads(data)
+                    else:
+                        self._counters['stale'] += 1
+
+            self._counters['hits'] += len(records)
+            self._counters['misses'] += len(keys) - len(records)
+
+        return records
+
+    def put(self, cnpj: str, data: Dict[str, Any], source: str) -> None:
+        """
+        Armazena (ou substitui) o registro de um CNPJ.
+
+        Args:
+            cnpj: CNPJ (formatado ou não)
+            data: Dados coletados
+            source: Fonte dos dados (ex.: 'receitaws', 'cnpjbiz')
+        """
+        key = normalize_cnpj(cnpj)
+        if not key:
+            return
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cnpj_records (cnpj, source, data, source_updated_at, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, source, json.dumps(data, ensure_ascii=False),
+                 parse_update_date(data.get('last_update')), time.time())
+            )
+            self._conn.commit()
+            self._counters['stored'] += 1
+
+    def _is_fresh(self, source_updated_at: Optional[float], fetched_at: float, now: float) -> bool:
+        """Verifica se um registro ainda pode ser usado sem nova coleta."""
+        if now - fetched_at <= self.min_refetch_interval:
+            return True
+        reference = source_updated_at if source_updated_at is not None else fetched_at
+        return now - reference <= self.max_age
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Obtém os contadores de uso do armazenamento.
+
+        Returns:
+            Dicionário com acertos, falhas, registros desatualizados e gravações
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats['entries'] = self._conn.execute("SELECT COUNT(*) FROM cnpj_records").fetchone()[0]
+        return stats
+
+    def close(self) -> None:
+        """Fecha a conexão com o banco."""
+        with self._lock:
+            self._conn.close()
+
+
+def get_cnpj_store() -> CNPJStore:
+    """
+    Obtém o armazenamento de CNPJs compartilhado do processo.
+
+    Returns:
+        Armazenamento de CNPJs
+    """
+    global _store
+
+    with _store_lock:
+        if _store is None:
+            _store = CNPJStore()
+        return _store
+
@@ -0,0 +1,106 @@
+"""
+Normalização das chaves de identificação de empresas.
+CNPJ, domínio e nome normalizados usados para reconhecer a mesma empresa
+entre fontes, execuções e armazenamentos (índice de entidades, banco
+acumulado, exportação de diferenças, índice da Receita Federal).
+"""
+
+import unicodedata
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+# Sufixos societários ignorados na comparação de nomes
+LEGAL_SUFFIXES = {'SA', 'S A', 'LTDA', 'ME', 'EPP', 'EIRELI', 'MEI', 'SS', 'S S'}
+
+
+def normalize_cnpj(value: Any) -> Optional[str]:
+    """
+    Normaliza um CNPJ para 14 dígitos.
+
+    Args:
+        value: CNPJ formatado ou não
+
+    Returns:
+        CNPJ com 14 dígitos ou None se inválido
+    """
+    digits = ''.join(filter(str.isdigit, str(value or '')))
+    if not digits or len(digits) > 14:
+        return None
+    return digits.zfill(14)
+
+
+def normalize_domain(value: Any) -> Optional[str]:
+    """
+    Extrai o domínio de uma URL ou domínio, sem "www." e em minúsculas.
+
+    Args:
+        value: URL ou domínio
+
+    Returns:
+        Domínio normalizado ou None se ausente
+    """
+    value = str(value or '').strip().lower()
+    if not value:
+        return None
+    host = urlparse(value if '://' in value else f"//{value}").hostname or ''
+    host = host[4:] if host.startswith('www.') else host
+    return host or None
+
+
+def fold_text(text: str) -> str:
+    """
+    Remove acentos, converte para maiúsculas e normaliza espaços.
+
+    Args:
+        text: Texto original
+
+    Returns:
+        Texto normalizado
+    """
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    without_accents = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    cleaned = ''.join(char if char.isalnum() else ' ' for char in without_accents.upper())
+    return ' '.join(cleaned.split())
+
+
+def normalize_company_name(name: str) -> str:
+    """
+    Normaliza um nome de empresa para comparação (sem acentos, pontuação
+    e sufixos societários como S.A. e LTDA).
+
+    Args:
+        name: Nome da empresa
+
+    Returns:
+        Nome normalizado
+    """
+    normalized = fold_text(name)
+    changed = True
+    while changed and normalized:
+        changed = False
+        for suffix in LEGAL_SUFFIXES:
+            if normalized.endswith(' ' + suffix):
+                normalized = normalized[:-len(suffix) - 1].rstrip()
+                changed = True
+    return normalized
+
+
+def identity_keys(cnpj: Any = None, domain: Any = None, name: Any = None) -> Dict[str, Optional[str]]:
+    """
+    Normaliza as chaves de identificação de uma empresa.
+
+    Args:
+        cnpj: CNPJ (formatado ou não)
+        domain: Domínio ou URL do site
+        name: Nome da empresa
+
+    Returns:
+        Dicionário com 'cnpj', 'domain' e 'name_key' (nome normalizado em
+        minúsculas), com None para as chaves ausentes
+    """
+    name_key = normalize_company_name(str(name or '')).lower()
+    return {
+        'cnpj': normalize_cnpj(cnpj),
+        'domain': normalize_domain(domain),
+        'name_key': name_key or None
+    }
@@ -0,0 +1,227 @@
+"""
+Banco acumulado de empresas.
+Reúne em SQLite as empresas exportadas por todas as execuções, unindo os
+registros da mesma empresa pelo CNPJ, pelo domínio ou pelo nome normalizado,
+com a data da última atualização de cada campo.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Iterable, Iterator, Optional
+
+from config import settings
+from utils.company_identity import identity_keys
+from utils.data_paths import resolve_data_path
+
+logger = logging.getLogger(__name__)
+
+
+def company_keys(record: Dict[str, Any]) -> Dict[str, Optional[str]]:
+    """
+    Extrai as chaves de identificação de uma empresa processada.
+
+    Args:
+        record: Dados processados da empresa (campos de DataProcessor)
+
+    Returns:
+        Dicionário com 'cnpj', 'domain' e 'name_key' (None quando ausentes)
+    """
+    return identity_keys(record.get('CNPJ'), record.get('Domain'), record.get('Company Name (Revised)'))
+
+
+class CompanyStore:
+    """
+    Empresas acumuladas entre execuções, em SQLite.
+
+    Cada empresa recebida é unida ao registro existente com o mesmo CNPJ;
+    sem ele, ao registro com o mesmo domínio e, por último, com o mesmo nome
+    normalizado, desde que as chaves presentes nos dois não sejam
+    diferentes (mesmo nome com CNPJs diferentes são empresas distintas).
+    Campos preenchidos substituem os armazenados e têm a data atualizada;
+    campos vazios mantêm o valor e a data anteriores.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Inicializa o banco.
+
+        Args:
+            path: Caminho do banco SQLite (padrão: settings.COMPANY_STORE_PATH)
+        """
+        self.path = resolve_data_path(path or settings.COMPANY_STORE_PATH)
+
+        self._lock = threading.Lock()
+        self._counters = {'inserted': 0, 'updated': 0}
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS companies (
+                id INTEGER PRIMARY KEY,
+                cnpj TEXT,
+                domain TEXT,
+                name_key TEXT,
+                record TEXT NOT NULL,
+                field_updated_at TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_companies_cnpj ON companies (cnpj) WHERE cnpj IS NOT NULL;
+            CREATE INDEX IF NOT EXISTS idx_companies_domain ON companies (domain);
+            CREATE INDEX IF NOT EXISTS idx_companies_name_key ON companies (name_key);
+        """)
+        self._conn.commit()
+
+    def upsert_many(self, records: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Insere ou atualiza várias empresas em uma única transação.
+
+        Args:
+            records: Dados processados das empresas
+
+        Returns:
+            Dicionário com as quantidades de empresas inseridas e atualizadas
+        """
+        counts = {'inserted': 0, 'updated': 0}
+        now = time.time()
+
+        with self._lock:
+            with self._conn:
+                for record in records:
+                    keys = company_keys(record)
+                    if not any(keys.values()):
+                        continue
+
+                    row = self._match(keys)
+                    if row is None:
+                        self._insert(record, keys, now)
+                        counts['inserted'] += 1
+                    else:
+                        self._update(row, record, keys, now)
+                        counts['updated'] += 1
+
+            for name, count in counts.items():
+                self._counters[name] += count
+
+        return counts
+
+    def find(self, cnpj: Optional[str] = None, domain: Optional[str] = None,
+             name: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Obtém uma empresa pelo CNPJ, domínio ou nome.
+
+        Args:
+            cnpj: CNPJ (formatado ou não)
+            domain: Domínio ou URL do site
+            name: Nome da empresa
+
+        Returns:
+            Dicionário com 'record', 'field_updated_at', 'created_at' e
+            'updated_at', ou None se não encontrada
+        """
+        keys = company_keys({'CNPJ': cnpj, 'Domain': domain, 'Company Name (Revised)': name})
+        with self._lock:
+            row = self._match(keys)
+        if row is None:
+            return None
+        return self._to_company(row)
+
+    def iter_companies(self) -> Iterator[Dict[str, Any]]:
+        """
+        Percorre todas as empresas do banco.
+
+        Yields:
+            Dicionários no formato retornado por find
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, cnpj, domain, name_key, record, field_updated_at, created_at, updated_at "
+                "FROM companies ORDER BY id"
+            ).fetchall()
+        for row in rows:
+            yield self._to_company(row)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Obtém os contadores de gravação do banco.
+
+        Returns:
+            Dicionário com empresas inseridas, atualizadas e total armazenado
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats['entries'] = self._conn.execute("SELECT COUNT(*) FROM companies").fetchone()[0]
+        return stats
+
+    def close(self) -> None:
+        """Fecha a conexão com o banco."""
+        with self._lock:
+            self._conn.close()
+
+    def _match(self, keys: Dict[str, Optional[str]]) -> Optional[tuple]:
+        """Localiza o registro da empresa pela chave mais forte disponível."""
+        columns = "id, cnpj, domain, name_key, record, field_updated_at, created_at, updated_at"
+
+        if keys['cnpj']:
+            row = self._conn.execute(f"SELECT {columns} FROM companies WHERE cnpj = ?", (keys['cnpj'],)).fetchone()
+            if row:
+                return row
+
+        for key in ('domain', 'name_key'):
+            if not keys[key]:
+                continue
+            rows = self._conn.execute(
+                f"SELECT {columns} FROM companies WHERE {key} = ? ORDER BY updated_at DESC", (keys[key],)
+            ).fetchall()
+            for row in rows:
+                # Não unir empresas cujas chaves fortes divergem
+                if keys['cnpj'] and row[1]:
+                    continue
+                if keys['domain'] and row[2] and row[2] != keys['domain']:
+                    continue
+                return row
+
+        return None
+
+    def _insert(self, record: Dict[str, Any], keys: Dict[str, Optional[str]], now: float) -> None:
+        """Grava uma empresa nova."""
+        field_updated_at = {field: now for field, value in record.items() if value not in (None, '')}
+        self._conn.execute(
+            "INSERT INTO companies (cnpj, domain, name_key, record, field_updated_at, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (keys['cnpj'], keys['domain'], keys['name_key'],
+             json.dumps(record, ensure_ascii=False, default=str), json.dumps(field_updated_at), now, now)
+        )
+
+    def _update(self, row: tuple, record: Dict[str, Any], keys: Dict[str, Optional[str]], now: float) -> None:
+        """Une os campos preenchidos de uma empresa ao registro existente."""
+        stored = json.loads(row[4])
+        field_updated_at = json.loads(row[5])
+        for field, value in record.items():
+            if value not in (None, ''):
+                stored[field] = value
+                field_updated_at[field] = now
+            else:
+                stored.setdefault(field, value)
+
+        self._conn.execute(
+            "UPDATE companies SET cnpj = ?, domain = ?, name_key = ?, record = ?, field_updated_at = ?, "
+            "updated_at = ? WHERE id = ?",
+            (keys['cnpj'] or row[1], keys['domain'] or row[2], keys['name_key'] or row[3],
+             json.dumps(stored, ensure_ascii=False, default=str), json.dumps(field_updated_at), now, row[0])
+        )
+
+    @staticmethod
+    def _to_company(row: tuple) -> Dict[str, Any]:
+        """Converte uma linha da tabela no dicionário da empresa."""
+        return {
+            'record': json.loads(row[4]),
+            'field_updated_at': json.loads(row[5]),
+            'created_at': row[6],
+            'updated_at': row[7]
+        }
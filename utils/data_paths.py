@@ -0,0 +1,25 @@
+"""
+Caminhos de dados do projeto.
+Os caminhos relativos das configurações (caches, bancos, diários e filas)
+partem da raiz do projeto, e não do diretório de trabalho.
+"""
+
+import os
+
+# Diretório raiz do projeto (caminhos relativos das configurações partem daqui)
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def resolve_data_path(path: str) -> str:
+    """
+    Resolve um caminho de dados relativo à raiz do projeto.
+
+    Args:
+        path: Caminho absoluto ou relativo à raiz do projeto
+
+    Returns:
+        Caminho absoluto
+    """
+    if os.path.isabs(path):
+        return path
+    return os.path.join(PROJECT_ROOT, path)
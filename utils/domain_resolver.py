@@ -0,0 +1,205 @@
+"""
+Resolução de domínios candidatos com cache.
+Verifica em lote, via DNS, quais domínios adivinhados para uma empresa
+existem antes de qualquer carregamento de página, guardando em SQLite as
+respostas positivas e negativas (com validades diferentes).
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+from config import settings
+from utils.async_http import run_async
+from utils.data_paths import resolve_data_path
+
+logger = logging.getLogger(__name__)
+
+_resolver = None
+_resolver_lock = threading.Lock()
+
+
+class DomainResolver:
+    """
+    Resolvedor de domínios em lote com cache persistente.
+
+    Um domínio é considerado existente se ele ou sua variante com "www."
+    tiver endereço. Falhas definitivas (NXDOMAIN, sem endereço) entram no
+    cache negativo; tempos esgotados e erros temporários não são guardados.
+    """
+
+    def __init__(self, path: Optional[str] = None, positive_ttl: Optional[float] = None,
+                 negative_ttl: Optional[float] = None, timeout: Optional[float] = None,
+                 concurrency: Optional[int] = None):
+        """
+        Inicializa o resolvedor.
+
+        Args:
+            path: Caminho do banco SQLite do cache
+            positive_ttl: Validade das respostas positivas (segundos)
+            negative_ttl: Validade das respostas negativas (segundos)
+            timeout: Tempo limite de cada consulta (segundos)
+            concurrency: Consultas simultâneas em um lote
+        """
+        self.path = resolve_data_path(path or settings.DOMAIN_RESOLVER_CACHE_PATH)
+        self.positive_ttl = positive_ttl if positive_ttl is not None else settings.DOMAIN_RESOLVER_POSITIVE_TTL
+        self.negative_ttl = negative_ttl if negative_ttl is not None else settings.DOMAIN_RESOLVER_NEGATIVE_TTL
+        self.timeout = timeout or settings.DOMAIN_RESOLVER_TIMEOUT
+        self.concurrency = concurrency or settings.DOMAIN_RESOLVER_CONCURRENCY
+
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'lookups': 0, 'live': 0, 'dead': 0, 'errors': 0}
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS domain_cache (
+                domain TEXT PRIMARY KEY,
+                live INTEGER NOT NULL,
+                checked_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def resolve_many(self, domains: List[str]) -> Dict[str, bool]:
+        """
+        Verifica quais domínios existem, consultando o DNS apenas para os ausentes do cache.
+
+        Args:
+            domains: Domínios a verificar
+
+        Returns:
+            Dicionário domínio -> existe (domínios com erro temporário ficam como False)
+        """
+        domains = list(dict.fromkeys(domain.lower() for domain in domains if domain))
+        answers = self._get_cached(domains)
+
+        pending = [domain for domain in domains if domain not in answers]
+        if pending:
+            resolved = run_async(self._resolve_batch(pending))
+            self._store(resolved)
+            answers.update({domain: bool(live) for domain, live in resolved.items()})
+
+        return {domain: answers.get(domain, False) for domain in domains}
+
+    def first_live(self, candidates: List[str]) -> Optional[str]:
+        """
+        Obtém o primeiro candidato existente, na ordem de preferência.
+
+        Args:
+            candidates: Domínios candidatos, do mais ao menos provável
+
+        Returns:
+            Domínio existente ou None se nenhum resolver
+        """
+        answers = self.resolve_many(candidates)
+        for candidate in candidates:
+            if answers.get(candidate.lower()):
+                return candidate.lower()
+        return None
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Obtém os contadores do resolvedor.
+
+        Returns:
+            Dicionário com acertos de cache, consultas ao DNS, domínios
+            existentes, inexistentes e erros temporários
+        """
+        with self._lock:
+            return dict(self._counters)
+
+    def _get_cached(self, domains: List[str]) -> Dict[str, bool]:
+        """Obtém as respostas válidas do cache."""
+        if not domains:
+            return {}
+
+        now = time.time()
+        placeholders = ','.join('?' * len(domains))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT domain, live, checked_at FROM domain_cache WHERE domain IN ({placeholders})", domains
+            ).fetchall()
+
+            answers = {}
+            for domain, live, checked_at in rows:
+                ttl = self.positive_ttl if live else self.negative_ttl
+                if now - checked_at <= ttl:
+                    answers[domain] = bool(live)
+            self._counters['hits'] += len(answers)
+        return answers
+
+    def _store(self, resolved: Dict[str, Optional[bool]]) -> None:
+        """Guarda as respostas definitivas no cache."""
+        now = time.time()
+        rows = [(domain, int(live), now) for domain, live in resolved.items() if live is not None]
+
+        with self._lock:
+            self._counters['lookups'] += len(resolved)
+            self._counters['live'] += sum(1 for live in resolved.values() if live)
+            self._counters['dead'] += sum(1 for live in resolved.values() if live is False)
+            self._counters['errors'] += sum(1 for live in resolved.values() if live is None)
+            if rows:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO domain_cache (domain, live, checked_at) VALUES (?, ?, ?)", rows
+                )
+                self._conn.commit()
+
+    async def _resolve_batch(self, domains: List[str]) -> Dict[str, Optional[bool]]:
+        """Resolve um lote de domínios em paralelo."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def resolve(domain):
+            async with semaphore:
+                live = await self._resolve_host(domain)
+                if live is False and not domain.startswith('www.'):
+                    live = await self._resolve_host(f"www.{domain}")
+                return domain, live
+
+        return dict(await asyncio.gather(*(resolve(domain) for domain in domains)))
+
+    async def _resolve_host(self, host: str) -> Optional[bool]:
+        """
+        Resolve um nome de host.
+
+        Returns:
+            True se tiver endereço, False se não existir, None em erro temporário
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            addresses = await asyncio.wait_for(
+                loop.getaddrinfo(host, 443, type=socket.SOCK_STREAM), timeout=self.timeout
+            )
+            return bool(addresses)
+        except asyncio.TimeoutError:
+            logger.debug(f"Tempo esgotado ao resolver {host}")
+            return None
+        except socket.gaierror as e:
+            if e.errno in (socket.EAI_NONAME, getattr(socket, 'EAI_NODATA', socket.EAI_NONAME)):
+                return False
+            logger.debug(f"Erro temporário ao resolver {host}: {e}")
+            return None
+        except (UnicodeError, OSError) as e:
+            logger.debug(f"Nome de host inválido {host}: {e}")
+            return False
+
+
+def get_domain_resolver() -> DomainResolver:
+    """
+    Obtém o resolvedor de domínios compartilhado do processo.
+
+    Returns:
+        Resolvedor de domínios
+    """
+    global _resolver
+
+    with _resolver_lock:
+        if _resolver is None:
+            _resolver = DomainResolver()
+        return _resolver
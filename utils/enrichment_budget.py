@@ -0,0 +1,287 @@
+"""
+Orçamento de enriquecimento por empresa.
+Limita as páginas carregadas e o tempo gasto com cada empresa, somando todos
+os scrapers, e sinaliza quando os dados já atingiram o score de qualidade
+alvo. O orçamento da empresa em coleta fica disponível para o código de
+navegação via contextvars, sem precisar ser repassado entre as funções.
+"""
+
+import contextvars
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Any, List, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+_current_budget = contextvars.ContextVar('enrichment_budget', default=None)
+
+
+class BudgetExceeded(Exception):
+    """Erro lançado ao navegar depois de esgotado o orçamento da empresa."""
+    pass
+
+
+class BudgetStats:
+    """
+    Estatísticas dos orçamentos encerrados, agrupadas pelo motivo de parada.
+    """
+
+    def __init__(self):
+        """Inicializa as estatísticas."""
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, reason: str, page_loads: int, elapsed: float) -> None:
+        """
+        Registra o consumo de uma empresa concluída.
+
+        Args:
+            reason: Motivo de parada ('target', 'pages', 'time' ou 'complete')
+            page_loads: Páginas carregadas
+            elapsed: Tempo de coleta (segundos)
+        """
+        with self._lock:
+            entry = self._stats.setdefault(reason, {'companies': 0, 'page_loads': 0, 'elapsed': 0.0})
+            entry['companies'] += 1
+            entry['page_loads'] += page_loads
+            entry['elapsed'] += elapsed
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Obtém um resumo dos orçamentos.
+
+        Returns:
+            Dicionário motivo -> empresas, média de páginas e média de tempo
+        """
+        with self._lock:
+            return {
+                reason: {
+                    'companies': entry['companies'],
+                    'avg_page_loads': entry['page_loads'] / entry['companies'],
+                    'avg_elapsed': entry['elapsed'] / entry['companies']
+                }
+                for reason, entry in self._stats.items()
+            }
+
+    def reset(self) -> None:
+        """Descarta as estatísticas registradas."""
+        with self._lock:
+            self._stats.clear()
+
+
+# Estatísticas globais do processo
+budget_stats = BudgetStats()
+
+
+class EnrichmentBudget:
+    """
+    Orçamento de páginas, tempo e qualidade de uma empresa.
+
+    O tempo contado é apenas o das coletas em andamento (esperas na fila de
+    workers não consomem o orçamento). O score é calculado por uma função
+    que recebe as fontes já coletadas mais os dados parciais do scraper atual.
+    """
+
+    def __init__(self, company_id: str, scorer: Optional[Callable[[List[Dict[str, Any]]], float]] = None,
+                 max_page_loads: Optional[int] = None, max_seconds: Optional[float] = None,
+                 target_score: Optional[float] = None):
+        """
+        Inicializa o orçamento.
+
+        Args:
+            company_id: Identificador da empresa
+            scorer: Função fontes coletadas -> score de qualidade (opcional)
+            max_page_loads: Máximo de páginas carregadas (padrão: settings.ENRICHMENT_MAX_PAGE_LOADS)
+            max_seconds: Máximo de segundos de coleta (padrão: settings.ENRICHMENT_MAX_SECONDS)
+            target_score: Score que encerra a coleta (padrão: settings.ENRICHMENT_TARGET_SCORE)
+        """
+        self.company_id = company_id
+        self.scorer = scorer
+        self.max_page_loads = settings.ENRICHMENT_MAX_PAGE_LOADS if max_page_loads is None else max_page_loads
+        self.max_seconds = settings.ENRICHMENT_MAX_SECONDS if max_seconds is None else max_seconds
+        self.target_score = settings.ENRICHMENT_TARGET_SCORE if target_score is None else target_score
+
+        self.page_loads = 0
+        self.stop_reason = None
+        self._data_sources = []
+        self._elapsed = 0.0
+        self._active = 0
+        self._active_since = None
+        self._lock = threading.Lock()
+
+    @property
+    def elapsed(self) -> float:
+        """Segundos de coleta consumidos."""
+        with self._lock:
+            return self._elapsed_unlocked()
+
+    @property
+    def exhausted(self) -> bool:
+        """Indica se o limite de páginas ou de tempo foi atingido."""
+        with self._lock:
+            return self._check_limits() is not None
+
+    def add_source(self, data: Dict[str, Any]) -> None:
+        """
+        Registra os dados coletados por um scraper.
+
+        Args:
+            data: Dados retornados pela coleta (com a chave 'source')
+        """
+        with self._lock:
+            self._data_sources.append(data)
+
+    def charge_page_load(self) -> None:
+        """
+        Contabiliza uma página carregada.
+
+        Raises:
+            BudgetExceeded: Se o orçamento já estiver esgotado
+        """
+        with self._lock:
+            reason = self._check_limits()
+            if reason:
+                raise BudgetExceeded(f"Orçamento de {self.company_id} esgotado ({reason})")
+            self.page_loads += 1
+
+    def charge(self, page_loads: int, elapsed: float) -> None:
+        """
+        Contabiliza uma coleta executada fora deste processo (worker da fila distribuída).
+
+        Args:
+            page_loads: Páginas carregadas pela coleta
+            elapsed: Duração da coleta (segundos)
+        """
+        with self._lock:
+            self.page_loads += page_loads
+            self._elapsed += elapsed
+
+    def remaining(self) -> Dict[str, Any]:
+        """
+        Obtém o orçamento restante, para repassar a uma coleta executada em outro processo.
+
+        Returns:
+            Dicionário com 'max_page_loads', 'max_seconds', 'target_score' e
+            'data_sources' (fontes já coletadas, usadas no cálculo do score)
+        """
+        with self._lock:
+            return {
+                'max_page_loads': max(0, self.max_page_loads - self.page_loads),
+                'max_seconds': max(0.0, self.max_seconds - self._elapsed_unlocked()),
+                'target_score': self.target_score,
+                'data_sources': list(self._data_sources)
+            }
+
+    def should_stop(self, partial_data: Optional[Dict[str, Any]] = None, source: Optional[str] = None) -> bool:
+        """
+        Verifica se o enriquecimento da empresa deve parar.
+
+        Args:
+            partial_data: Dados parciais do scraper em execução (opcional)
+            source: Nome do scraper em execução (opcional)
+
+        Returns:
+            True se o orçamento acabou ou o score alvo foi atingido
+        """
+        with self._lock:
+            reason = self._check_limits()
+            data_sources = list(self._data_sources)
+
+        if reason is None and self.scorer is not None:
+            if partial_data:
+                data_sources.append(dict(partial_data, source=partial_data.get('source', source)))
+            if self.scorer(data_sources) >= self.target_score:
+                reason = 'target'
+
+        if reason and self.stop_reason is None:
+            self.stop_reason = reason
+            logger.info(
+                f"Enriquecimento de {self.company_id} encerrado ({reason}): "
+                f"{self.page_loads} páginas, {self.elapsed:.1f}s"
+            )
+        return reason is not None
+
+    def finish(self) -> None:
+        """Registra o consumo da empresa nas estatísticas globais."""
+        budget_stats.record(self.stop_reason or 'complete', self.page_loads, self.elapsed)
+
+    @contextmanager
+    def activate(self):
+        """
+        Torna este o orçamento da coleta em execução na thread atual.
+
+        Yields:
+            O próprio orçamento
+        """
+        with self._lock:
+            if self._active == 0:
+                self._active_since = time.monotonic()
+            self._active += 1
+
+        token = _current_budget.set(self)
+        try:
+            yield self
+        finally:
+            _current_budget.reset(token)
+            with self._lock:
+                self._active -= 1
+                if self._active == 0:
+                    self._elapsed += time.monotonic() - self._active_since
+                    self._active_since = None
+
+    def _elapsed_unlocked(self) -> float:
+        """Calcula o tempo consumido (chamar com o lock adquirido)."""
+        if self._active_since is None:
+            return self._elapsed
+        return self._elapsed + time.monotonic() - self._active_since
+
+    def _check_limits(self) -> Optional[str]:
+        """Obtém o limite atingido, se houver (chamar com o lock adquirido)."""
+        if self.page_loads >= self.max_page_loads:
+            return 'pages'
+        if self._elapsed_unlocked() >= self.max_seconds:
+            return 'time'
+        return None
+
+
+def get_current_budget() -> Optional[EnrichmentBudget]:
+    """
+    Obtém o orçamento da empresa em coleta na thread atual.
+
+    Returns:
+        Orçamento ou None fora de uma coleta com orçamento
+    """
+    return _current_budget.get()
+
+
+def charge_page_load() -> None:
+    """
+    Contabiliza uma página carregada no orçamento atual, se houver.
+
+    Raises:
+        BudgetExceeded: Se o orçamento da empresa já estiver esgotado
+    """
+    budget = _current_budget.get()
+    if budget is not None:
+        budget.charge_page_load()
+
+
+def should_stop_enrichment(partial_data: Optional[Dict[str, Any]] = None, source: Optional[str] = None) -> Optional[bool]:
+    """
+    Verifica se o enriquecimento da empresa atual deve parar.
+
+    Args:
+        partial_data: Dados parciais do scraper em execução (opcional)
+        source: Nome do scraper em execução (opcional)
+
+    Returns:
+        True/False conforme o orçamento atual, ou None se não houver orçamento
+    """
+    budget = _current_budget.get()
+    if budget is None:
+        return None
+    return budget.should_stop(partial_data, source)
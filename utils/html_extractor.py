@@ -0,0 +1,220 @@
+"""
+Motor de extração sobre uma cópia local do DOM.
+A página é analisada uma única vez em uma árvore lxml e todos os extratores
+de campos rodam localmente, sem idas e voltas ao WebDriver.
+"""
+
+import logging
+from typing import Any, List, Optional, Tuple
+from urllib.parse import urljoin
+
+import lxml.html
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+# Elementos cujo texto não é visível na página
+NON_VISIBLE_TAGS = {'script', 'style', 'noscript', 'template'}
+
+
+class PageSnapshot:
+    """
+    Cópia local de uma página HTML, analisada uma única vez.
+
+    Os índices (nós de texto, pares de tabela, links) são construídos sob
+    demanda e reaproveitados por todos os extratores.
+    """
+
+    def __init__(self, html: str, url: str = ""):
+        """
+        Inicializa o snapshot.
+
+        Args:
+            html: HTML da página
+            url: URL da página (usada para resolver links relativos)
+        """
+        self.html = html or ""
+        self.url = url
+        self.tree = self._parse(self.html)
+
+        self._own_texts = None
+        self._table_rows = None
+        self._visible_text = None
+
+    @classmethod
+    def from_driver(cls, driver) -> "PageSnapshot":
+        """
+        Cria um snapshot da página atual do navegador (uma única ida ao WebDriver).
+
+        Args:
+            driver: Driver Selenium
+
+        Returns:
+            Snapshot da página
+        """
+        return cls(driver.page_source, driver.current_url)
+
+    def _parse(self, html: str):
+        """Analisa o HTML, tolerando documentos vazios ou malformados."""
+        try:
+            if html.strip():
+                return lxml.html.document_fromstring(html)
+        except (etree.ParserError, ValueError) as e:
+            logger.debug(f"Falha ao analisar HTML: {e}")
+        return lxml.html.document_fromstring("<html><body></body></html>")
+
+    @property
+    def visible_text(self) -> str:
+        """Texto visível da página, com espaços normalizados."""
+        if self._visible_text is None:
+            body = self.tree.find('body')
+            parts = []
+            if body is not None:
+                for element in body.iter():
+                    if not isinstance(element.tag, str):
+                        continue
+                    if element.tag not in NON_VISIBLE_TAGS and element.text:
+                        parts.append(element.text)
+                    if element is not body and element.tail and self._parent_tag(element) not in NON_VISIBLE_TAGS:
+                        parts.append(element.tail)
+            self._visible_text = ' '.join(' '.join(parts).split())
+        return self._visible_text
+
+    def elements_with_text(self, terms: List[str]) -> List[Any]:
+        """
+        Encontra elementos cujo texto próprio contém algum dos termos
+        (equivalente a //*[contains(text(), termo)]).
+
+        Args:
+            terms: Termos a procurar (sensível a maiúsculas, como no XPath)
+
+        Returns:
+            Lista de elementos, na ordem do documento
+        """
+        elements = []
+        for element, text in self._get_own_texts():
+            if any(term in text for term in terms):
+                elements.append(element)
+        return elements
+
+    def element_text(self, element) -> str:
+        """
+        Obtém o texto de um elemento, com quebras de linha entre nós de texto.
+
+        Args:
+            element: Elemento lxml
+
+        Returns:
+            Texto do elemento
+        """
+        parts = []
+        for node in element.iter():
+            if not isinstance(node.tag, str):
+                continue
+            if node.tag not in NON_VISIBLE_TAGS and node.text and node.text.strip():
+                parts.append(node.text.strip())
+            if node is not element and node.tail and node.tail.strip():
+                parts.append(node.tail.strip())
+        return '\n'.join(parts)
+
+    def first_text(self, xpath: str) -> Optional[str]:
+        """
+        Obtém o texto do primeiro elemento que corresponde ao XPath.
+
+        Args:
+            xpath: Expressão XPath
+
+        Returns:
+            Texto do elemento ou None se não encontrado
+        """
+        elements = self.tree.xpath(xpath)
+        if not elements:
+            return None
+        return self.element_text(elements[0])
+
+    def xpath(self, expression: str) -> List[Any]:
+        """
+        Executa uma expressão XPath na árvore local.
+
+        Args:
+            expression: Expressão XPath
+
+        Returns:
+            Resultado da expressão
+        """
+        return self.tree.xpath(expression)
+
+    def table_value(self, label: str) -> Optional[str]:
+        """
+        Obtém o valor da primeira linha de tabela cujo cabeçalho contém o rótulo
+        (equivalente a //th[contains(text(), rótulo)]/following-sibling::td).
+
+        Args:
+            label: Rótulo do cabeçalho
+
+        Returns:
+            Texto da célula de valor ou None se não encontrado
+        """
+        for header, value in self._get_table_rows():
+            if label in header:
+                return value
+        return None
+
+    def links(self) -> List[Tuple[str, str]]:
+        """
+        Lista os links da página.
+
+        Returns:
+            Lista de tuplas (texto do link, URL absoluta)
+        """
+        links = []
+        for anchor in self.tree.iter('a'):
+            href = anchor.get('href')
+            if href:
+                links.append((anchor.text_content(), urljoin(self.url, href)))
+        return links
+
+    def has_element(self, xpath: str) -> bool:
+        """
+        Verifica se algum elemento corresponde ao XPath.
+
+        Args:
+            xpath: Expressão XPath
+
+        Returns:
+            True se houver pelo menos um elemento
+        """
+        return bool(self.tree.xpath(xpath))
+
+    def _get_own_texts(self) -> List[Tuple[Any, str]]:
+        """Indexa o primeiro nó de texto próprio de cada elemento (semântica de text() no XPath 1.0)."""
+        if self._own_texts is None:
+            self._own_texts = []
+            for element in self.tree.iter():
+                if not isinstance(element.tag, str) or element.tag in NON_VISIBLE_TAGS:
+                    continue
+                text = element.text
+                if not text:
+                    # Primeiro nó de texto pode estar após um filho
+                    text = next((child.tail for child in element if child.tail), None)
+                if text:
+                    self._own_texts.append((element, text))
+        return self._own_texts
+
+    def _get_table_rows(self) -> List[Tuple[str, str]]:
+        """Indexa os pares (th, td seguinte) de todas as tabelas em uma única passada."""
+        if self._table_rows is None:
+            self._table_rows = []
+            for header in self.tree.iter('th'):
+                value = header.getnext()
+                while value is not None and value.tag != 'td':
+                    value = value.getnext()
+                if value is not None:
+                    header_text = header.text or ''
+                    self._table_rows.append((header_text, self.element_text(value).strip()))
+        return self._table_rows
+
+    def _parent_tag(self, element) -> Optional[str]:
+        """Obtém a tag do elemento pai."""
+        parent = element.getparent()
+        return parent.tag if parent is not None else None
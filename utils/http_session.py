@@ -0,0 +1,52 @@
+"""
+Sessão HTTP compartilhada com pool de conexões.
+Reaproveita conexões TCP/TLS entre requisições do mesmo processo.
+"""
+
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import settings
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def create_http_session(pool_size: Optional[int] = None) -> requests.Session:
+    """
+    Cria uma sessão HTTP com pool de conexões e User-Agent padrão.
+
+    Args:
+        pool_size: Número máximo de conexões mantidas por host
+
+    Returns:
+        Sessão HTTP configurada
+    """
+    pool_size = pool_size or settings.HTTP_POOL_SIZE
+
+    session = requests.Session()
+    session.headers.update({'User-Agent': settings.USER_AGENT})
+
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    return session
+
+
+def get_http_session() -> requests.Session:
+    """
+    Obtém a sessão HTTP compartilhada do processo.
+
+    Returns:
+        Sessão HTTP compartilhada
+    """
+    global _session
+
+    with _session_lock:
+        if _session is None:
+            _session = create_http_session()
+        return _session
@@ -0,0 +1,281 @@
+"""
+Obtenção de páginas com estratégia HTTP primeiro e fallback para navegador.
+Páginas estáticas são baixadas com requests; o Selenium só é usado quando
+o conteúdo parece depender de JavaScript ou o acesso HTTP é bloqueado.
+"""
+
+import logging
+import re
+import threading
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse
+
+from config import settings
+from utils.enrichment_budget import BudgetExceeded, charge_page_load
+from utils.html_extractor import PageSnapshot
+from utils.http_session import get_http_session
+from utils.page_waiter import PageWaiter
+from utils.rate_limiter import get_rate_limiter
+from utils.selenium_manager import SeleniumManager
+
+logger = logging.getLogger(__name__)
+
+# Marcadores de páginas que exigem JavaScript para exibir conteúdo
+JS_REQUIRED_MARKERS = [
+    'enable javascript', 'habilite o javascript', 'ative o javascript',
+    'javascript is required', 'javascript is disabled', 'you need to enable javascript'
+]
+
+# Contêineres vazios típicos de aplicações de página única
+EMPTY_APP_ROOT_PATTERN = re.compile(
+    r'<(div|app-root)[^>]*id=["\'](root|app|__next|__nuxt)["\'][^>]*>\s*</\1>'
+    r'|<app-root[^>]*>\s*</app-root>',
+    re.IGNORECASE
+)
+
+# Status HTTP que indicam sobrecarga do servidor (o domínio é pausado)
+THROTTLE_STATUS_CODES = {429, 503}
+
+# Status HTTP que indicam que a página não existe (não vale tentar com navegador)
+MISSING_STATUS_CODES = {404, 410}
+
+
+class FetchStats:
+    """
+    Estatísticas por domínio de como as páginas foram obtidas.
+    """
+
+    def __init__(self):
+        """Inicializa as estatísticas de obtenção."""
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, domain: str, outcome: str, reason: Optional[str] = None) -> None:
+        """
+        Registra o resultado de uma obtenção.
+
+        Args:
+            domain: Domínio da página
+            outcome: 'http', 'browser', 'missing' ou 'failed'
+            reason: Motivo da escalada para o navegador (opcional)
+        """
+        with self._lock:
+            entry = self._stats.setdefault(domain, {'http': 0, 'browser': 0, 'missing': 0, 'failed': 0, 'reasons': {}})
+            entry[outcome] += 1
+            if reason:
+                entry['reasons'][reason] = entry['reasons'].get(reason, 0) + 1
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Obtém um resumo por domínio, incluindo a taxa de escalada.
+
+        Returns:
+            Dicionário com contadores e taxa de escalada por domínio
+        """
+        with self._lock:
+            summary = {}
+            for domain, entry in self._stats.items():
+                fetched = entry['http'] + entry['browser']
+                summary[domain] = {
+                    'http': entry['http'],
+                    'browser': entry['browser'],
+                    'missing': entry['missing'],
+                    'failed': entry['failed'],
+                    'escalation_rate': entry['browser'] / fetched if fetched else 0.0,
+                    'reasons': dict(entry['reasons'])
+                }
+            return summary
+
+    def reset(self) -> None:
+        """Descarta as estatísticas registradas."""
+        with self._lock:
+            self._stats.clear()
+
+
+# Estatísticas compartilhadas pelo processo
+fetch_stats = FetchStats()
+
+
+class BrowserSession:
+    """
+    Sessão de navegador aberta sob demanda.
+    O driver só é retirado do pool quando alguma página precisa ser renderizada.
+    """
+
+    def __init__(self, tenant: Optional[str] = None):
+        """
+        Inicializa a sessão.
+
+        Args:
+            tenant: Identificador do usuário do driver
+        """
+        self.tenant = tenant
+        self._manager = None
+        self._driver = None
+
+    @property
+    def is_open(self) -> bool:
+        """Indica se o navegador já foi aberto."""
+        return self._driver is not None
+
+    def get_driver(self):
+        """
+        Obtém o driver, abrindo o navegador na primeira chamada.
+
+        Returns:
+            WebDriver ou None se não for possível inicializar o Selenium
+        """
+        if self._manager is None:
+            self._manager = SeleniumManager(tenant=self.tenant)
+            self._driver = self._manager.__enter__()
+        return self._driver
+
+    def close(self, exc_type=None, exc_val=None, exc_tb=None) -> None:
+        """Devolve o driver ao pool, se tiver sido aberto."""
+        if self._manager is not None:
+            self._manager.__exit__(exc_type, exc_val, exc_tb)
+            self._manager = None
+            self._driver = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close(exc_type, exc_val, exc_tb)
+
+
+class PageFetcher:
+    """
+    Obtém páginas via HTTP e escala para o navegador apenas quando necessário.
+    """
+
+    def __init__(self, timeout: Optional[float] = None, min_text_length: Optional[int] = None,
+                 page_waiter: Optional[PageWaiter] = None, stats: Optional[FetchStats] = None):
+        """
+        Inicializa o fetcher.
+
+        Args:
+            timeout: Tempo limite das requisições HTTP (segundos)
+            min_text_length: Tamanho mínimo do texto visível para aceitar a página estática
+            page_waiter: Gerenciador de esperas usado no navegador (opcional)
+            stats: Estatísticas onde as obtenções são registradas (opcional)
+        """
+        self.timeout = timeout or settings.HTTP_FETCH_TIMEOUT
+        self.min_text_length = min_text_length or settings.MIN_STATIC_TEXT_LENGTH
+        self.page_waiter = page_waiter or PageWaiter()
+        self.stats = stats or fetch_stats
+
+    def fetch(self, url: str, browser: Optional[BrowserSession] = None, label: str = "page") -> Optional[Dict[str, Any]]:
+        """
+        Obtém uma página, tentando HTTP antes do navegador.
+
+        Args:
+            url: URL da página
+            browser: Sessão de navegador para fallback (opcional)
+            label: Rótulo da espera no navegador
+
+        Returns:
+            Dicionário com 'url', 'html', 'snapshot' e 'via' ('http' ou 'browser'),
+            ou None se a página não puder ser obtida ou o orçamento da empresa
+            em coleta estiver esgotado
+        """
+        domain = self._get_domain(url)
+        reason = None
+
+        try:
+            charge_page_load()
+        except BudgetExceeded as e:
+            logger.debug(f"{e}; ignorando {url}")
+            return None
+
+        try:
+            get_rate_limiter().acquire(url)
+            response = get_http_session().get(url, timeout=self.timeout, allow_redirects=True)
+            content_type = response.headers.get('Content-Type', '')
+
+            if response.status_code in MISSING_STATUS_CODES:
+                self.stats.record(domain, 'missing')
+                return None
+
+            if response.status_code in THROTTLE_STATUS_CODES:
+                get_rate_limiter().penalize(url)
+            
+            if response.status_code >= 400:
+                # Bloqueios e desafios anti-bot (403, 429, 503...) podem passar no navegador
+                reason = f"status_{response.status_code}"
+            elif content_type and 'html' not in content_type.lower():
+                self.stats.record(domain, 'missing')
+                return None
+            else:
+                html = response.text
+                snapshot = PageSnapshot(html, response.url)
+                reason = self._js_rendering_reason(snapshot)
+
+                if not reason:
+                    self.stats.record(domain, 'http')
+                    return {'url': response.url, 'html': html, 'snapshot': snapshot, 'via': 'http'}
+
+        except Exception as e:
+            logger.debug(f"Falha HTTP ao obter {url}: {e}")
+            reason = type(e).__name__
+
+        # Escalar para o navegador
+        if browser is None:
+            self.stats.record(domain, 'failed', reason)
+            return None
+
+        return self._fetch_with_browser(url, browser, label, domain, reason)
+
+    def _fetch_with_browser(self, url: str, browser: BrowserSession, label: str,
+                            domain: str, reason: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Renderiza a página no navegador."""
+        driver = browser.get_driver()
+        if not driver:
+            logger.error("Falha ao inicializar o driver Selenium")
+            self.stats.record(domain, 'failed', reason)
+            return None
+
+        try:
+            logger.info(f"Renderizando no navegador ({reason}): {url}")
+            # A página já foi contabilizada no orçamento pela tentativa HTTP
+            driver.get(url, charge_budget=False)
+            self.page_waiter.wait_for_page(driver, label=label)
+
+            snapshot = PageSnapshot.from_driver(driver)
+            self.stats.record(domain, 'browser', reason)
+            return {'url': snapshot.url, 'html': snapshot.html, 'snapshot': snapshot, 'via': 'browser'}
+
+        except Exception as e:
+            logger.warning(f"Falha ao navegar para {url}: {e}")
+            self.stats.record(domain, 'failed', reason)
+            return None
+
+    def _js_rendering_reason(self, snapshot: PageSnapshot) -> Optional[str]:
+        """
+        Verifica se o conteúdo parece depender de JavaScript.
+
+        Args:
+            snapshot: Página analisada
+
+        Returns:
+            Motivo para escalar ao navegador ou None se a página estática for suficiente
+        """
+        html = snapshot.html
+        if not html.strip():
+            return "empty"
+
+        if EMPTY_APP_ROOT_PATTERN.search(html):
+            return "spa_root"
+
+        if len(snapshot.visible_text) < self.min_text_length:
+            lowered = html.lower()
+            if any(marker in lowered for marker in JS_REQUIRED_MARKERS):
+                return "js_required"
+            return "little_text"
+
+        return None
+
+    def _get_domain(self, url: str) -> str:
+        """Extrai o domínio de uma URL, sem 'www.'."""
+        domain = urlparse(url).netloc.lower()
+        return domain[4:] if domain.startswith('www.') else domain
@@ -0,0 +1,224 @@
+"""
+Esperas de prontidão de página para sessões Selenium.
+Substitui pausas fixas por esperas orientadas a eventos e registra quanto cada espera durou.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Any, Optional
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Script que conta os recursos de rede já concluídos pela página
+RESOURCE_COUNT_SCRIPT = "return window.performance ? window.performance.getEntriesByType('resource').length : 0;"
+
+
+class WaitStats:
+    """
+    Estatísticas de duração das esperas, agrupadas por rótulo.
+    """
+
+    def __init__(self):
+        """Inicializa as estatísticas de espera."""
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, label: str, elapsed: float, timed_out: bool = False) -> None:
+        """
+        Registra a duração de uma espera.
+
+        Args:
+            label: Rótulo da espera (ex: "company_site:contato")
+            elapsed: Duração da espera em segundos
+            timed_out: Se a espera terminou por tempo limite
+        """
+        with self._lock:
+            entry = self._stats.setdefault(label, {'count': 0, 'total': 0.0, 'max': 0.0, 'timeouts': 0})
+            entry['count'] += 1
+            entry['total'] += elapsed
+            entry['max'] = max(entry['max'], elapsed)
+            if timed_out:
+                entry['timeouts'] += 1
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Obtém um resumo das esperas registradas.
+
+        Returns:
+            Dicionário com contagem, média, máximo e timeouts por rótulo
+        """
+        with self._lock:
+            return {
+                label: {
+                    'count': entry['count'],
+                    'avg': entry['total'] / entry['count'],
+                    'max': entry['max'],
+                    'timeouts': entry['timeouts']
+                }
+                for label, entry in self._stats.items()
+            }
+
+    def reset(self) -> None:
+        """Descarta as estatísticas registradas."""
+        with self._lock:
+            self._stats.clear()
+
+
+# Estatísticas compartilhadas pelo processo
+wait_stats = WaitStats()
+
+
+class PageWaiter:
+    """
+    Espera a prontidão de páginas usando WebDriverWait.
+
+    Cada espera termina assim que a condição é satisfeita (documento carregado,
+    rede ociosa ou seletor presente) ou quando o tempo limite é atingido,
+    e sua duração real é registrada em `wait_stats`.
+    """
+
+    def __init__(self, timeout: Optional[float] = None, idle_time: Optional[float] = None,
+                 poll_frequency: Optional[float] = None, stats: Optional[WaitStats] = None):
+        """
+        Inicializa o gerenciador de esperas.
+
+        Args:
+            timeout: Tempo limite padrão das esperas (segundos)
+            idle_time: Tempo sem novos recursos para considerar a rede ociosa (segundos)
+            poll_frequency: Intervalo entre verificações (segundos)
+            stats: Estatísticas onde as esperas são registradas (opcional)
+        """
+        self.timeout = timeout or settings.PAGE_READY_TIMEOUT
+        self.idle_time = idle_time or settings.NETWORK_IDLE_TIME
+        self.poll_frequency = poll_frequency or settings.WAIT_POLL_FREQUENCY
+        self.stats = stats or wait_stats
+
+    def wait_for_page(self, driver, label: str = "page", selector: Optional[str] = None,
+                      network_idle: bool = False, timeout: Optional[float] = None) -> bool:
+        """
+        Espera a página ficar pronta após uma navegação.
+
+        Args:
+            driver: Driver Selenium
+            label: Rótulo da espera para as estatísticas
+            selector: Seletor CSS que deve estar presente (opcional)
+            network_idle: Se deve esperar também a rede ficar ociosa
+            timeout: Tempo limite total (segundos)
+
+        Returns:
+            True se todas as condições foram satisfeitas, False se houve timeout
+        """
+        timeout = timeout or self.timeout
+        start = time.monotonic()
+
+        ready = self._wait_until(driver, self._document_ready, timeout)
+
+        if ready and selector:
+            remaining = max(timeout - (time.monotonic() - start), self.poll_frequency)
+            ready = self._wait_until(driver, self._selector_present(selector), remaining)
+
+        if ready and network_idle:
+            remaining = max(timeout - (time.monotonic() - start), self.poll_frequency)
+            ready = self._wait_until(driver, self._network_idle_condition(), remaining)
+
+        self._record(label, start, ready)
+        return ready
+
+    def wait_for_network_idle(self, driver, label: str = "network", timeout: Optional[float] = None) -> bool:
+        """
+        Espera até que a página pare de carregar novos recursos.
+
+        Args:
+            driver: Driver Selenium
+            label: Rótulo da espera para as estatísticas
+            timeout: Tempo limite (segundos)
+
+        Returns:
+            True se a rede ficou ociosa, False se houve timeout
+        """
+        start = time.monotonic()
+        ready = self._wait_until(driver, self._network_idle_condition(), timeout or self.timeout)
+        self._record(label, start, ready)
+        return ready
+
+    def wait_for_url_change(self, driver, previous_url: str, label: str = "redirect",
+                            timeout: Optional[float] = None) -> bool:
+        """
+        Espera a URL atual mudar (ex: redirecionamento após envio de formulário).
+
+        Args:
+            driver: Driver Selenium
+            previous_url: URL antes da ação
+            label: Rótulo da espera para as estatísticas
+            timeout: Tempo limite (segundos)
+
+        Returns:
+            True se a URL mudou e a nova página carregou, False se houve timeout
+        """
+        timeout = timeout or self.timeout
+        start = time.monotonic()
+
+        ready = self._wait_until(driver, lambda d: d.current_url != previous_url, timeout)
+        if ready:
+            remaining = max(timeout - (time.monotonic() - start), self.poll_frequency)
+            ready = self._wait_until(driver, self._document_ready, remaining)
+
+        self._record(label, start, ready)
+        return ready
+
+    def _wait_until(self, driver, condition, timeout: float) -> bool:
+        """Executa WebDriverWait com a condição, sem propagar timeouts."""
+        try:
+            WebDriverWait(driver, timeout, poll_frequency=self.poll_frequency).until(condition)
+            return True
+        except TimeoutException:
+            return False
+
+    def _document_ready(self, driver) -> bool:
+        """Condição: document.readyState igual a 'complete'."""
+        return driver.execute_script("return document.readyState") == "complete"
+
+    def _selector_present(self, selector: str):
+        """
+        Cria uma condição que verifica a presença de um seletor CSS via
+        JavaScript (find_elements bloquearia pela espera implícita do driver
+        a cada verificação de um seletor ausente).
+        """
+        def condition(driver):
+            return driver.execute_script("return document.querySelector(arguments[0]) !== null", selector)
+
+        return condition
+
+    def _network_idle_condition(self):
+        """
+        Cria uma condição que considera a rede ociosa quando nenhum recurso
+        novo termina de carregar durante `idle_time` segundos.
+        """
+        state = {'count': None, 'since': time.monotonic()}
+
+        def condition(driver):
+            count = driver.execute_script(RESOURCE_COUNT_SCRIPT) or 0
+            now = time.monotonic()
+
+            if count != state['count']:
+                state['count'] = count
+                state['since'] = now
+                return False
+
+            return now - state['since'] >= self.idle_time
+
+        return condition
+
+    def _record(self, label: str, start: float, ready: bool) -> None:
+        """Registra a duração da espera e avisa sobre timeouts."""
+        elapsed = time.monotonic() - start
+        self.stats.record(label, elapsed, timed_out=not ready)
+
+        if not ready:
+            logger.warning(f"Tempo limite atingido aguardando '{label}' ({elapsed:.1f}s)")
@@ -0,0 +1,256 @@
+"""
+Limitador de requisições por domínio (token bucket).
+Centraliza o ritmo de acesso a cada host (LinkedIn, CNPJ.biz, ReceitaWS,
+SearXNG, sites corporativos) para que os workers rodem no máximo ritmo
+seguro de cada domínio, em vez de um atraso global único.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Limites usados quando config/sources.json não define a seção "rate_limits"
+DEFAULT_RATE_LIMIT = {'requests_per_minute': 30, 'burst': 2}
+
+# Esquemas de URL que não geram requisições de rede
+LOCAL_URL_SCHEMES = ('about:', 'data:', 'file:', 'chrome:')
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+class TokenBucket:
+    """
+    Token bucket com reserva antecipada.
+
+    Cada chamada reserva um token imediatamente (o saldo pode ficar negativo)
+    e recebe o tempo que deve aguardar, o que mantém a ordem de chegada entre
+    threads sem segurar o lock durante a espera.
+    """
+
+    def __init__(self, requests_per_minute: float, burst: int = 1):
+        """
+        Inicializa o bucket.
+
+        Args:
+            requests_per_minute: Ritmo sustentado de requisições
+            burst: Requisições permitidas em sequência antes de aplicar o ritmo
+        """
+        self.rate = requests_per_minute / 60.0
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Reserva um token.
+
+        Returns:
+            Segundos a aguardar antes de usar o token
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def penalize(self, seconds: float) -> None:
+        """
+        Adia as próximas requisições (ex.: após uma resposta 429).
+
+        Args:
+            seconds: Segundos sem novas requisições
+        """
+        with self._lock:
+            self._tokens = min(self._tokens, 0.0) - seconds * self.rate
+
+
+class RateLimiter:
+    """
+    Agendador de permissões por domínio.
+
+    Domínios configurados compartilham o bucket com seus subdomínios
+    (www.linkedin.com e br.linkedin.com usam o de linkedin.com); os demais
+    hosts recebem um bucket próprio com o limite padrão.
+
+    Os buckets são do processo. Quando N processos acessam os mesmos
+    domínios (partições de --workers ou workers da fila), cada um aplica
+    1/N do ritmo e da rajada configurados, para que o total respeite os
+    limites.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, enabled: Optional[bool] = None,
+                 processes: Optional[int] = None):
+        """
+        Inicializa o limitador.
+
+        Args:
+            config: Seção "rate_limits" com as chaves "default" e "domains"
+            enabled: Aplicar os limites (padrão: settings.RATE_LIMIT_ENABLED)
+            processes: Processos que dividem os limites (padrão: settings.RATE_LIMIT_PROCESSES)
+        """
+        config = config or {}
+        self.enabled = settings.RATE_LIMIT_ENABLED if enabled is None else enabled
+        self.processes = max(1, settings.RATE_LIMIT_PROCESSES if processes is None else processes)
+        self.default_limit = config.get('default', DEFAULT_RATE_LIMIT)
+        self.domain_limits = {
+            self._normalize_host(domain): limit for domain, limit in config.get('domains', {}).items()
+        }
+
+        self._buckets = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, url: str) -> float:
+        """
+        Aguarda a permissão para acessar uma URL (ou domínio).
+
+        Args:
+            url: URL ou domínio a ser acessado
+
+        Returns:
+            Segundos aguardados
+        """
+        delay = self._reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def aacquire(self, url: str) -> float:
+        """
+        Aguarda a permissão para acessar uma URL sem bloquear o event loop.
+
+        Args:
+            url: URL ou domínio a ser acessado
+
+        Returns:
+            Segundos aguardados
+        """
+        delay = self._reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def penalize(self, url: str, seconds: Optional[float] = None) -> None:
+        """
+        Adia as próximas requisições ao domínio de uma URL (ex.: após 429 ou 503).
+
+        Args:
+            url: URL ou domínio que sinalizou sobrecarga
+            seconds: Segundos sem novas requisições (padrão: settings.RATE_LIMIT_PENALTY)
+        """
+        if not self.enabled:
+            return
+
+        seconds = settings.RATE_LIMIT_PENALTY if seconds is None else seconds
+        key, bucket = self._get_bucket(url)
+        bucket.penalize(seconds)
+        logger.warning(f"Domínio {key} sinalizou sobrecarga; pausando requisições por {seconds}s")
+
+        with self._lock:
+            self._get_stats_entry(key)['penalties'] += 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Obtém as estatísticas de espera por domínio.
+
+        Returns:
+            Dicionário domínio -> permissões concedidas, esperas e tempo total aguardado
+        """
+        with self._lock:
+            return {key: dict(entry) for key, entry in self._stats.items()}
+
+    def _reserve(self, url: str) -> float:
+        """Reserva uma permissão e registra a espera."""
+        if not self.enabled or url.startswith(LOCAL_URL_SCHEMES):
+            return 0.0
+
+        key, bucket = self._get_bucket(url)
+        delay = bucket.reserve()
+
+        with self._lock:
+            entry = self._get_stats_entry(key)
+            entry['permits'] += 1
+            if delay > 0:
+                entry['waits'] += 1
+                entry['wait_time'] += delay
+
+        if delay > 0:
+            logger.debug(f"Aguardando {delay:.2f}s pelo limite de requisições de {key}")
+        return delay
+
+    def _get_bucket(self, url: str):
+        """Obtém (criando se necessário) o bucket do domínio de uma URL."""
+        key, limit = self._resolve(url)
+
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = TokenBucket(limit['requests_per_minute'] / self.processes,
+                                     limit.get('burst', 1) / self.processes)
+                self._buckets[key] = bucket
+        return key, bucket
+
+    def _resolve(self, url: str):
+        """Encontra o domínio configurado mais específico para o host da URL."""
+        host = self._normalize_host(url)
+
+        labels = host.split('.')
+        for start in range(len(labels) - 1):
+            candidate = '.'.join(labels[start:])
+            if candidate in self.domain_limits:
+                return candidate, self.domain_limits[candidate]
+
+        return host, self.default_limit
+
+    def _get_stats_entry(self, key: str) -> Dict[str, Any]:
+        """Obtém a entrada de estatísticas de um domínio (chamar com o lock adquirido)."""
+        return self._stats.setdefault(key, {'permits': 0, 'waits': 0, 'wait_time': 0.0, 'penalties': 0})
+
+    def _normalize_host(self, url: str) -> str:
+        """Extrai o host (sem porta e sem 'www.') de uma URL ou domínio."""
+        host = urlparse(url if '//' in url else f"//{url}").hostname or url
+        host = host.lower()
+        return host[4:] if host.startswith('www.') else host
+
+
+def load_rate_limit_config() -> Dict[str, Any]:
+    """
+    Carrega a seção "rate_limits" de config/sources.json.
+
+    Returns:
+        Configuração de limites (vazia se ausente ou inválida)
+    """
+    try:
+        sources_path = os.path.join(os.path.dirname(__file__), '..', 'config', 'sources.json')
+        with open(sources_path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('rate_limits', {})
+    except Exception as e:
+        logger.error(f"Erro ao carregar limites de requisições: {e}")
+        return {}
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Obtém o limitador de requisições compartilhado do processo.
+
+    Returns:
+        Limitador de requisições
+    """
+    global _limiter
+
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter(load_rate_limit_config())
+        return _limiter
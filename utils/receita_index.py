@@ -0,0 +1,635 @@
+"""
+Índice local dos dados abertos de CNPJ da Receita Federal.
+
+Os arquivos públicos (Empresas, Estabelecimentos, Municípios e CNAEs, em CSV
+compactado com separador ';' e codificação latin-1) são lidos em streaming e
+gravados em um banco SQLite com índices por CNPJ, CNAE, UF/município, porte
+e nome normalizado. Consultas por setor e localização passam a ser
+respondidas localmente, sem navegador.
+
+Uso (a partir da raiz do projeto):
+    python -m utils.receita_index build data/samples/receita
+    python -m utils.receita_index lookup 53113791000122
+    python -m utils.receita_index search --cnae 62 --uf SP
+"""
+
+import argparse
+import csv
+import io
+import json
+import logging
+import os
+import sqlite3
+import threading
+import zipfile
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Sequence
+
+from config import settings
+from utils.company_identity import fold_text, normalize_cnpj, normalize_company_name
+from utils.data_paths import resolve_data_path
+
+logger = logging.getLogger(__name__)
+
+# Linhas gravadas por transação durante a ingestão
+INGEST_BATCH_SIZE = 10000
+
+# Porte da empresa (campo porte_empresa)
+PORTE_LABELS = {
+    '00': 'Não informado',
+    '01': 'Micro Empresa',
+    '03': 'Empresa de Pequeno Porte',
+    '05': 'Demais'
+}
+
+# Situação cadastral (campo situacao_cadastral)
+SITUACAO_LABELS = {
+    '01': 'NULA',
+    '02': 'ATIVA',
+    '03': 'SUSPENSA',
+    '04': 'INAPTA',
+    '08': 'BAIXADA'
+}
+
+# Prefixos de CNAE (divisões) associados a cada setor dos critérios de busca
+SECTOR_CNAE_PREFIXES = {
+    'tecnologia': ['62', '63', '582', '261', '262'],
+    'software': ['62', '582'],
+    'saude': ['86', '87', '2121', '4644', '4771'],
+    'financeiro': ['64', '65', '66'],
+    'financas': ['64', '65', '66'],
+    'banco': ['641', '642'],
+    'varejo': ['47'],
+    'comercio': ['45', '46', '47'],
+    'industria': ['10', '11', '13', '14', '15', '17', '20', '22', '24', '25', '26', '27', '28', '29'],
+    'educacao': ['85'],
+    'construcao': ['41', '42', '43'],
+    'logistica': ['49', '50', '51', '52', '53'],
+    'agronegocio': ['01', '02', '03'],
+    'telecomunicacoes': ['61']
+}
+
+# Siglas das unidades federativas por nome normalizado
+UF_BY_NAME = {
+    'ACRE': 'AC', 'ALAGOAS': 'AL', 'AMAPA': 'AP', 'AMAZONAS': 'AM', 'BAHIA': 'BA',
+    'CEARA': 'CE', 'DISTRITO FEDERAL': 'DF', 'ESPIRITO SANTO': 'ES', 'GOIAS': 'GO',
+    'MARANHAO': 'MA', 'MATO GROSSO': 'MT', 'MATO GROSSO DO SUL': 'MS', 'MINAS GERAIS': 'MG',
+    'PARA': 'PA', 'PARAIBA': 'PB', 'PARANA': 'PR', 'PERNAMBUCO': 'PE', 'PIAUI': 'PI',
+    'RIO DE JANEIRO': 'RJ', 'RIO GRANDE DO NORTE': 'RN', 'RIO GRANDE DO SUL': 'RS',
+    'RONDONIA': 'RO', 'RORAIMA': 'RR', 'SANTA CATARINA': 'SC', 'SAO PAULO': 'SP',
+    'SERGIPE': 'SE', 'TOCANTINS': 'TO'
+}
+
+# Tipos de arquivo do dump, identificados pelo nome (ordem importa: ESTABELE antes de EMPRE)
+FILE_KINDS = [
+    ('ESTABELE', 'estabelecimentos'),
+    ('EMPRE', 'empresas'),
+    ('MUNIC', 'municipios'),
+    ('CNAE', 'cnaes')
+]
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS empresas (
+        cnpj_basico TEXT PRIMARY KEY,
+        razao_social TEXT,
+        name_norm TEXT,
+        natureza_juridica TEXT,
+        capital_social REAL,
+        porte TEXT
+    );
+    CREATE TABLE IF NOT EXISTS estabelecimentos (
+        cnpj TEXT PRIMARY KEY,
+        cnpj_basico TEXT NOT NULL,
+        matriz INTEGER,
+        nome_fantasia TEXT,
+        fantasia_norm TEXT,
+        situacao TEXT,
+        data_inicio TEXT,
+        cnae_principal TEXT,
+        cnaes_secundarios TEXT,
+        logradouro TEXT,
+        numero TEXT,
+        complemento TEXT,
+        bairro TEXT,
+        cep TEXT,
+        uf TEXT,
+        municipio TEXT,
+        telefone TEXT,
+        email TEXT
+    );
+    CREATE TABLE IF NOT EXISTS municipios (
+        codigo TEXT PRIMARY KEY,
+        nome TEXT,
+        nome_norm TEXT
+    );
+    CREATE TABLE IF NOT EXISTS cnaes (
+        codigo TEXT PRIMARY KEY,
+        descricao TEXT
+    );
+"""
+
+INDEXES = """
+    CREATE INDEX IF NOT EXISTS idx_estab_basico ON estabelecimentos (cnpj_basico);
+    CREATE INDEX IF NOT EXISTS idx_estab_cnae ON estabelecimentos (cnae_principal);
+    CREATE INDEX IF NOT EXISTS idx_estab_local ON estabelecimentos (uf, municipio);
+    CREATE INDEX IF NOT EXISTS idx_estab_fantasia ON estabelecimentos (fantasia_norm);
+    CREATE INDEX IF NOT EXISTS idx_empresas_nome ON empresas (name_norm);
+    CREATE INDEX IF NOT EXISTS idx_empresas_porte ON empresas (porte);
+    CREATE INDEX IF NOT EXISTS idx_municipios_nome ON municipios (nome_norm);
+"""
+
+RECORD_QUERY = """
+    SELECT e.cnpj, e.matriz, e.nome_fantasia, e.situacao, e.data_inicio, e.cnae_principal,
+           e.logradouro, e.numero, e.complemento, e.bairro, e.cep, e.uf, e.telefone, e.email,
+           c.razao_social, c.natureza_juridica, c.capital_social, c.porte,
+           m.nome AS municipio_nome, a.descricao AS cnae_descricao
+    FROM estabelecimentos e
+    LEFT JOIN empresas c ON c.cnpj_basico = e.cnpj_basico
+    LEFT JOIN municipios m ON m.codigo = e.municipio
+    LEFT JOIN cnaes a ON a.codigo = e.cnae_principal
+"""
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def resolve_uf(value: str) -> Optional[str]:
+    """
+    Converte um estado (sigla ou nome) para a sigla da UF.
+
+    Args:
+        value: Sigla ou nome do estado
+
+    Returns:
+        Sigla da UF ou None se não reconhecido
+    """
+    folded = fold_text(value)
+    if len(folded) == 2 and folded in UF_BY_NAME.values():
+        return folded
+    return UF_BY_NAME.get(folded)
+
+
+def sector_cnae_prefixes(sector: str) -> List[str]:
+    """
+    Obtém os prefixos de CNAE associados a um setor.
+
+    Args:
+        sector: Nome do setor (ex.: 'tecnologia', 'saúde')
+
+    Returns:
+        Lista de prefixos de CNAE (vazia se o setor não for conhecido)
+    """
+    folded = fold_text(sector).lower()
+    for name, prefixes in SECTOR_CNAE_PREFIXES.items():
+        if name in folded:
+            return prefixes
+    return []
+
+
+def format_cnpj(cnpj: str) -> str:
+    """Formata um CNPJ de 14 dígitos como XX.XXX.XXX/XXXX-XX."""
+    return f"{cnpj[:2]}.{cnpj[2:5]}.{cnpj[5:8]}/{cnpj[8:12]}-{cnpj[12:]}"
+
+
+def format_cnae(code: str) -> str:
+    """Formata um código CNAE de 7 dígitos como XX.XX-X-XX."""
+    if not code or len(code) != 7:
+        return code or ''
+    return f"{code[:2]}.{code[2:4]}-{code[4]}-{code[5:]}"
+
+
+def format_date(value: str) -> str:
+    """Converte uma data AAAAMMDD para DD/MM/AAAA."""
+    if not value or len(value) != 8 or not value.isdigit() or value == '00000000':
+        return ''
+    return f"{value[6:]}/{value[4:6]}/{value[:4]}"
+
+
+def iter_dump_rows(path: str) -> Iterator[tuple]:
+    """
+    Percorre em streaming as linhas dos arquivos do dump.
+
+    Aceita arquivos .zip (como publicados pela Receita), CSVs avulsos ou
+    diretórios contendo ambos.
+
+    Args:
+        path: Arquivo ou diretório
+
+    Yields:
+        Tuplas (tipo do arquivo, linha)
+    """
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            yield from iter_dump_rows(os.path.join(path, name))
+        return
+
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for member in archive.infolist():
+                if member.is_dir():
+                    continue
+                kind = _detect_kind(member.filename) or _detect_kind(os.path.basename(path))
+                if not kind:
+                    continue
+                with archive.open(member) as raw:
+                    yield from ((kind, row) for row in _read_csv(raw))
+        return
+
+    kind = _detect_kind(os.path.basename(path))
+    if kind:
+        with open(path, 'rb') as raw:
+            yield from ((kind, row) for row in _read_csv(raw))
+
+
+def _detect_kind(filename: str) -> Optional[str]:
+    """Identifica o tipo de arquivo do dump pelo nome."""
+    upper = os.path.basename(filename).upper()
+    for marker, kind in FILE_KINDS:
+        if marker in upper:
+            return kind
+    return None
+
+
+def _read_csv(raw) -> Iterator[List[str]]:
+    """Lê um CSV da Receita (latin-1, ';', sem cabeçalho) a partir de um arquivo binário."""
+    text = io.TextIOWrapper(raw, encoding='latin-1', newline='')
+    # Alguns arquivos do dump contêm bytes nulos
+    lines = (line.replace('\0', '') for line in text)
+    yield from csv.reader(lines, delimiter=';', quotechar='"')
+
+
+class ReceitaIndex:
+    """
+    Índice SQLite dos dados abertos de CNPJ.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Inicializa o índice.
+
+        Args:
+            path: Caminho do banco SQLite (padrão: settings.RECEITA_INDEX_PATH)
+        """
+        self.path = resolve_data_path(path or settings.RECEITA_INDEX_PATH)
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(SCHEMA)
+
+    def ingest(self, paths: Sequence[str], only_active: bool = False,
+               ufs: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """
+        Importa arquivos do dump para o índice.
+
+        Args:
+            paths: Arquivos .zip/.csv ou diretórios do dump
+            only_active: Importar apenas estabelecimentos com situação ATIVA
+            ufs: Importar apenas estabelecimentos destas UFs (opcional)
+
+        Returns:
+            Número de linhas importadas por tipo de arquivo
+        """
+        uf_filter = {uf.upper() for uf in ufs} if ufs else None
+        counts = {kind: 0 for _, kind in FILE_KINDS}
+        batches = {kind: [] for _, kind in FILE_KINDS}
+
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=OFF")
+            # Empresas importadas nesta chamada (as de importações anteriores não são descartadas)
+            self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS ingested_empresas (cnpj_basico TEXT PRIMARY KEY)")
+            self._conn.execute("DELETE FROM ingested_empresas")
+
+            for path in paths:
+                logger.info(f"Importando dados da Receita Federal de {path}")
+                for kind, row in iter_dump_rows(path):
+                    record = self._convert_row(kind, row, only_active, uf_filter)
+                    if record is None:
+                        continue
+
+                    batch = batches[kind]
+                    batch.append(record)
+                    if len(batch) >= INGEST_BATCH_SIZE:
+                        counts[kind] += self._flush(kind, batch)
+
+            for kind, batch in batches.items():
+                counts[kind] += self._flush(kind, batch)
+
+            # Com filtros, descartar as empresas importadas agora sem nenhum
+            # estabelecimento, se os estabelecimentos vieram na mesma importação
+            if (only_active or uf_filter) and counts['estabelecimentos']:
+                self._conn.execute(
+                    "DELETE FROM empresas WHERE cnpj_basico IN (SELECT cnpj_basico FROM ingested_empresas) "
+                    "AND cnpj_basico NOT IN (SELECT cnpj_basico FROM estabelecimentos)"
+                )
+            self._conn.execute("DELETE FROM ingested_empresas")
+
+            self._conn.executescript(INDEXES)
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.commit()
+
+        logger.info(f"Importação concluída: {counts}")
+        return counts
+
+    def _convert_row(self, kind: str, row: List[str], only_active: bool,
+                     uf_filter: Optional[set]) -> Optional[tuple]:
+        """Converte uma linha do dump em uma tupla para gravação (ou None para descartar)."""
+        try:
+            if kind == 'estabelecimentos':
+                if len(row) < 28:
+                    return None
+                situacao, uf = row[5], row[19]
+                if only_active and situacao != '02':
+                    return None
+                if uf_filter and uf not in uf_filter:
+                    return None
+                telefone = f"({row[21]}) {row[22]}" if row[21] and row[22] else row[22]
+                return (
+                    row[0] + row[1] + row[2], row[0], 1 if row[3] == '1' else 0,
+                    row[4], normalize_company_name(row[4]), situacao, row[10], row[11], row[12],
+                    ' '.join(part for part in (row[13], row[14]) if part), row[15], row[16], row[17],
+                    row[18], uf, row[20], telefone, row[27].lower()
+                )
+
+            if kind == 'empresas':
+                if len(row) < 6:
+                    return None
+                capital = float(row[4].replace('.', '').replace(',', '.')) if row[4] else None
+                return (row[0], row[1], normalize_company_name(row[1]), row[2], capital, row[5])
+
+            if kind == 'municipios':
+                return (row[0], row[1], fold_text(row[1]))
+
+            if kind == 'cnaes':
+                return (row[0], row[1])
+
+        except (IndexError, ValueError) as e:
+            logger.debug(f"Linha inválida em {kind}: {e}")
+        return None
+
+    def _flush(self, kind: str, batch: List[tuple]) -> int:
+        """Grava um lote de linhas em uma única transação."""
+        if not batch:
+            return 0
+
+        placeholders = ','.join('?' * len(batch[0]))
+        self._conn.executemany(f"INSERT OR REPLACE INTO {kind} VALUES ({placeholders})", batch)
+        if kind == 'empresas':
+            self._conn.executemany("INSERT OR IGNORE INTO ingested_empresas VALUES (?)",
+                                   ((record[0],) for record in batch))
+        self._conn.commit()
+
+        count = len(batch)
+        batch.clear()
+        return count
+
+    def is_empty(self) -> bool:
+        """Indica se o índice ainda não contém estabelecimentos."""
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM estabelecimentos LIMIT 1").fetchone() is None
+
+    def get(self, cnpj: str) -> Optional[Dict[str, Any]]:
+        """
+        Obtém os dados cadastrais de um CNPJ.
+
+        Args:
+            cnpj: CNPJ (formatado ou não)
+
+        Returns:
+            Dados no mesmo formato das demais fontes de CNPJ ou None se não encontrado
+        """
+        key = normalize_cnpj(cnpj)
+        if not key:
+            return None
+
+        with self._lock:
+            row = self._conn.execute(f"{RECORD_QUERY} WHERE e.cnpj = ?", (key,)).fetchone()
+        return self._to_record(row) if row else None
+
+    def search(self, cnae_prefixes: Optional[Sequence[str]] = None, ufs: Optional[Sequence[str]] = None,
+               cities: Optional[Sequence[str]] = None, portes: Optional[Sequence[str]] = None,
+               only_active: bool = True, only_headquarters: bool = True, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Busca estabelecimentos por atividade, localização e porte.
+
+        Args:
+            cnae_prefixes: Prefixos de CNAE da atividade principal (ex.: ['62', '631'])
+            ufs: Siglas das UFs
+            cities: Nomes dos municípios
+            portes: Códigos de porte (ver PORTE_LABELS)
+            only_active: Apenas situação ATIVA
+            only_headquarters: Apenas matrizes
+            limit: Número máximo de resultados
+
+        Returns:
+            Lista de registros encontrados
+        """
+        conditions = []
+        params = []
+
+        if cnae_prefixes:
+            # Faixas de código permitem usar o índice de CNAE
+            ranges = []
+            for prefix in cnae_prefixes:
+                ranges.append("(e.cnae_principal >= ? AND e.cnae_principal < ?)")
+                params.extend([prefix, prefix + ':'])
+            conditions.append(f"({' OR '.join(ranges)})")
+
+        if ufs:
+            conditions.append(f"e.uf IN ({','.join('?' * len(ufs))})")
+            params.extend(ufs)
+
+        if cities:
+            conditions.append(
+                f"e.municipio IN (SELECT codigo FROM municipios WHERE nome_norm IN ({','.join('?' * len(cities))}))"
+            )
+            params.extend(fold_text(city) for city in cities)
+
+        if portes:
+            conditions.append(f"c.porte IN ({','.join('?' * len(portes))})")
+            params.extend(portes)
+
+        if only_active:
+            conditions.append("e.situacao = '02'")
+
+        if only_headquarters:
+            conditions.append("e.matriz = 1")
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(f"{RECORD_QUERY} {where} ORDER BY e.cnpj LIMIT ?", params).fetchall()
+        return [self._to_record(row) for row in rows]
+
+    def search_by_name(self, name: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Busca estabelecimentos pelo nome normalizado (razão social ou nome fantasia).
+
+        Nomes exatos vêm antes de nomes que apenas começam com o termo; matrizes
+        ativas vêm antes de filiais e estabelecimentos baixados.
+
+        Args:
+            name: Nome da empresa
+            limit: Número máximo de resultados
+
+        Returns:
+            Lista de registros encontrados
+        """
+        normalized = normalize_company_name(name)
+        if not normalized:
+            return []
+
+        upper_bound = normalized + '\uffff'
+        query = f"""
+            {RECORD_QUERY}
+            WHERE e.cnpj_basico IN (
+                SELECT cnpj_basico FROM empresas WHERE name_norm >= ? AND name_norm < ?
+                UNION
+                SELECT cnpj_basico FROM estabelecimentos WHERE fantasia_norm >= ? AND fantasia_norm < ?
+            )
+            ORDER BY (c.name_norm = ? OR e.fantasia_norm = ?) DESC, e.situacao = '02' DESC,
+                     e.matriz DESC, e.cnpj
+            LIMIT ?
+        """
+        params = (normalized, upper_bound, normalized, upper_bound, normalized, normalized, limit)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [self._to_record(row) for row in rows]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Obtém o número de registros por tabela.
+
+        Returns:
+            Dicionário tabela -> número de registros
+        """
+        with self._lock:
+            return {
+                kind: self._conn.execute(f"SELECT COUNT(*) FROM {kind}").fetchone()[0]
+                for _, kind in FILE_KINDS
+            }
+
+    def close(self) -> None:
+        """Fecha a conexão com o banco."""
+        with self._lock:
+            self._conn.close()
+
+    def _to_record(self, row: sqlite3.Row) -> Dict[str, Any]:
+        """Converte uma linha do índice para o formato de dados das fontes de CNPJ."""
+        address = row['logradouro'] or ''
+        if row['numero']:
+            address += f", {row['numero']}"
+        if row['complemento']:
+            address += f" - {row['complemento']}"
+
+        city = row['municipio_nome'] or ''
+        state = row['uf'] or ''
+        zip_code = row['cep'] or ''
+        if len(zip_code) == 8:
+            zip_code = f"{zip_code[:2]}.{zip_code[2:5]}-{zip_code[5:]}"
+
+        capital = row['capital_social']
+
+        return {
+            'name': row['razao_social'] or '',
+            'cnpj': row['cnpj'],
+            'cnpj_formatted': format_cnpj(row['cnpj']),
+            'fantasy_name': row['nome_fantasia'] or '',
+            'address': address,
+            'neighborhood': row['bairro'] or '',
+            'city': city,
+            'state': state,
+            'zip_code': zip_code,
+            'location': f"{address}, {city} - {state}, {zip_code}",
+            'phone': row['telefone'] or '',
+            'email': row['email'] or '',
+            'opening_date': format_date(row['data_inicio']),
+            'legal_nature': row['natureza_juridica'] or '',
+            'status': SITUACAO_LABELS.get(row['situacao'], row['situacao'] or ''),
+            'type': 'MATRIZ' if row['matriz'] else 'FILIAL',
+            'capital': f"{capital:.2f}" if capital is not None else '',
+            'size': PORTE_LABELS.get(row['porte'], ''),
+            'main_activity': row['cnae_descricao'] or '',
+            'main_activity_code': format_cnae(row['cnae_principal'])
+        }
+
+
+def get_receita_index() -> Optional[ReceitaIndex]:
+    """
+    Obtém o índice da Receita compartilhado do processo, se já tiver sido construído.
+
+    Returns:
+        Índice da Receita ou None se desativado ou inexistente
+    """
+    global _index
+
+    if not settings.RECEITA_INDEX_ENABLED:
+        return None
+
+    with _index_lock:
+        if _index is None:
+            path = resolve_data_path(settings.RECEITA_INDEX_PATH)
+            if not os.path.exists(path):
+                return None
+            index = ReceitaIndex(path)
+            if index.is_empty():
+                index.close()
+                return None
+            _index = index
+        return _index
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Índice local dos dados abertos de CNPJ da Receita Federal')
+    parser.add_argument('--index', type=str, help='Caminho do banco do índice (padrão: RECEITA_INDEX_PATH)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='Importar arquivos do dump (.zip, .csv ou diretórios)')
+    build_parser.add_argument('paths', nargs='+', help='Arquivos ou diretórios do dump')
+    build_parser.add_argument('--only-active', action='store_true', help='Importar apenas estabelecimentos ativos')
+    build_parser.add_argument('--uf', nargs='*', help='Importar apenas estabelecimentos destas UFs')
+
+    lookup_parser = subparsers.add_parser('lookup', help='Consultar um CNPJ')
+    lookup_parser.add_argument('cnpj', help='CNPJ a consultar')
+
+    search_parser = subparsers.add_parser('search', help='Buscar por CNAE, localização, porte ou nome')
+    search_parser.add_argument('--cnae', nargs='*', help='Prefixos de CNAE')
+    search_parser.add_argument('--sector', type=str, help='Setor (convertido em prefixos de CNAE)')
+    search_parser.add_argument('--uf', nargs='*', help='UFs (sigla ou nome)')
+    search_parser.add_argument('--city', nargs='*', help='Municípios')
+    search_parser.add_argument('--porte', nargs='*', help='Códigos de porte (01, 03, 05)')
+    search_parser.add_argument('--name', type=str, help='Nome da empresa')
+    search_parser.add_argument('--limit', type=int, default=20, help='Número máximo de resultados')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=getattr(logging, settings.LOG_LEVEL))
+
+    index = ReceitaIndex(args.index)
+
+    if args.command == 'build':
+        counts = index.ingest(args.paths, only_active=args.only_active, ufs=args.uf)
+        print(json.dumps({'imported': counts, 'total': index.stats()}, indent=2))
+
+    elif args.command == 'lookup':
+        print(json.dumps(index.get(args.cnpj), indent=2, ensure_ascii=False))
+
+    elif args.command == 'search':
+        if args.name:
+            results = index.search_by_name(args.name, limit=args.limit)
+        else:
+            cnae_prefixes = list(args.cnae or [])
+            if args.sector:
+                cnae_prefixes.extend(sector_cnae_prefixes(args.sector))
+            ufs = [resolve_uf(uf) for uf in args.uf or []]
+            results = index.search(cnae_prefixes=cnae_prefixes, ufs=[uf for uf in ufs if uf],
+                                   cities=args.city, portes=args.porte, limit=args.limit)
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+
+    index.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,211 @@
+"""
+Cache persistente de resultados do SearXNG.
+Armazena respostas em SQLite, com validade (TTL) e descarte LRU por tamanho.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Optional
+
+from config import settings
+from utils.data_paths import resolve_data_path
+
+logger = logging.getLogger(__name__)
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+class SearchCache:
+    """
+    Cache de buscas em SQLite, chaveado pela consulta normalizada e parâmetros.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[float] = None, max_entries: Optional[int] = None):
+        """
+        Inicializa o cache.
+
+        Args:
+            path: Caminho do banco SQLite
+            ttl: Validade das entradas (segundos)
+            max_entries: Número máximo de entradas antes do descarte LRU
+        """
+        self.path = resolve_data_path(path or settings.SEARCH_CACHE_PATH)
+        self.ttl = ttl if ttl is not None else settings.SEARCH_CACHE_TTL
+        self.max_entries = max_entries or settings.SEARCH_CACHE_MAX_ENTRIES
+
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'expired': 0, 'evicted': 0, 'stored': 0}
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS search_cache (
+                key TEXT PRIMARY KEY,
+                query TEXT NOT NULL,
+                params TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_search_cache_last_access ON search_cache (last_access)")
+        self._conn.commit()
+
+    def make_key(self, query: str, params: Dict[str, Any]) -> str:
+        """
+        Gera a chave de cache a partir da consulta normalizada e dos parâmetros.
+
+        Args:
+            query: Consulta de busca
+            params: Parâmetros da busca (endpoint, formato, páginas...)
+
+        Returns:
+            Chave de cache
+        """
+        normalized = {
+            'query': self.normalize_query(query),
+            'params': {str(key): str(value) for key, value in sorted(params.items())}
+        }
+        payload = json.dumps(normalized, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def normalize_query(self, query: str) -> str:
+        """
+        Normaliza a consulta (minúsculas e espaços simples).
+
+        Args:
+            query: Consulta de busca
+
+        Returns:
+            Consulta normalizada
+        """
+        return ' '.join(query.lower().split())
+
+    def get(self, query: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Obtém uma resposta do cache.
+
+        Args:
+            query: Consulta de busca
+            params: Parâmetros da busca
+
+        Returns:
+            Resposta armazenada ou None se ausente ou expirada
+        """
+        key = self.make_key(query, params)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM search_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self._counters['misses'] += 1
+                return None
+
+            response, created_at = row
+            if self.ttl and now - created_at > self.ttl:
+                self._conn.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self._counters['expired'] += 1
+                self._counters['misses'] += 1
+                return None
+
+            self._conn.execute("UPDATE search_cache SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self._counters['hits'] += 1
+
+        return json.loads(response)
+
+    def set(self, query: str, params: Dict[str, Any], response: Dict[str, Any]) -> None:
+        """
+        Armazena uma resposta no cache, descartando as entradas menos usadas se necessário.
+
+        Args:
+            query: Consulta de busca
+            params: Parâmetros da busca
+            response: Resposta a ser armazenada
+        """
+        key = self.make_key(query, params)
+        now = time.time()
+        data = json.dumps(response, ensure_ascii=False)
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_cache (key, query, params, response, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, self.normalize_query(query), json.dumps(params, sort_keys=True, default=str), data, now, now)
+            )
+            self._counters['stored'] += 1
+
+            # Descarte LRU quando o limite de entradas é ultrapassado
+            count = self._conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+            excess = count - self.max_entries
+            if excess > 0:
+                self._conn.execute(
+                    "DELETE FROM search_cache WHERE key IN "
+                    "(SELECT key FROM search_cache ORDER BY last_access ASC LIMIT ?)",
+                    (excess,)
+                )
+                self._counters['evicted'] += excess
+
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        """
+        Remove todas as entradas expiradas.
+
+        Returns:
+            Número de entradas removidas
+        """
+        if not self.ttl:
+            return 0
+
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM search_cache WHERE created_at < ?", (time.time() - self.ttl,))
+            self._conn.commit()
+            self._counters['expired'] += cursor.rowcount
+            return cursor.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Obtém os contadores de uso do cache.
+
+        Returns:
+            Dicionário com acertos, falhas, descartes, entradas e taxa de acerto
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats['entries'] = self._conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+    def close(self) -> None:
+        """Fecha a conexão com o banco."""
+        with self._lock:
+            self._conn.close()
+
+
+def get_search_cache() -> SearchCache:
+    """
+    Obtém o cache de buscas compartilhado do processo.
+
+    Returns:
+        Cache de buscas
+    """
+    global _cache
+
+    with _cache_lock:
+        if _cache is None:
+            _cache = SearchCache()
+        return _cache
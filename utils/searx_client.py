@@ -2,12 +2,18 @@
 Cliente para interação com o motor de busca SearXNG.
 """
 
+import asyncio
 import logging
 import urllib.parse
-import requests
 from typing import Dict, Any, List, Optional
 
+import aiohttp
+
 from config import settings
+from utils.async_http import get_async_http_client, run_async
+from utils.http_session import get_http_session
+from utils.rate_limiter import get_rate_limiter
+from utils.search_cache import SearchCache, get_search_cache
 
 logger = logging.getLogger(__name__)
 
@@ -16,53 +22,169 @@ class SearxClient:
     Cliente para realizar buscas no motor SearXNG.
     """
     
-    def __init__(self, base_url: Optional[str] = None):
+    def __init__(self, base_url: Optional[str] = None, use_cache: Optional[bool] = None,
+                 cache: Optional[SearchCache] = None):
         """
         Inicializa o cliente SearXNG.
         
         Args:
             base_url: URL base do SearXNG (opcional)
+            use_cache: Usar o cache persistente de buscas (padrão: settings.SEARCH_CACHE_ENABLED)
+            cache: Cache de buscas a ser usado (opcional, padrão: cache compartilhado)
         """
         self.base_url = base_url or settings.SEARX_URL
         self.headers = {
             'User-Agent': settings.USER_AGENT
         }
+        self.use_cache = settings.SEARCH_CACHE_ENABLED if use_cache is None else use_cache
+        self._cache = cache
+    
+    @property
+    def cache(self) -> Optional[SearchCache]:
+        """Cache de buscas em uso, ou None se desativado."""
+        if not self.use_cache:
+            return None
+        if self._cache is None:
+            self._cache = get_search_cache()
+        return self._cache
     
-    def search(self, query: str, format: str = "json", **kwargs) -> Dict[str, Any]:
+    def search(self, query: str, format: str = "json", bypass_cache: bool = False, **kwargs) -> Dict[str, Any]:
         """
         Realiza uma busca no SearXNG.
         
         Args:
             query: Consulta de busca
             format: Formato de resposta (json, html, etc.)
+            bypass_cache: Ignorar o cache e consultar o SearXNG (a resposta ainda é armazenada)
             **kwargs: Parâmetros adicionais de busca
             
         Returns:
             Resultados da busca
         """
-        logger.info(f"Realizando busca SearXNG: {query}")
-        
-        # Construir URL de busca
-        encoded_query = urllib.parse.quote(query)
-        url = f"{self.base_url}?q={encoded_query}&format={format}"
+        cache_params = self._cache_params(format, kwargs)
+        cached = self._get_cached(query, cache_params, bypass_cache)
+        if cached is not None:
+            return cached
         
-        # Adicionar parâmetros adicionais
-        for key, value in kwargs.items():
-            url += f"&{key}={value}"
+        logger.info(f"Realizando busca SearXNG: {query}")
+        url = self._build_url(query, format, kwargs)
         
-        # Realizar requisição
+        # Realizar requisição (sessão compartilhada, com conexões reaproveitadas)
         try:
-            response = requests.get(url, headers=self.headers, timeout=settings.REQUEST_TIMEOUT)
+            get_rate_limiter().acquire(url)
+            response = get_http_session().get(url, headers=self.headers, timeout=settings.REQUEST_TIMEOUT)
             response.raise_for_status()
             
             if format == "json":
-                return response.json()
+                results = response.json()
             else:
-                return {"content": response.text}
+                results = {"content": response.text}
             
         except Exception as e:
             logger.error(f"Erro na busca SearXNG: {e}")
             return {"error": str(e), "results": []}
+        
+        self._store_cached(query, cache_params, results)
+        return results
+    
+    async def asearch(self, query: str, format: str = "json", bypass_cache: bool = False, **kwargs) -> Dict[str, Any]:
+        """
+        Realiza uma busca no SearXNG sem bloquear o event loop.
+        
+        Usa o cliente HTTP assíncrono compartilhado (keep-alive e limite de
+        requisições simultâneas por host). O cancelamento da tarefa é propagado.
+        
+        Args:
+            query: Consulta de busca
+            format: Formato de resposta (json, html, etc.)
+            bypass_cache: Ignorar o cache e consultar o SearXNG (a resposta ainda é armazenada)
+            **kwargs: Parâmetros adicionais de busca
+            
+        Returns:
+            Resultados da busca
+        """
+        cache_params = self._cache_params(format, kwargs)
+        cached = self._get_cached(query, cache_params, bypass_cache)
+        if cached is not None:
+            return cached
+        
+        logger.info(f"Realizando busca SearXNG: {query}")
+        url = self._build_url(query, format, kwargs)
+        
+        try:
+            await get_rate_limiter().aacquire(url)
+            client = get_async_http_client()
+            if format == "json":
+                results = await client.get(url, headers=self.headers)
+            else:
+                results = {"content": await client.get(url, response_type="text", headers=self.headers)}
+            
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logger.error(f"Erro na busca SearXNG: {e}")
+            return {"error": str(e) or type(e).__name__, "results": []}
+        
+        self._store_cached(query, cache_params, results)
+        return results
+    
+    async def asearch_many(self, queries: List[str], format: str = "json", **kwargs) -> List[Dict[str, Any]]:
+        """
+        Realiza várias buscas simultaneamente.
+        
+        Args:
+            queries: Consultas de busca
+            format: Formato de resposta (json, html, etc.)
+            **kwargs: Parâmetros adicionais de busca (iguais para todas as consultas)
+            
+        Returns:
+            Resultados das buscas, na mesma ordem das consultas
+        """
+        return await asyncio.gather(*(self.asearch(query, format=format, **kwargs) for query in queries))
+    
+    def search_many(self, queries: List[str], format: str = "json", **kwargs) -> List[Dict[str, Any]]:
+        """
+        Versão síncrona de asearch_many, para uso fora de um event loop.
+        
+        Args:
+            queries: Consultas de busca
+            format: Formato de resposta (json, html, etc.)
+            **kwargs: Parâmetros adicionais de busca
+            
+        Returns:
+            Resultados das buscas, na mesma ordem das consultas
+        """
+        return run_async(self.asearch_many(queries, format=format, **kwargs))
+    
+    def _build_url(self, query: str, format: str, params: Dict[str, Any]) -> str:
+        """Monta a URL de busca com a consulta e os parâmetros adicionais."""
+        encoded_query = urllib.parse.quote(query)
+        url = f"{self.base_url}?q={encoded_query}&format={format}"
+        
+        # Adicionar parâmetros adicionais
+        for key, value in params.items():
+            url += f"&{key}={value}"
+        
+        return url
+    
+    def _cache_params(self, format: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Parâmetros que compõem a chave de cache de uma busca."""
+        return dict(params, endpoint=self.base_url, format=format)
+    
+    def _get_cached(self, query: str, cache_params: Dict[str, Any], bypass_cache: bool) -> Optional[Dict[str, Any]]:
+        """Obtém uma busca do cache, se ativo e não ignorado."""
+        cache = self.cache
+        if cache is None or bypass_cache:
+            return None
+        
+        cached = cache.get(query, cache_params)
+        if cached is not None:
+            logger.info(f"Busca SearXNG atendida pelo cache: {query}")
+        return cached
+    
+    def _store_cached(self, query: str, cache_params: Dict[str, Any], results: Dict[str, Any]) -> None:
+        """Armazena uma busca bem-sucedida no cache (erros não são armazenados)."""
+        cache = self.cache
+        if cache is not None:
+            cache.set(query, cache_params, results)
     
     def get_company_info(self, company_name: str, location: Optional[str] = None) -> List[Dict[str, Any]]:
         """
@@ -1,146 +1,465 @@
 """
 Gerenciador de sessões Selenium.
-Responsável por criar e gerenciar sessões do Selenium WebDriver.
+Responsável por criar, reutilizar e gerenciar sessões do Selenium WebDriver.
 """
 
+import atexit
 import logging
 import os
 import platform
+import threading
 import time
 import tempfile
-from typing import Optional
+from typing import Dict, Optional
 
 from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 from webdriver_manager.core.os_manager import ChromeType
 
 from config import settings
+from utils.enrichment_budget import charge_page_load
+from utils.rate_limiter import get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
+# Caminho do chromedriver, resolvido uma única vez por processo
+_chromedriver_path = None
+_chromedriver_lock = threading.Lock()
+
+# Pools compartilhados por processo (um por modo headless)
+_driver_pools: Dict[bool, "DriverPool"] = {}
+_driver_pools_lock = threading.Lock()
+
+
 class SeleniumManager:
     """
     Gerenciador de sessões Selenium.
     Implementa o padrão de contexto para uso com 'with'.
+    
+    O driver é retirado do pool compartilhado ao entrar no contexto e
+    devolvido ao sair, de forma que o navegador seja reaproveitado.
     """
     
-    def __init__(self):
-        """Inicializa o gerenciador de sessões Selenium."""
+    def __init__(self, headless: bool = True, tenant: Optional[str] = None, pool: Optional["DriverPool"] = None):
+        """
+        Inicializa o gerenciador de sessões Selenium.
+        
+        Args:
+            headless: Se o navegador deve rodar em modo headless
+            tenant: Identificador do usuário do driver (cookies e estado são limpos entre tenants)
+            pool: Pool de drivers a ser utilizado (opcional)
+        """
         self.driver = None
+        self.tenant = tenant
+        self.pool = pool or get_driver_pool(headless)
     
     def __enter__(self):
         """
-        Cria e retorna uma instância do WebDriver ao entrar no contexto.
+        Obtém uma instância do WebDriver do pool ao entrar no contexto.
         
         Returns:
             WebDriver ou None se ocorrer um erro
         """
         try:
-            # Detectar sistema operacional
-            os_name = platform.system().lower()
-            logger.info(f"Sistema operacional detectado: {os_name}")
-            
-            # Configurar opções do Chrome
-            chrome_options = Options()
-            chrome_options.add_argument("--headless")  # Executar em modo headless
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument(f"user-agent={settings.USER_AGENT}")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--window-size=1920,1080")
-            chrome_options.add_argument("--disable-extensions")
-            
-            # Configurar preferências
-            prefs = {
-                "profile.default_content_setting_values.notifications": 2,
-                "profile.default_content_settings.popups": 0,
-                "download.default_directory": tempfile.gettempdir(),
-                "download.prompt_for_download": False
-            }
-            chrome_options.add_experimental_option("prefs", prefs)
-            
-            # Usar ChromeDriverManager para baixar e configurar o driver correto
-            logger.info(f"Baixando chromedriver para {os_name}")
-            
-            # Tratamento especial para ambiente sem Chrome instalado
-            # Simular um driver básico para testes
-            if os_name == "linux" and not self._is_chrome_installed():
-                logger.warning("Chrome não instalado. Usando driver simulado para testes.")
-                # Criar um driver simulado que retorna dados básicos
-                self.driver = self._create_mock_driver()
-                return self.driver
-            
-            # Configuração normal quando Chrome está disponível
-            try:
-                service = Service(ChromeDriverManager().install())
-                self.driver = webdriver.Chrome(service=service, options=chrome_options)
-                
-                # Configurar timeouts
-                self.driver.set_page_load_timeout(settings.SELENIUM_PAGE_LOAD_TIMEOUT)
-                self.driver.implicitly_wait(settings.SELENIUM_IMPLICIT_WAIT)
-                
-                return self.driver
-            except Exception as e:
-                logger.error(f"Erro ao configurar o driver: {e}")
-                # Fallback para driver simulado
-                logger.warning("Usando driver simulado como fallback.")
-                self.driver = self._create_mock_driver()
-                return self.driver
-                
+            self.driver = self.pool.checkout(tenant=self.tenant)
+            return self.driver
         except Exception as e:
             logger.error(f"Erro ao inicializar o Selenium: {e}")
             return None
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         """
-        Fecha o WebDriver ao sair do contexto.
+        Devolve o WebDriver ao pool ao sair do contexto.
         
         Args:
             exc_type: Tipo da exceção, se houver
             exc_val: Valor da exceção, se houver
             exc_tb: Traceback da exceção, se houver
         """
-        if self.driver and not isinstance(self.driver, MockWebDriver):
-            try:
-                self.driver.quit()
-            except Exception as e:
-                logger.error(f"Erro ao fechar o driver: {e}")
+        if self.driver:
+            # Sessões que falharam no protocolo do WebDriver não voltam para o pool
+            discard = exc_type is not None and issubclass(exc_type, WebDriverException)
+            self.pool.checkin(self.driver, discard=discard)
+            self.driver = None
+
+
+class PooledDriver:
+    """
+    Proxy para um WebDriver gerenciado pelo pool.
+    Delega todas as operações ao driver real e contabiliza as páginas carregadas.
+    """
+    
+    def __init__(self, driver):
+        """
+        Inicializa o proxy.
+        
+        Args:
+            driver: WebDriver real (ou simulado)
+        """
+        self._driver = driver
+        self.pages_loaded = 0
+        self.tenant = None
+        self.created_at = time.time()
+    
+    @property
+    def raw_driver(self):
+        """Retorna o WebDriver real."""
+        return self._driver
     
-    def _is_chrome_installed(self) -> bool:
+    def get(self, url, charge_budget=True):
         """
-        Verifica se o Chrome está instalado no sistema.
+        Navega para uma URL, respeitando o limite de requisições do domínio
+        e contabilizando a página carregada (também no orçamento da empresa
+        em coleta, se houver).
         
+        Args:
+            url: URL para navegar
+            charge_budget: Se a página deve ser contabilizada no orçamento da
+                empresa (False quando já foi contabilizada, como na escalada
+                de HTTP para o navegador em PageFetcher)
+            
+        Raises:
+            BudgetExceeded: Se o orçamento da empresa em coleta estiver esgotado
+        """
+        if charge_budget:
+            charge_page_load()
+        get_rate_limiter().acquire(url)
+        self.pages_loaded += 1
+        return self._driver.get(url)
+    
+    def __getattr__(self, name):
+        return getattr(self._driver, name)
+
+
+class DriverPool:
+    """
+    Pool de sessões WebDriver reutilizáveis.
+    
+    Mantém até `max_size` navegadores abertos, verifica a saúde de cada sessão
+    antes de entregá-la, recicla drivers após `max_pages` páginas e limpa
+    cookies e armazenamento local quando o driver troca de tenant.
+    """
+    
+    def __init__(self, max_size: Optional[int] = None, max_pages: Optional[int] = None,
+                 checkout_timeout: Optional[float] = None, headless: bool = True):
+        """
+        Inicializa o pool de drivers.
+        
+        Args:
+            max_size: Número máximo de drivers abertos
+            max_pages: Número de páginas após o qual o driver é reciclado
+            checkout_timeout: Tempo máximo de espera por um driver livre (segundos)
+            headless: Se os navegadores devem rodar em modo headless
+        """
+        self.max_size = max(1, max_size or settings.DRIVER_POOL_MAX_SIZE)
+        self.max_pages = max_pages or settings.DRIVER_MAX_PAGES
+        self.checkout_timeout = checkout_timeout or settings.DRIVER_CHECKOUT_TIMEOUT
+        self.headless = headless
+        
+        self._idle = []
+        self._size = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._stats = {'created': 0, 'reused': 0, 'recycled': 0, 'discarded': 0}
+    
+    def checkout(self, tenant: Optional[str] = None, timeout: Optional[float] = None) -> PooledDriver:
+        """
+        Retira um driver do pool, criando um novo se houver capacidade.
+        
+        Args:
+            tenant: Identificador do usuário do driver
+            timeout: Tempo máximo de espera por um driver livre (segundos)
+            
         Returns:
-            True se o Chrome estiver instalado, False caso contrário
+            Driver pronto para uso
+            
+        Raises:
+            TimeoutError: Se nenhum driver ficar livre dentro do tempo limite
         """
-        try:
-            # Verificar no Linux
-            if platform.system().lower() == "linux":
-                return os.system("which google-chrome > /dev/null 2>&1") == 0
+        deadline = time.monotonic() + (timeout or self.checkout_timeout)
+        
+        while True:
+            driver = None
             
-            # Verificar no Windows
-            elif platform.system().lower() == "windows":
-                return os.path.exists("C:\\Program Files\\Google\\Chrome\\Application\\chrome.exe") or \
-                       os.path.exists("C:\\Program Files (x86)\\Google\\Chrome\\Application\\chrome.exe")
+            with self._condition:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Pool de drivers encerrado")
+                    
+                    if self._idle:
+                        driver = self._take_idle(tenant)
+                        break
+                    
+                    if self._size < self.max_size:
+                        # Reservar a vaga antes de criar o driver fora do lock
+                        self._size += 1
+                        break
+                    
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"Nenhum driver livre após {timeout or self.checkout_timeout}s")
+                    
+                    self._condition.wait(remaining)
             
-            # Verificar no macOS
-            elif platform.system().lower() == "darwin":
-                return os.path.exists("/Applications/Google Chrome.app")
+            if driver is None:
+                try:
+                    driver = PooledDriver(_create_driver(self.headless))
+                except Exception:
+                    self._release_slot()
+                    raise
+                
+                with self._condition:
+                    self._stats['created'] += 1
+                
+                driver.tenant = tenant
+                return driver
             
-            return False
-        except:
-            return False
+            # Verificar a saúde da sessão reaproveitada
+            if not self._is_healthy(driver):
+                logger.warning("Driver do pool não responde. Descartando sessão.")
+                self._dispose(driver, 'discarded')
+                continue
+            
+            if tenant is None or driver.tenant != tenant:
+                self._reset_state(driver)
+            
+            driver.tenant = tenant
+            with self._condition:
+                self._stats['reused'] += 1
+            
+            return driver
     
-    def _create_mock_driver(self):
+    def checkin(self, driver: PooledDriver, discard: bool = False) -> None:
+        """
+        Devolve um driver ao pool.
+        
+        Args:
+            driver: Driver retirado com checkout
+            discard: Se o driver deve ser fechado em vez de reaproveitado
         """
-        Cria um driver simulado para ambientes sem Chrome.
+        if discard:
+            self._dispose(driver, 'discarded')
+            return
+        
+        if driver.pages_loaded >= self.max_pages:
+            logger.info(f"Reciclando driver após {driver.pages_loaded} páginas")
+            self._dispose(driver, 'recycled')
+            return
+        
+        with self._condition:
+            if not self._closed:
+                self._idle.append(driver)
+                self._condition.notify()
+                return
+        
+        # Pool encerrado enquanto o driver estava em uso
+        self._dispose(driver, 'discarded')
+    
+    def shutdown(self) -> None:
+        """Fecha todos os drivers ociosos e impede novos checkouts."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._condition.notify_all()
+        
+        for driver in idle:
+            self._dispose(driver, None)
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Obtém estatísticas de uso do pool.
         
         Returns:
-            MockWebDriver: Um driver simulado com funcionalidades básicas
+            Dicionário com contadores de uso
         """
+        with self._condition:
+            stats = dict(self._stats)
+            stats['open'] = self._size
+            stats['idle'] = len(self._idle)
+        return stats
+    
+    def _take_idle(self, tenant: Optional[str]) -> PooledDriver:
+        """Retira um driver ocioso, preferindo um que já pertença ao tenant."""
+        for index, driver in enumerate(self._idle):
+            if tenant is not None and driver.tenant == tenant:
+                return self._idle.pop(index)
+        return self._idle.pop()
+    
+    def _release_slot(self) -> None:
+        """Libera uma vaga do pool e acorda quem estiver esperando."""
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+    
+    def _dispose(self, driver: PooledDriver, reason: Optional[str]) -> None:
+        """Fecha um driver e libera sua vaga no pool."""
+        try:
+            driver.raw_driver.quit()
+        except Exception as e:
+            logger.error(f"Erro ao fechar o driver: {e}")
+        
+        with self._condition:
+            if reason:
+                self._stats[reason] += 1
+        self._release_slot()
+    
+    def _is_healthy(self, driver: PooledDriver) -> bool:
+        """Verifica se a sessão do driver ainda responde."""
+        try:
+            driver.raw_driver.current_url
+            return True
+        except Exception:
+            return False
+    
+    def _reset_state(self, driver: PooledDriver) -> None:
+        """Limpa cookies e armazenamento do navegador entre tenants."""
+        raw_driver = driver.raw_driver
+        try:
+            raw_driver.delete_all_cookies()
+            raw_driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except Exception:
+            # Páginas como about:blank não permitem acesso ao armazenamento
+            pass
+        
+        try:
+            raw_driver.get("about:blank")
+        except Exception as e:
+            logger.warning(f"Erro ao limpar estado do driver: {e}")
+
+
+def get_driver_pool(headless: bool = True) -> DriverPool:
+    """
+    Obtém o pool de drivers compartilhado do processo.
+    
+    Args:
+        headless: Se os navegadores devem rodar em modo headless
+        
+    Returns:
+        Pool de drivers
+    """
+    with _driver_pools_lock:
+        pool = _driver_pools.get(headless)
+        if pool is None or pool._closed:
+            pool = DriverPool(headless=headless)
+            _driver_pools[headless] = pool
+        return pool
+
+
+def shutdown_driver_pools() -> None:
+    """Encerra todos os pools de drivers do processo."""
+    with _driver_pools_lock:
+        pools = list(_driver_pools.values())
+        _driver_pools.clear()
+    
+    for pool in pools:
+        pool.shutdown()
+
+
+atexit.register(shutdown_driver_pools)
+
+
+def _create_driver(headless: bool = True):
+    """
+    Cria uma nova instância do WebDriver.
+    
+    Args:
+        headless: Se o navegador deve rodar em modo headless
+        
+    Returns:
+        WebDriver real ou simulado
+    """
+    # Detectar sistema operacional
+    os_name = platform.system().lower()
+    logger.info(f"Sistema operacional detectado: {os_name}")
+    
+    # Configurar opções do Chrome
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument("--headless")  # Executar em modo headless
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument(f"user-agent={settings.USER_AGENT}")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--window-size=1920,1080")
+    chrome_options.add_argument("--disable-extensions")
+    
+    # Configurar preferências
+    prefs = {
+        "profile.default_content_setting_values.notifications": 2,
+        "profile.default_content_settings.popups": 0,
+        "download.default_directory": tempfile.gettempdir(),
+        "download.prompt_for_download": False
+    }
+    chrome_options.add_experimental_option("prefs", prefs)
+    
+    # Tratamento especial para ambiente sem Chrome instalado
+    # Simular um driver básico para testes
+    if os_name == "linux" and not _is_chrome_installed():
+        logger.warning("Chrome não instalado. Usando driver simulado para testes.")
+        # Criar um driver simulado que retorna dados básicos
         return MockWebDriver()
+    
+    # Configuração normal quando Chrome está disponível
+    try:
+        service = Service(_get_chromedriver_path())
+        driver = webdriver.Chrome(service=service, options=chrome_options)
+        
+        # Configurar timeouts
+        driver.set_page_load_timeout(settings.SELENIUM_PAGE_LOAD_TIMEOUT)
+        driver.implicitly_wait(settings.SELENIUM_IMPLICIT_WAIT)
+        
+        return driver
+    except Exception as e:
+        logger.error(f"Erro ao configurar o driver: {e}")
+        # Fallback para driver simulado
+        logger.warning("Usando driver simulado como fallback.")
+        return MockWebDriver()
+
+
+def _get_chromedriver_path() -> str:
+    """
+    Obtém o caminho do chromedriver, baixando-o apenas na primeira chamada.
+    
+    Returns:
+        Caminho do executável do chromedriver
+    """
+    global _chromedriver_path
+    
+    with _chromedriver_lock:
+        if _chromedriver_path is None:
+            # Usar ChromeDriverManager para baixar e configurar o driver correto
+            logger.info("Baixando chromedriver")
+            _chromedriver_path = ChromeDriverManager().install()
+        return _chromedriver_path
+
+
+def _is_chrome_installed() -> bool:
+    """
+    Verifica se o Chrome está instalado no sistema.
+    
+    Returns:
+        True se o Chrome estiver instalado, False caso contrário
+    """
+    try:
+        # Verificar no Linux
+        if platform.system().lower() == "linux":
+            return os.system("which google-chrome > /dev/null 2>&1") == 0
+        
+        # Verificar no Windows
+        elif platform.system().lower() == "windows":
+            return os.path.exists("C:\\Program Files\\Google\\Chrome\\Application\\chrome.exe") or \
+                   os.path.exists("C:\\Program Files (x86)\\Google\\Chrome\\Application\\chrome.exe")
+        
+        # Verificar no macOS
+        elif platform.system().lower() == "darwin":
+            return os.path.exists("/Applications/Google Chrome.app")
+        
+        return False
+    except:
+        return False
 
 
 class MockWebDriver:
@@ -286,14 +605,28 @@ class MockWebDriver:
             args: Argumentos para o script
             
         Returns:
-            None
+            Estado simulado da página quando consultado, None nos demais casos
         """
+        # Páginas simuladas são carregadas de forma síncrona
+        if "readyState" in script:
+            return "complete"
+        
+        if "getEntriesByType" in script:
+            return 0
+        
+        if "querySelector" in script:
+            return True
+        
         return None
     
     def back(self):
         """Simula voltar para a página anterior."""
         pass
     
+    def delete_all_cookies(self):
+        """Simula limpeza dos cookies."""
+        pass
+    
     def quit(self):
         """Simula fechamento do driver."""
         pass
@@ -0,0 +1,631 @@
+"""
+Fila de coletas para execução distribuída.
+O coordenador publica coletas (scraper, alvo) e recebe os resultados; os
+workers, em qualquer nó, reservam coletas por um tempo de visibilidade,
+executam e devolvem os dados. Uma coleta cuja reserva expira (worker
+encerrado ou sem renovação) volta para a fila até WORK_QUEUE_MAX_ATTEMPTS.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Dict, Any, List, Optional
+
+from config import settings
+from utils.data_paths import resolve_data_path
+
+logger = logging.getLogger(__name__)
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+class WorkQueue(ABC):
+    """
+    Interface das filas de coletas.
+
+    Tarefas publicadas têm 'task_id', 'company_id', 'scraper', 'target' e,
+    opcionalmente, 'budget' (orçamento restante da empresa). Resultados têm
+    'task_id', 'company_id', 'scraper', 'status' ('done' ou 'failed'),
+    'data', 'elapsed', 'page_loads' e 'error'.
+    """
+
+    def __init__(self, visibility_timeout: Optional[float] = None, max_attempts: Optional[int] = None):
+        """
+        Inicializa a fila.
+
+        Args:
+            visibility_timeout: Duração de uma reserva (segundos)
+            max_attempts: Tentativas de cada coleta antes de registrá-la como falha
+        """
+        self.visibility_timeout = visibility_timeout or settings.WORK_QUEUE_VISIBILITY_TIMEOUT
+        self.max_attempts = max_attempts or settings.WORK_QUEUE_MAX_ATTEMPTS
+
+        self._counters_lock = threading.Lock()
+        self._counters = {'published': 0, 'leased': 0, 'completed': 0, 'retried': 0, 'expired': 0, 'failed': 0}
+
+    @abstractmethod
+    def publish(self, run_id: str, tasks: List[Dict[str, Any]]) -> int:
+        """
+        Publica coletas de uma execução (tarefas já publicadas são ignoradas).
+
+        Args:
+            run_id: Identificador da execução
+            tasks: Coletas a publicar
+
+        Returns:
+            Número de coletas novas
+        """
+        pass
+
+    @abstractmethod
+    def lease(self) -> Optional[Dict[str, Any]]:
+        """
+        Reserva a próxima coleta disponível de qualquer execução.
+
+        Returns:
+            Tarefa com 'run_id', 'lease_token' e 'attempts', ou None se a fila estiver vazia
+        """
+        pass
+
+    @abstractmethod
+    def extend(self, task_id: str, lease_token: str) -> bool:
+        """
+        Renova a reserva de uma coleta em andamento.
+
+        Args:
+            task_id: Identificador da coleta
+            lease_token: Token recebido em lease
+
+        Returns:
+            False se a reserva já expirou e a coleta foi entregue a outro worker
+        """
+        pass
+
+    @abstractmethod
+    def complete(self, task_id: str, lease_token: str, data: Optional[Dict[str, Any]],
+                 elapsed: float, page_loads: int = 0) -> bool:
+        """
+        Entrega o resultado de uma coleta.
+
+        Args:
+            task_id: Identificador da coleta
+            lease_token: Token recebido em lease
+            data: Dados retornados por collect
+            elapsed: Duração da coleta (segundos)
+            page_loads: Páginas carregadas durante a coleta
+
+        Returns:
+            False se a reserva já expirou (o resultado é descartado)
+        """
+        pass
+
+    @abstractmethod
+    def release(self, task_id: str, lease_token: str, error: str) -> None:
+        """
+        Devolve uma coleta que falhou para nova tentativa (ou a registra como falha).
+
+        Args:
+            task_id: Identificador da coleta
+            lease_token: Token recebido em lease
+            error: Descrição do erro
+        """
+        pass
+
+    @abstractmethod
+    def fetch_results(self, run_id: str, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Obtém resultados ainda não confirmados de uma execução.
+
+        Args:
+            run_id: Identificador da execução
+            limit: Máximo de resultados
+
+        Returns:
+            Resultados na ordem de conclusão
+        """
+        pass
+
+    @abstractmethod
+    def acknowledge(self, run_id: str, task_ids: List[str]) -> None:
+        """
+        Confirma o recebimento de resultados, removendo-os da fila.
+
+        Args:
+            run_id: Identificador da execução
+            task_ids: Coletas cujos resultados foram recebidos
+        """
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        """Libera as conexões da fila."""
+        pass
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Obtém os contadores de operações deste processo.
+
+        Returns:
+            Dicionário com coletas publicadas, reservadas, concluídas, devolvidas,
+            expiradas e registradas como falha
+        """
+        with self._counters_lock:
+            return dict(self._counters)
+
+    def _result(self, task_id: str, company_id: str, scraper: str, status: str,
+                data: Optional[Dict[str, Any]] = None, elapsed: Optional[float] = None,
+                page_loads: int = 0, error: Optional[str] = None) -> Dict[str, Any]:
+        """Monta o resultado de uma coleta."""
+        return {
+            'task_id': task_id,
+            'company_id': company_id,
+            'scraper': scraper,
+            'status': status,
+            'data': data,
+            'elapsed': elapsed,
+            'page_loads': page_loads,
+            'error': error
+        }
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        """Incrementa um contador de operações."""
+        with self._counters_lock:
+            self._counters[counter] += amount
+
+
+class SQLiteWorkQueue(WorkQueue):
+    """
+    Fila de coletas em SQLite, para execuções em um único nó e testes.
+
+    Vários processos podem compartilhar o mesmo arquivo; as reservas usam
+    transações exclusivas para que cada coleta seja entregue a um worker por vez.
+    """
+
+    def __init__(self, path: str, visibility_timeout: Optional[float] = None, max_attempts: Optional[int] = None):
+        """
+        Inicializa a fila.
+
+        Args:
+            path: Caminho do banco SQLite (relativo à raiz do projeto ou absoluto)
+            visibility_timeout: Duração de uma reserva (segundos)
+            max_attempts: Tentativas de cada coleta antes de registrá-la como falha
+        """
+        super().__init__(visibility_timeout, max_attempts)
+        self.path = resolve_data_path(path)
+
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # Transações controladas explicitamente (BEGIN IMMEDIATE nas reservas)
+        self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS work_queue (
+                task_id TEXT PRIMARY KEY,
+                run_id TEXT NOT NULL,
+                company_id TEXT NOT NULL,
+                scraper TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                lease_token TEXT,
+                lease_expires REAL,
+                result TEXT,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_work_queue_status ON work_queue (status, lease_expires)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_work_queue_run ON work_queue (run_id, status)")
+
+    def publish(self, run_id: str, tasks: List[Dict[str, Any]]) -> int:
+        now = time.time()
+        rows = [
+            (task['task_id'], run_id, task['company_id'], task['scraper'],
+             json.dumps(task, ensure_ascii=False, default=str), now)
+            for task in tasks
+        ]
+
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO work_queue (task_id, run_id, company_id, scraper, payload, status, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, 'pending', ?)",
+                    rows
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            published = self._conn.total_changes - before
+
+        self._count('published', published)
+        return published
+
+    def lease(self) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        lease_token = uuid.uuid4().hex
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Reservas expiradas sem tentativas restantes viram falha
+                expired = self._conn.execute(
+                    "SELECT task_id, run_id, company_id, scraper FROM work_queue "
+                    "WHERE status = 'leased' AND lease_expires <= ? AND attempts >= ?",
+                    (now, self.max_attempts)
+                ).fetchall()
+                for task_id, _, company_id, scraper in expired:
+                    self._store_result(task_id, 'failed', self._result(
+                        task_id, company_id, scraper, 'failed', error="Reserva expirada na última tentativa"
+                    ), now)
+
+                row = self._conn.execute(
+                    "SELECT task_id, run_id, payload, status, attempts FROM work_queue "
+                    "WHERE status = 'pending' OR (status = 'leased' AND lease_expires <= ?) "
+                    "ORDER BY rowid LIMIT 1",
+                    (now,)
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE work_queue SET status = 'leased', attempts = attempts + 1, lease_token = ?, "
+                        "lease_expires = ?, updated_at = ? WHERE task_id = ?",
+                        (lease_token, now + self.visibility_timeout, now, row[0])
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        if expired:
+            self._count('failed', len(expired))
+        if row is None:
+            return None
+
+        task_id, run_id, payload, status, attempts = row
+        if status == 'leased':
+            logger.warning(f"Reserva da coleta {task_id} expirou; nova tentativa ({attempts + 1}/{self.max_attempts})")
+            self._count('expired')
+        self._count('leased')
+
+        task = json.loads(payload)
+        task.update(run_id=run_id, lease_token=lease_token, attempts=attempts + 1)
+        return task
+
+    def extend(self, task_id: str, lease_token: str) -> bool:
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE work_queue SET lease_expires = ?, updated_at = ? "
+                "WHERE task_id = ? AND status = 'leased' AND lease_token = ?",
+                (now + self.visibility_timeout, now, task_id, lease_token)
+            )
+        return cursor.rowcount > 0
+
+    def complete(self, task_id: str, lease_token: str, data: Optional[Dict[str, Any]],
+                 elapsed: float, page_loads: int = 0) -> bool:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT company_id, scraper FROM work_queue WHERE task_id = ? AND status = 'leased' AND lease_token = ?",
+                (task_id, lease_token)
+            ).fetchone()
+            if row is None:
+                logger.warning(f"Resultado da coleta {task_id} descartado: reserva expirada")
+                return False
+
+            result = self._result(task_id, row[0], row[1], 'done', data, elapsed, page_loads)
+            cursor = self._store_result(task_id, 'done', result, now, lease_token)
+
+        if cursor.rowcount > 0:
+            self._count('completed')
+        return cursor.rowcount > 0
+
+    def release(self, task_id: str, lease_token: str, error: str) -> None:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT company_id, scraper, attempts FROM work_queue "
+                "WHERE task_id = ? AND status = 'leased' AND lease_token = ?",
+                (task_id, lease_token)
+            ).fetchone()
+            if row is None:
+                return
+
+            company_id, scraper, attempts = row
+            if attempts < self.max_attempts:
+                self._conn.execute(
+                    "UPDATE work_queue SET status = 'pending', lease_token = NULL, lease_expires = NULL, "
+                    "updated_at = ? WHERE task_id = ? AND lease_token = ?",
+                    (now, task_id, lease_token)
+                )
+                retried = True
+            else:
+                result = self._result(task_id, company_id, scraper, 'failed', error=error)
+                self._store_result(task_id, 'failed', result, now, lease_token)
+                retried = False
+
+        self._count('retried' if retried else 'failed')
+
+    def fetch_results(self, run_id: str, limit: int = 100) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT result FROM work_queue WHERE run_id = ? AND status IN ('done', 'failed') "
+                "ORDER BY updated_at LIMIT ?",
+                (run_id, limit)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def acknowledge(self, run_id: str, task_ids: List[str]) -> None:
+        if not task_ids:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM work_queue WHERE run_id = ? AND task_id = ? AND status IN ('done', 'failed')",
+                [(run_id, task_id) for task_id in task_ids]
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _store_result(self, task_id: str, status: str, result: Dict[str, Any], now: float,
+                      lease_token: Optional[str] = None) -> sqlite3.Cursor:
+        """Grava o resultado final de uma coleta (chamar com o lock adquirido)."""
+        query = (
+            "UPDATE work_queue SET status = ?, result = ?, lease_token = NULL, lease_expires = NULL, "
+            "updated_at = ? WHERE task_id = ?"
+        )
+        params = [status, json.dumps(result, ensure_ascii=False, default=str), now, task_id]
+        if lease_token is not None:
+            query += " AND lease_token = ?"
+            params.append(lease_token)
+        return self._conn.execute(query, params)
+
+
+# Reserva atômica: move a coleta da lista de pendentes para o conjunto de reservas
+_REDIS_LEASE_SCRIPT = """
+local task_id = redis.call('LPOP', KEYS[1])
+if not task_id then return false end
+local key = ARGV[3] .. task_id
+redis.call('ZADD', KEYS[2], ARGV[1], task_id)
+redis.call('HSET', key, 'status', 'leased', 'lease_token', ARGV[2])
+redis.call('HINCRBY', key, 'attempts', 1)
+return task_id
+"""
+
+# Conclusão atômica: aceita o resultado apenas do worker que detém a reserva
+_REDIS_COMPLETE_SCRIPT = """
+if redis.call('HGET', KEYS[1], 'lease_token') ~= ARGV[1] then return 0 end
+redis.call('ZREM', KEYS[2], ARGV[2])
+redis.call('HSET', KEYS[1], 'status', ARGV[3], 'lease_token', '')
+redis.call('RPUSH', KEYS[3], ARGV[4])
+return 1
+"""
+
+# Devolução de reservas expiradas: cada coleta é devolvida por um único processo
+_REDIS_REQUEUE_SCRIPT = """
+if redis.call('ZREM', KEYS[1], ARGV[1]) == 0 then return -1 end
+local attempts = tonumber(redis.call('HGET', KEYS[2], 'attempts') or '0')
+if attempts >= tonumber(ARGV[2]) then return 0 end
+redis.call('HSET', KEYS[2], 'status', 'pending', 'lease_token', '')
+redis.call('RPUSH', KEYS[3], ARGV[1])
+return 1
+"""
+
+
+class RedisWorkQueue(WorkQueue):
+    """
+    Fila de coletas em Redis (ou servidor compatível), para execuções em vários nós.
+
+    Chaves (com o prefixo WORK_QUEUE_REDIS_PREFIX):
+    - pending: lista de coletas disponíveis
+    - leased: conjunto ordenado coleta -> expiração da reserva
+    - task:<id>: hash com a tarefa, tentativas e token da reserva
+    - results:<run_id>: lista de resultados da execução
+    """
+
+    def __init__(self, url: str, visibility_timeout: Optional[float] = None, max_attempts: Optional[int] = None,
+                 prefix: Optional[str] = None):
+        """
+        Inicializa a fila.
+
+        Args:
+            url: URL do servidor (redis://host:porta/db)
+            visibility_timeout: Duração de uma reserva (segundos)
+            max_attempts: Tentativas de cada coleta antes de registrá-la como falha
+            prefix: Prefixo das chaves (padrão: settings.WORK_QUEUE_REDIS_PREFIX)
+
+        Raises:
+            ImportError: Se o pacote redis não estiver instalado
+        """
+        super().__init__(visibility_timeout, max_attempts)
+        try:
+            import redis
+        except ImportError:
+            raise ImportError("A fila em Redis exige o pacote redis (pip install redis)")
+
+        self.prefix = prefix or settings.WORK_QUEUE_REDIS_PREFIX
+        self._client = redis.Redis.from_url(url, decode_responses=True)
+        self._lease_script = self._client.register_script(_REDIS_LEASE_SCRIPT)
+        self._complete_script = self._client.register_script(_REDIS_COMPLETE_SCRIPT)
+        self._requeue_script = self._client.register_script(_REDIS_REQUEUE_SCRIPT)
+
+    def publish(self, run_id: str, tasks: List[Dict[str, Any]]) -> int:
+        published = 0
+        for task in tasks:
+            key = self._key('task', task['task_id'])
+            # hsetnx torna a publicação idempotente (retomada do coordenador)
+            if not self._client.hsetnx(key, 'run_id', run_id):
+                continue
+            pipeline = self._client.pipeline()
+            pipeline.hset(key, mapping={
+                'payload': json.dumps(task, ensure_ascii=False, default=str),
+                'status': 'pending',
+                'attempts': 0,
+                'lease_token': ''
+            })
+            pipeline.rpush(self._key('pending'), task['task_id'])
+            pipeline.execute()
+            published += 1
+
+        self._count('published', published)
+        return published
+
+    def lease(self) -> Optional[Dict[str, Any]]:
+        self._requeue_expired()
+
+        lease_token = uuid.uuid4().hex
+        task_id = self._lease_script(
+            keys=[self._key('pending'), self._key('leased')],
+            args=[time.time() + self.visibility_timeout, lease_token, self._key('task', '')]
+        )
+        if not task_id:
+            return None
+
+        fields = self._client.hmget(self._key('task', task_id), 'run_id', 'payload', 'attempts')
+        self._count('leased')
+
+        task = json.loads(fields[1])
+        task.update(run_id=fields[0], lease_token=lease_token, attempts=int(fields[2]))
+        return task
+
+    def extend(self, task_id: str, lease_token: str) -> bool:
+        if self._client.hget(self._key('task', task_id), 'lease_token') != lease_token:
+            return False
+        if self._client.zscore(self._key('leased'), task_id) is None:
+            return False
+        # xx: não recriar a reserva se ela for devolvida à fila entre as duas chamadas
+        self._client.zadd(self._key('leased'), {task_id: time.time() + self.visibility_timeout}, xx=True)
+        return True
+
+    def complete(self, task_id: str, lease_token: str, data: Optional[Dict[str, Any]],
+                 elapsed: float, page_loads: int = 0) -> bool:
+        task = self._client.hmget(self._key('task', task_id), 'run_id', 'payload')
+        if not task[0]:
+            return False
+
+        payload = json.loads(task[1])
+        result = self._result(task_id, payload['company_id'], payload['scraper'], 'done', data, elapsed, page_loads)
+        accepted = self._finish(task_id, task[0], lease_token, result)
+        if accepted:
+            self._count('completed')
+        else:
+            logger.warning(f"Resultado da coleta {task_id} descartado: reserva expirada")
+        return accepted
+
+    def release(self, task_id: str, lease_token: str, error: str) -> None:
+        key = self._key('task', task_id)
+        fields = self._client.hmget(key, 'run_id', 'payload', 'attempts', 'lease_token')
+        if fields[3] != lease_token:
+            return
+
+        if int(fields[2] or 0) < self.max_attempts:
+            # Expira a reserva imediatamente; a próxima chamada a lease a devolve à fila
+            self._client.zadd(self._key('leased'), {task_id: 0}, xx=True)
+            self._count('retried')
+            return
+
+        payload = json.loads(fields[1])
+        self._finish(task_id, fields[0], lease_token,
+                     self._result(task_id, payload['company_id'], payload['scraper'], 'failed', error=error))
+        self._count('failed')
+
+    def fetch_results(self, run_id: str, limit: int = 100) -> List[Dict[str, Any]]:
+        return [json.loads(item) for item in self._client.lrange(self._key('results', run_id), 0, limit - 1)]
+
+    def acknowledge(self, run_id: str, task_ids: List[str]) -> None:
+        if not task_ids:
+            return
+        # O coordenador é o único consumidor da lista de resultados da execução
+        pipeline = self._client.pipeline()
+        pipeline.ltrim(self._key('results', run_id), len(task_ids), -1)
+        pipeline.delete(*[self._key('task', task_id) for task_id in task_ids])
+        pipeline.execute()
+
+    def close(self) -> None:
+        self._client.close()
+
+    def _finish(self, task_id: str, run_id: str, lease_token: str, result: Dict[str, Any]) -> bool:
+        """Grava o resultado final de uma coleta se a reserva ainda for válida."""
+        return bool(self._complete_script(
+            keys=[self._key('task', task_id), self._key('leased'), self._key('results', run_id)],
+            args=[lease_token, task_id, result['status'], json.dumps(result, ensure_ascii=False, default=str)]
+        ))
+
+    def _requeue_expired(self) -> None:
+        """Devolve à fila as coletas com reserva expirada (ou as registra como falha)."""
+        for task_id in self._client.zrangebyscore(self._key('leased'), '-inf', time.time(), start=0, num=100):
+            key = self._key('task', task_id)
+            outcome = self._requeue_script(
+                keys=[self._key('leased'), key, self._key('pending')],
+                args=[task_id, self.max_attempts]
+            )
+            if outcome == 1:
+                logger.warning(f"Reserva da coleta {task_id} expirou; devolvida à fila")
+                self._count('expired')
+            elif outcome == 0:
+                fields = self._client.hmget(key, 'run_id', 'payload')
+                payload = json.loads(fields[1])
+                self._client.hset(key, 'status', 'failed')
+                result = self._result(task_id, payload['company_id'], payload['scraper'], 'failed',
+                                      error="Reserva expirada na última tentativa")
+                self._client.rpush(self._key('results', fields[0]), json.dumps(result, ensure_ascii=False))
+                self._count('failed')
+
+    def _key(self, *parts: str) -> str:
+        """Monta uma chave com o prefixo da fila."""
+        return ':'.join((self.prefix,) + parts)
+
+
+# Registrar filas por esquema de URL
+AVAILABLE_WORK_QUEUES = {
+    'sqlite': SQLiteWorkQueue,
+    'redis': RedisWorkQueue,
+    'rediss': RedisWorkQueue
+}
+
+
+def create_work_queue(url: Optional[str] = None) -> WorkQueue:
+    """
+    Cria uma fila de coletas a partir da URL.
+
+    Args:
+        url: sqlite:///caminho ou redis://host:porta/db (padrão: settings.WORK_QUEUE_URL)
+
+    Returns:
+        Fila de coletas
+
+    Raises:
+        ValueError: Se o esquema da URL não for suportado
+    """
+    url = url or settings.WORK_QUEUE_URL
+    scheme, separator, location = url.partition('://')
+    if not separator or scheme not in AVAILABLE_WORK_QUEUES:
+        raise ValueError(f"Fila de coletas não suportada: {url} (use sqlite:///caminho ou redis://host:porta/db)")
+
+    if scheme == 'sqlite':
+        # sqlite:///data/fila.sqlite (relativo à raiz do projeto) ou sqlite:////caminho/absoluto
+        return SQLiteWorkQueue(location[1:] if location.startswith('/') else location)
+    return AVAILABLE_WORK_QUEUES[scheme](url)
+
+
+def get_work_queue() -> WorkQueue:
+    """
+    Obtém a fila de coletas compartilhada do processo (settings.WORK_QUEUE_URL).
+
+    Returns:
+        Fila de coletas
+    """
+    global _queue
+
+    with _queue_lock:
+        if _queue is None:
+            _queue = create_work_queue()
+        return _queue